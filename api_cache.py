@@ -0,0 +1,102 @@
+# COG API Client
+# v2 API
+# Local Object Cache
+
+import os
+import os.path
+import json
+import time
+import hashlib
+import tempfile
+
+_TTL = 300 #seconds
+
+class ObjectCache(object):
+
+    def __init__(self, path, ttl=None, refresh=False):
+        """ Constructor"""
+
+        # Process Args
+        if ttl is None:
+            ttl = _TTL
+
+        # Set vars
+        self._path = path
+        self._ttl = ttl
+        self._refresh = refresh
+
+    def _entry_path(self, url, user, key):
+
+        # One directory per server and credentials, so an object cached for
+        # one account is never served to another
+        srv = hashlib.sha1("{}\n{}".format(url, user or '').encode()).hexdigest()
+        key = str(key)
+        return os.path.join(self._path, srv, key[:2], "{}.json".format(key))
+
+    def get(self, url, user, key):
+
+        path = self._entry_path(url, user, key)
+        try:
+            with open(path, 'r') as fd:
+                return json.load(fd)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry):
+
+        # Forced Refresh
+        if self._refresh:
+            return False
+
+        # Immutable Objects Never Expire
+        if entry['immutable']:
+            return True
+
+        # Revalidate When Server Provided Validators
+        if entry['etag'] or entry['modified']:
+            return False
+
+        # Otherwise Expire on TTL
+        ttl = entry['ttl'] if entry['ttl'] is not None else self._ttl
+        return (time.time() - entry['time']) < ttl
+
+    def cond_headers(self, entry):
+
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['modified']:
+            headers['If-Modified-Since'] = entry['modified']
+        return headers
+
+    def put(self, url, user, key, obj, etag=None, modified=None, ttl=None, immutable=False):
+
+        entry = {'obj': obj, 'etag': etag, 'modified': modified,
+                 'ttl': ttl, 'immutable': immutable, 'time': time.time()}
+        self._write(self._entry_path(url, user, key), entry)
+
+    def touch(self, url, user, key, entry):
+
+        entry['time'] = time.time()
+        self._write(self._entry_path(url, user, key), entry)
+
+    def discard(self, url, user, key):
+
+        try:
+            os.remove(self._entry_path(url, user, key))
+        except FileNotFoundError:
+            pass
+
+    def _write(self, path, entry):
+
+        # Write to temp file and rename so readers never see partial entries
+        dir_path = os.path.dirname(path)
+        os.makedirs(dir_path, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=dir_path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as tmp:
+                json.dump(entry, tmp)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
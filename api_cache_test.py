@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+# COG API Client
+# api_cache Tests
+
+import time
+import uuid
+import tempfile
+import unittest
+
+import api_cache
+
+_URL = 'http://localhost'
+
+
+class ObjectCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = api_cache.ObjectCache(self.tmp_dir.name, ttl=60)
+        self.key = uuid.uuid4()
+
+    def tearDown(self):
+
+        self.tmp_dir.cleanup()
+
+    def test_put_get(self):
+
+        self.assertIsNone(self.cache.get(_URL, 'tok_a', self.key))
+        self.cache.put(_URL, 'tok_a', self.key, {'name': 'a'}, etag='"1"')
+        entry = self.cache.get(_URL, 'tok_a', self.key)
+        self.assertEqual(entry['obj'], {'name': 'a'})
+        self.assertEqual(self.cache.cond_headers(entry), {'If-None-Match': '"1"'})
+
+    def test_scope(self):
+
+        # Entries are per server and per credentials
+        self.cache.put(_URL, 'tok_a', self.key, {'name': 'a'})
+        self.assertIsNone(self.cache.get(_URL, 'tok_b', self.key))
+        self.assertIsNone(self.cache.get(_URL, None, self.key))
+        self.assertIsNone(self.cache.get('http://other', 'tok_a', self.key))
+
+    def test_discard(self):
+
+        self.cache.put(_URL, 'tok_a', self.key, {'name': 'a'})
+        self.cache.put(_URL, 'tok_b', self.key, {'name': 'b'})
+        self.cache.discard(_URL, 'tok_a', self.key)
+        self.cache.discard(_URL, 'tok_a', self.key)
+        self.assertIsNone(self.cache.get(_URL, 'tok_a', self.key))
+        self.assertIsNotNone(self.cache.get(_URL, 'tok_b', self.key))
+
+    def test_fresh(self):
+
+        self.cache.put(_URL, None, self.key, {}, ttl=None)
+        entry = self.cache.get(_URL, None, self.key)
+        self.assertTrue(self.cache.is_fresh(entry))
+
+        # Expired
+        entry['time'] = time.time() - 120
+        self.assertFalse(self.cache.is_fresh(entry))
+
+        # Validators always revalidate, immutable objects never do
+        self.cache.put(_URL, None, self.key, {}, modified='Thu, 01 Jan 2015 00:00:00 GMT')
+        self.assertFalse(self.cache.is_fresh(self.cache.get(_URL, None, self.key)))
+        self.cache.put(_URL, None, self.key, {}, immutable=True)
+        entry = self.cache.get(_URL, None, self.key)
+        entry['time'] = 0
+        self.assertTrue(self.cache.is_fresh(entry))
+
+    def test_refresh(self):
+
+        cache = api_cache.ObjectCache(self.tmp_dir.name, refresh=True)
+        cache.put(_URL, None, self.key, {}, immutable=True)
+        self.assertFalse(cache.is_fresh(cache.get(_URL, None, self.key)))
+
+
+if __name__ == '__main__':
+    unittest.main()
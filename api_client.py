@@ -9,13 +9,20 @@ import abc
 import os
 import os.path
 import multiprocessing
+import threading
+import atexit
+import weakref
 import concurrent.futures
 import functools
 import uuid
+import time
 
 import requests
 
 import util_cli
+import api_multipart
+import api_retry
+import api_uploads
 
 _EP_MY = 'my'
 _EP_MY_TOKEN = 'token'
@@ -46,8 +53,34 @@ _KEY_USERUUID = 'useruuid'
 _EP_REPORTERS = 'reporters'
 _KEY_REPORTERS = 'reporters'
 
-_BLOCK_SIZE = 1024
+_CHUNK_SIZE = 1024 * 1024 #bytes
+_PART_SUFFIX = '.part'
 _THREAD_MULTIPLIER = 5
+_POOL_CONNECTIONS = 1
+_POOL_SIZE = 10
+_STATUS_COMPLETE = 'complete'
+_UPLOAD_RETRIES = api_retry._UPLOAD_RETRIES
+_BULK_WINDOW = 1000
+
+# Open async connections, shut down at interpreter exit
+_LIVE_CONNECTIONS = weakref.WeakSet()
+
+@atexit.register
+def _shutdown_connections():
+    for conn in list(_LIVE_CONNECTIONS):
+        conn.shutdown()
+
+def collect_completed(completed):
+    """ Gather (key, future) pairs into (results, errors) dicts """
+
+    results = {}
+    errors = {}
+    for key, future in completed:
+        try:
+            results[key] = future.result()
+        except Exception as err:
+            errors[key] = err
+    return results, errors
 
 def _debug_dump(r):
 
@@ -64,11 +97,36 @@ def _debug_dump(r):
 
 class Connection(object):
 
-    def __init__(self, url, username=None, password=None, token=None):
+    def __init__(self, url, username=None, password=None, token=None,
+                 pool_size=None, keep_alive=True, cache=None, chunk_size=None,
+                 retries=None, rate_limit=None, metrics=None, uploads=None):
+
+        # Process Args
+        if chunk_size is None:
+            chunk_size = _CHUNK_SIZE
+        elif chunk_size < 1:
+            raise TypeError("chunk_size must be greater than 0")
 
         # Set vars
         self._url = url
         self._auth = None
+        self._cache = cache
+        self._uploads = uploads
+        self._chunk_size = chunk_size
+        self._metrics = metrics
+
+        # Setup Retry Policy and Rate Limit
+        if retries is None:
+            self._retry = api_retry.RetryPolicy()
+        else:
+            self._retry = api_retry.RetryPolicy(retries=retries)
+        if rate_limit:
+            self._limiter = api_retry.RateLimiter(rate_limit)
+        else:
+            self._limiter = None
+
+        # Setup Session
+        self._session = self._build_session(pool_size=pool_size, keep_alive=keep_alive)
 
         # Authenticate (if able)
         if token:
@@ -82,6 +140,56 @@ class Connection(object):
     def __exit__(self, exc_type, exc_value, traceback):
         return False
 
+    def _build_session(self, pool_size=None, keep_alive=True):
+
+        # Process Args
+        if pool_size is None:
+            pool_size = _POOL_SIZE
+        elif pool_size < 1:
+            raise TypeError("pool_size must be greater than 0")
+
+        # Setup Pooled Adapter
+        adapter = requests.adapters.HTTPAdapter(pool_connections=_POOL_CONNECTIONS,
+                                                pool_maxsize=pool_size)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        # Disable Keep-Alive (if requested)
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+
+        return session
+
+    def _request(self, method, url, **kwargs):
+
+        attempt = 0
+        start = time.time()
+        while True:
+
+            # Wait for Rate Limit
+            if self._limiter is not None:
+                self._limiter.acquire()
+
+            # Retry idempotent calls on transport errors and throttling/gateway errors
+            try:
+                res = self._session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not self._retry.can_retry(method, attempt):
+                    self._record(method, url, 'error', start, retries=attempt)
+                    raise
+                time.sleep(self._retry.delay(attempt))
+            else:
+                if not self._retry.should_retry(method, res.status_code, attempt):
+                    self._record(method, url, res.status_code, start,
+                                 res_headers=res.headers, retries=attempt)
+                    return res
+                retry_after = res.headers.get('Retry-After')
+                res.close()
+                time.sleep(self._retry.delay(attempt, retry_after))
+
+            attempt += 1
+
     def authenticate(self, username=None, password=None, token=None):
 
         endpoint = "{:s}/{:s}/{:s}/".format(self._url, _EP_MY, _EP_MY_TOKEN)
@@ -90,7 +198,7 @@ class Connection(object):
 
             # Verify Token
             auth = requests.auth.HTTPBasicAuth(token, '')
-            r = requests.get(endpoint, auth=auth)
+            r = self._request('GET', endpoint, auth=auth)
             r.raise_for_status()
             token = r.json()[_KEY_MY_TOKEN]
 
@@ -102,7 +210,7 @@ class Connection(object):
 
             # Get Token
             auth = requests.auth.HTTPBasicAuth(username, password)
-            r = requests.get(endpoint, auth=auth)
+            r = self._request('GET', endpoint, auth=auth)
             r.raise_for_status()
             token = r.json()[_KEY_MY_TOKEN]
 
@@ -117,55 +225,193 @@ class Connection(object):
     def get_url(self):
         return self._url
 
+    def get_session(self):
+        return self._session
+
+    def get_cache(self):
+        return self._cache
+
+    def get_retry_count(self):
+        return self._retry.count()
+
+    def get_metrics(self):
+        return self._metrics
+
+    def _record(self, method, url, status, start, res_headers=None, retries=0):
+
+        # Bytes from Content-Length so streamed bodies are not consumed here
+        if self._metrics is None:
+            return
+        nbytes = int(res_headers.get('Content-Length', 0)) if res_headers else 0
+        endpoint = url[len(self._url):] if url.startswith(self._url) else url
+        self._metrics.record(method, endpoint, status, time.time() - start,
+                             nbytes=nbytes, retries=retries)
+
+    def _flight_key(self, endpoint, body):
+
+        # Identical GETs: same endpoint, body and credentials
+        body = json.dumps(body, sort_keys=True) if body is not None else None
+        return (endpoint, body, self._auth_user())
+
+    def _auth_user(self):
+        return self._auth.username if self._auth else None
+
+    def cache_discard(self, key):
+        if self._cache is not None:
+            self._cache.discard(self._url, self._auth_user(), key)
+
+    def upload_lookup(self, path, extract=False, name=None):
+        """ Return (key, uids) where uids are from an earlier upload of the
+        same bytes (or None), and key is passed on to upload_record """
+
+        if self._uploads is None:
+            return None, None
+        if name is None:
+            name = os.path.basename(path)
+        key = (api_uploads.file_sha256(path), bool(extract), name)
+        uids = self._uploads.get(self._url, self._auth_user(), *key)
+        if uids is None:
+            return key, None
+        return key, [uuid.UUID(uid) for uid in uids]
+
+    def upload_record(self, key, uids):
+        if self._uploads is not None and key is not None:
+            self._uploads.put(self._url, self._auth_user(), *key, uids)
+
+    def upload_discard(self, uid):
+        if self._uploads is not None:
+            self._uploads.discard(self._url, uid)
+
+    def upload_verify(self):
+        return self._uploads is not None and self._uploads.verify
+
     def get_user(self):
         return self.http_get("{}/{}".format(_EP_MY, _EP_MY_USERNAME))[_KEY_MY_USERNAME]
 
     def get_token(self):
         return self.http_get("{}/{}".format(_EP_MY, _EP_MY_TOKEN))[_KEY_MY_TOKEN]
 
-    def http_post(self, endpoint, json=None, files=None):
+    def http_post(self, endpoint, json=None, files=None, data=None, headers=None):
         url = "{:s}/{:s}/".format(self._url, endpoint)
-        res = requests.post(url, auth=self._auth, json=json, files=files)
+        res = self._request('POST', url, auth=self._auth, json=json, files=files,
+                            data=data, headers=headers)
         res.raise_for_status()
         return res.json()
 
     def http_put(self, endpoint, json=None):
         url = "{:s}/{:s}/".format(self._url, endpoint)
-        res = requests.put(url, auth=self._auth, json=json)
+        res = self._request('PUT', url, auth=self._auth, json=json)
         res.raise_for_status()
         return res.json()
 
-    def http_get(self, endpoint=None, json=None):
+    def http_get(self, endpoint=None, json=None,
+                 cache_key=None, cache_ttl=None, cache_immutable=None):
         url = "{:s}/{:s}/".format(self._url, endpoint)
-        res = requests.get(url, auth=self._auth, json=json)
+
+        # Check Cache
+        cache = self._cache if cache_key is not None else None
+        entry = None
+        headers = {}
+        if cache is not None:
+            entry = cache.get(self._url, self._auth_user(), cache_key)
+            if entry is not None:
+                if cache.is_fresh(entry):
+                    return entry['obj']
+                headers = cache.cond_headers(entry)
+
+        res = self._request('GET', url, auth=self._auth, json=json, headers=headers)
+
+        # Revalidated
+        if entry is not None and res.status_code == requests.codes.not_modified:
+            cache.touch(self._url, self._auth_user(), cache_key, entry)
+            return entry['obj']
+
         res.raise_for_status()
-        return res.json()
+        obj = res.json()
+
+        # Update Cache
+        if cache is not None:
+            immutable = cache_immutable(obj) if cache_immutable else False
+            cache.put(self._url, self._auth_user(), cache_key, obj,
+                      etag=res.headers.get('ETag'),
+                      modified=res.headers.get('Last-Modified'),
+                      ttl=cache_ttl, immutable=immutable)
+
+        return obj
 
     def http_delete(self, endpoint, json=None):
         url = "{:s}/{:s}/".format(self._url, endpoint)
-        res = requests.delete(url, auth=self._auth, json=json)
+        res = self._request('DELETE', url, auth=self._auth, json=json)
         res.raise_for_status()
         return res.json()
 
-    def http_download(self, endpoint, path):
+    def _download_range(self, part_path):
+
+        # Resume from any partial download left by a previous attempt
+        try:
+            offset = os.path.getsize(part_path)
+        except FileNotFoundError:
+            offset = 0
+        if offset:
+            return offset, {'Range': "bytes={:d}-".format(offset)}
+        else:
+            return offset, {}
+
+    def _download_resumed(self, status, headers, offset):
+
+        # Only append if the server honored our range from the right offset
+        if offset and status == requests.codes.partial_content:
+            content_range = headers.get('Content-Range', '')
+            return content_range.startswith("bytes {:d}-".format(offset))
+        else:
+            return False
+
+    def _download_hash_part(self, part_path, hasher, chunk_size):
+
+        # Resumed downloads: hash the bytes already on disk first
+        with open(part_path, 'rb') as fd:
+            for chunk in iter(lambda: fd.read(chunk_size), b''):
+                hasher.update(chunk)
+
+    def http_download(self, endpoint, path, chunk_size=None, hasher=None):
         url = "{:s}/{:s}/".format(self._url, endpoint)
-        res = requests.get(url, auth=self._auth)
-        res.raise_for_status()
-        with open(path, 'wb') as fd:
-            for chunk in res.iter_content(chunk_size=_BLOCK_SIZE):
+
+        # Process Args
+        if chunk_size is None:
+            chunk_size = self._chunk_size
+
+        # Stream to partial file, then rename into place
+        part_path = path + _PART_SUFFIX
+        offset, headers = self._download_range(part_path)
+        res = self._request('GET', url, auth=self._auth, headers=headers, stream=True)
+        try:
+
+            # Stale partial file: start over
+            if offset and res.status_code == requests.codes.range_not_satisfiable:
+                os.remove(part_path)
+                return self.http_download(endpoint, path, chunk_size=chunk_size, hasher=hasher)
+
+            res.raise_for_status()
+            mode = 'ab' if self._download_resumed(res.status_code, res.headers, offset) else 'wb'
+            if hasher is not None and mode == 'ab':
+                self._download_hash_part(part_path, hasher, chunk_size)
+            with open(part_path, mode) as fd:
+                for chunk in res.iter_content(chunk_size=chunk_size):
                     fd.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+
+        finally:
+            # Response is only a context manager in requests>=2.18
+            res.close()
+
+        os.replace(part_path, path)
         return path
 
 class AsyncConnection(Connection):
 
     def __init__(self, *args, threads=None, connection=None, **kwargs):
 
-        if connection is None:
-            # Call Parent
-            super().__init__(*args, **kwargs)
-        else:
-            super().__init__(connection.get_url(), token=connection.get_token())
-
         # Handle Args
         if threads is None:
             self.threads = multiprocessing.cpu_count() * _THREAD_MULTIPLIER
@@ -174,8 +420,24 @@ class AsyncConnection(Connection):
         else:
             raise TypeError("Threads must be greater than 0")
 
+        # Size connection pool to match worker threads
+        if kwargs.get('pool_size') is None:
+            kwargs['pool_size'] = self.threads
+
+        if connection is None:
+            # Call Parent
+            super().__init__(*args, **kwargs)
+        else:
+            super().__init__(connection.get_url(), token=connection.get_token(), **kwargs)
+
         # Setup Vars
         self._executor = None
+        self._executor_lock = threading.Lock()
+        self._refs = 0
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._flight_hits = 0
+        self._flight_misses = 0
 
     def __enter__(self):
         self.open()
@@ -185,13 +447,42 @@ class AsyncConnection(Connection):
         self.close()
         return False
 
+    def _get_executor(self):
+
+        # Lazily start the shared executor
+        with self._executor_lock:
+            if self._executor is None:
+                mw = self.threads
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=mw)
+                _LIVE_CONNECTIONS.add(self)
+            return self._executor
+
     def open(self):
-        mw = self.threads
-        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=mw)
+        """ Hold the executor open until the matching close() """
+
+        with self._executor_lock:
+            self._refs += 1
+        self._get_executor()
 
     def close(self, wait=True):
-        self._executor.shutdown(wait=wait)
-        self._executor = None
+        """ Release one open(); the last release shuts the executor down """
+
+        with self._executor_lock:
+            if self._refs > 0:
+                self._refs -= 1
+            if self._refs > 0:
+                return
+        self.shutdown(wait=wait)
+
+    def shutdown(self, wait=True):
+
+        with self._executor_lock:
+            executor = self._executor
+            self._executor = None
+            self._refs = 0
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        _LIVE_CONNECTIONS.discard(self)
 
     def is_open(self):
         if self._executor:
@@ -200,21 +491,41 @@ class AsyncConnection(Connection):
             return False
 
     def submit(self, fun, *args, **kwargs):
-
-        # Open if closed
-        opened = False
-        if not self.is_open():
-            self.open()
-            opened = True
-
-        # Call Function
-        ret = self._executor.submit(fun, *args, **kwargs)
-
-        # Close if opened
-        if opened:
-            self.close()
-
-        return ret
+        return self._get_executor().submit(fun, *args, **kwargs)
+
+    def get_flight_stats(self):
+        """ Return (hits, misses) for coalesced GETs """
+        return self._flight_hits, self._flight_misses
+
+    def http_get(self, endpoint=None, json=None, **kwargs):
+
+        # Join an identical in-flight GET (if any)
+        key = self._flight_key(endpoint, json)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = concurrent.futures.Future()
+                self._flights[key] = flight
+                self._flight_misses += 1
+                leader = True
+            else:
+                self._flight_hits += 1
+                leader = False
+        if not leader:
+            return flight.result()
+
+        # Lead the GET and share its outcome
+        try:
+            obj = super().http_get(endpoint, json=json, **kwargs)
+        except Exception as err:
+            flight.set_exception(err)
+            raise
+        else:
+            flight.set_result(obj)
+            return obj
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
 
     def async_http_post(self, *args, **kwargs):
         return self.submit(self.http_post, *args, **kwargs)
@@ -294,6 +605,9 @@ class COGObject(object):
 
     __metaclass__ = abc.ABCMeta
 
+    # Cache TTL (None uses the cache default)
+    _cache_ttl = None
+
     @abc.abstractmethod
     def __init__(self, connection):
         """ Constructor"""
@@ -302,17 +616,22 @@ class COGObject(object):
         self._ep = None
         self._key = None
 
+    def _is_immutable(self, obj):
+        return False
+
     @abc.abstractmethod
-    def create(self, endpoint=None, json=None, files=None):
+    def create(self, endpoint=None, json=None, files=None, data=None, headers=None):
         if endpoint is None:
             endpoint = self._ep
-        res = self._conn.http_post(endpoint, json=json, files=files)
+        res = self._conn.http_post(endpoint, json=json, files=files,
+                                   data=data, headers=headers)
         uuid_list = res[self._key]
         return [uuid.UUID(uid) for uid in uuid_list]
 
     def update(self, uid, json):
         uid = str(uid)
         ep = "{:s}/{:s}".format(self._ep, uid)
+        self._conn.cache_discard(uid)
         res = self._conn.http_put(ep, json=json)
         obj = res[uid]
         return obj
@@ -329,17 +648,62 @@ class COGObject(object):
     def show(self, uid):
         uid = str(uid)
         ep = "{:s}/{:s}".format(self._ep, uid)
-        res = self._conn.http_get(ep)
+        res = self._conn.http_get(ep, cache_key=uid, cache_ttl=self._cache_ttl,
+                                  cache_immutable=lambda res: self._is_immutable(res[uid]))
         obj = res[uid]
         return obj
 
     def delete(self, uid):
         uid = str(uid)
         ep = "{:s}/{:s}".format(self._ep, uid)
+        self._conn.cache_discard(uid)
         res = self._conn.http_delete(ep)
         obj = res[uid]
         return obj
 
+    ### Bulk Methods ###
+
+    def _iter_call(self, fun, keys, args=None, kwargs=None, window=None):
+        """ Yield (key, future) pairs for fun(key, *args, **kwargs) over keys """
+
+        # Process Args
+        if args is None:
+            args = []
+        if kwargs is None:
+            kwargs = {}
+
+        for key in keys:
+            future = concurrent.futures.Future()
+            try:
+                future.set_result(fun(key, *args, **kwargs))
+            except Exception as err:
+                future.set_exception(err)
+            yield key, future
+
+    def _update_from(self, uid, updates):
+        return self.update(uid, **updates[uid])
+
+    def iter_show(self, uids, window=_BULK_WINDOW):
+        return self._iter_call(self.show, uids, window=window)
+
+    def iter_delete(self, uids, window=_BULK_WINDOW):
+        return self._iter_call(self.delete, uids, window=window)
+
+    def iter_update(self, updates, window=_BULK_WINDOW):
+        return self._iter_call(self._update_from, updates, args=[updates], window=window)
+
+    def show_many(self, uids, window=_BULK_WINDOW):
+        return collect_completed(self.iter_show(uids, window=window))
+
+    def delete_many(self, uids, window=_BULK_WINDOW):
+        return collect_completed(self.iter_delete(uids, window=window))
+
+    def update_many(self, updates, window=_BULK_WINDOW):
+        """ Apply {uid: kwargs} updates, where kwargs are the keyword
+        arguments of this class's update() (e.g. {'name': ...} for
+        Assignments, {'json': {...}} where update() takes raw JSON) """
+        return collect_completed(self.iter_update(updates, window=window))
+
 class AsyncCOGObject(COGObject):
 
     @abc.abstractmethod
@@ -368,6 +732,20 @@ class AsyncCOGObject(COGObject):
     def async_delete(self, *args, **kwargs):
         return self._conn.submit(self.delete, *args, **kwargs)
 
+    def _iter_call(self, fun, keys, args=None, kwargs=None, window=None):
+        """ Yield (key, future) pairs in completion order, window calls at a time """
+
+        # Process Args
+        if args is None:
+            args = []
+        if kwargs is None:
+            kwargs = {}
+
+        def async_fun(key, *args, **kwargs):
+            return self._conn.submit(fun, key, *args, **kwargs)
+
+        return util_cli.iter_completed(keys, async_fun, args=args, kwargs=kwargs, window=window)
+
 class COGFileAttachedObject(COGObject):
 
     def attach_files(self, uid, fle_uids):
@@ -384,6 +762,7 @@ class COGFileAttachedObject(COGObject):
         data = {_KEY_FILES: fle_uids}
 
         # HTTP Call
+        self._conn.cache_discard(uid)
         res = self._conn.http_put(endpoint=ep, json=data)
         uuid_list = res[_KEY_FILES]
         return [uuid.UUID(uid) for uid in uuid_list]
@@ -402,6 +781,7 @@ class COGFileAttachedObject(COGObject):
         data = {_KEY_FILES: fle_uids}
 
         # HTTP Call
+        self._conn.cache_discard(uid)
         res = self._conn.http_delete(endpoint=ep, json=data)
         uuid_list = res[_KEY_FILES]
         return [uuid.UUID(uid) for uid in uuid_list]
@@ -409,10 +789,10 @@ class COGFileAttachedObject(COGObject):
 class AsyncCOGFileAttachedObject(COGFileAttachedObject, AsyncCOGObject):
 
     def async_attach_files(self, *args, **kwargs):
-        return self._conn.submit(self.attach_file, *args, **kwargs)
+        return self._conn.submit(self.attach_files, *args, **kwargs)
 
     def async_detach_files(self, *args, **kwargs):
-        return self._conn.submit(self.detach_file, *args, **kwargs)
+        return self._conn.submit(self.detach_files, *args, **kwargs)
 
 class Files(COGObject):
 
@@ -426,7 +806,14 @@ class Files(COGObject):
         self._ep = _EP_FILES
         self._key = _KEY_FILES
 
-    def create(self, path, extract=False):
+    def create(self, path, extract=False, name=None, callback=None, reuse=False):
+
+        # Reuse Earlier Upload of the Same Bytes (shared files only)
+        idx_key, uids = None, None
+        if reuse:
+            idx_key, uids = self._conn.upload_lookup(path, extract=extract, name=name)
+        if uids is not None and self._uploads_exist(uids):
+            return uids
 
         # Process Args
         if extract:
@@ -434,11 +821,49 @@ class Files(COGObject):
         else:
             key = 'file'
 
-        # Setup Files
-        files = {key: open(path, 'rb')}
+        # Stream Multipart Body
+        with api_multipart.MultipartFile(key, path, name=name, callback=callback) as body:
 
-        # Call Parent
-        return super().create(files=files)
+            # Call Parent
+            headers = {'Content-Type': body.content_type}
+            uids = super().create(data=body, headers=headers)
+
+        self._conn.upload_record(idx_key, uids)
+        return uids
+
+    def _uploads_exist(self, uids):
+
+        if not self._conn.upload_verify():
+            return True
+
+        # Show each file, bypassing the object cache
+        for uid in uids:
+            ep = "{:s}/{:s}".format(self._ep, str(uid))
+            try:
+                self._conn.http_get(ep)
+            except requests.exceptions.RequestException:
+                self._conn.upload_discard(uid)
+                return False
+        return True
+
+    def create_retry(self, path, extract=False, name=None, retries=_UPLOAD_RETRIES):
+
+        # Retry transport and server errors, but not client errors
+        attempt = 0
+        while True:
+            try:
+                return self.create(path, extract=extract, name=name)
+            except requests.exceptions.RequestException as err:
+                res = err.response
+                if res is not None and res.status_code < 500:
+                    raise
+                if attempt >= retries:
+                    raise
+                attempt += 1
+
+    def delete(self, uid):
+        self._conn.upload_discard(uid)
+        return super().delete(uid)
 
     def list(self, tst_uid=None, sub_uid=None):
 
@@ -491,7 +916,7 @@ class Files(COGObject):
 
         return path
 
-    def direct_download(self, uid, path, overwrite=False):
+    def direct_download(self, uid, path, overwrite=False, hasher=None):
 
         # Clean Input
         path = os.path.abspath(path)
@@ -500,7 +925,7 @@ class Files(COGObject):
 
             # Download File
             ep = "{:s}/{:s}/{:s}/".format(self._ep, str(uid), _EP_FILES_CONTENTS)
-            path = self._conn.http_download(ep, path)
+            path = self._conn.http_download(ep, path, hasher=hasher)
 
         return path
 
@@ -521,6 +946,20 @@ class AsyncFiles(Files, AsyncCOGObject):
     def async_direct_download(self, *args, **kwargs):
         return self._conn.submit(self.direct_download, *args, **kwargs)
 
+    def async_create_retry(self, *args, **kwargs):
+        return self._conn.submit(self.create_retry, *args, **kwargs)
+
+    def create_many(self, paths, root=None, extract=False, retries=_UPLOAD_RETRIES, window=None):
+        """ Upload paths in parallel, naming each relative to root (if given).
+        Returns (uploaded, failed) dicts keyed by path """
+
+        def async_fun(path):
+            name = os.path.relpath(path, root) if root else None
+            return self.async_create_retry(path, extract=extract, name=name, retries=retries)
+
+        completed = util_cli.iter_completed(paths, async_fun, window=window)
+        return collect_completed(completed)
+
 class Assignments(COGObject):
 
     def __init__(self, connection):
@@ -689,6 +1128,7 @@ class Tests(COGFileAttachedObject):
         data = {_KEY_REPORTERS: rpt_uids}
 
         # HTTP Call
+        self._conn.cache_discard(uid)
         res = self._conn.http_put(endpoint=ep, json=data)
         uuid_list = res[_KEY_REPORTERS]
         return [uuid.UUID(uid) for uid in uuid_list]
@@ -707,6 +1147,7 @@ class Tests(COGFileAttachedObject):
         data = {_KEY_REPORTERS: rpt_uids}
 
         # HTTP Call
+        self._conn.cache_discard(uid)
         res = self._conn.http_delete(endpoint=ep, json=data)
         uuid_list = res[_KEY_REPORTERS]
         return [uuid.UUID(uid) for uid in uuid_list]
@@ -769,6 +1210,9 @@ class AsyncSubmissions(Submissions, AsyncCOGFileAttachedObject):
 
 class Runs(COGObject):
 
+    # Incomplete runs change as they execute
+    _cache_ttl = 0
+
     def __init__(self, connection):
         """ Constructor"""
 
@@ -779,6 +1223,9 @@ class Runs(COGObject):
         self._ep = _EP_RUNS
         self._key = _KEY_RUNS
 
+    def _is_immutable(self, obj):
+        return obj['status'].startswith(_STATUS_COMPLETE)
+
     def create(self, sub_uid, tst_uid):
 
         # Setup Data
@@ -0,0 +1,937 @@
+# COG API Client
+# v2 API
+# asyncio Transport
+
+import os
+import os.path
+import time
+import asyncio
+import threading
+import concurrent.futures
+import functools
+import uuid
+
+import aiohttp
+
+import api_client
+import util_cli
+
+_CONCURRENCY = 100
+
+class AioConnection(api_client.Connection):
+
+    def __init__(self, *args, concurrency=None, connection=None, **kwargs):
+
+        # Handle Args
+        if concurrency is None:
+            self.concurrency = _CONCURRENCY
+        elif concurrency > 0:
+            self.concurrency = concurrency
+        else:
+            raise TypeError("Concurrency must be greater than 0")
+        self._keep_alive = kwargs.get('keep_alive', True)
+
+        if connection is None:
+            # Call Parent
+            super().__init__(*args, **kwargs)
+        else:
+            super().__init__(connection.get_url(), token=connection.get_token(), **kwargs)
+
+        # Setup Vars
+        self._loop = None
+        self._thread = None
+        self._loop_lock = threading.Lock()
+        self._refs = 0
+        self._aio_session = None
+        self._semaphore = None
+        self._pending = set()
+        self._flights = {}
+        self._flight_hits = 0
+        self._flight_misses = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    async def __aenter__(self):
+        await self.aio_open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aio_close()
+        return False
+
+    async def aio_open(self):
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency,
+                                         force_close=(not self._keep_alive))
+        self._aio_session = aiohttp.ClientSession(connector=connector)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def aio_close(self):
+
+        await self._aio_session.close()
+        self._aio_session = None
+        self._semaphore = None
+
+    def _get_loop(self):
+
+        # Lazily run a single shared event loop in a background thread
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, daemon=True)
+                self._thread.start()
+                asyncio.run_coroutine_threadsafe(self.aio_open(), loop).result()
+                self._loop = loop
+                api_client._LIVE_CONNECTIONS.add(self)
+            return self._loop
+
+    def open(self):
+        """ Hold the event loop open until the matching close() """
+
+        with self._loop_lock:
+            self._refs += 1
+        self._get_loop()
+
+    def close(self, wait=True):
+        """ Release one open(); the last release stops the event loop """
+
+        with self._loop_lock:
+            if self._refs > 0:
+                self._refs -= 1
+            if self._refs > 0:
+                return
+        self.shutdown(wait=wait)
+
+    def shutdown(self, wait=True):
+
+        with self._loop_lock:
+            loop = self._loop
+            thread = self._thread
+            self._loop = None
+            self._thread = None
+            self._refs = 0
+        api_client._LIVE_CONNECTIONS.discard(self)
+        if loop is None:
+            return
+
+        # Wait for outstanding calls
+        if wait:
+            concurrent.futures.wait(list(self._pending))
+        else:
+            for f in list(self._pending):
+                f.cancel()
+
+        # Stop event loop
+        asyncio.run_coroutine_threadsafe(self.aio_close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def is_open(self):
+        if self._loop:
+            return True
+        else:
+            return False
+
+    def submit(self, coro_fun, *args, **kwargs):
+
+        # Schedule Coroutine
+        ret = asyncio.run_coroutine_threadsafe(coro_fun(*args, **kwargs), self._get_loop())
+        self._pending.add(ret)
+        ret.add_done_callback(self._pending.discard)
+        return ret
+
+    def _aio_auth(self):
+        if self._auth:
+            return aiohttp.BasicAuth(self._auth.username, self._auth.password)
+        else:
+            return None
+
+    async def _aio_send(self, method, url, **kwargs):
+
+        attempt = 0
+        start = time.time()
+        while True:
+
+            # Wait for Rate Limit
+            if self._limiter is not None:
+                await asyncio.sleep(self._limiter.reserve())
+
+            # Retry idempotent calls on transport errors and throttling/gateway errors
+            try:
+                res = await self._aio_session.request(method, url, auth=self._aio_auth(), **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not self._retry.can_retry(method, attempt):
+                    self._record(method, url, 'error', start, retries=attempt)
+                    raise
+                await asyncio.sleep(self._retry.delay(attempt))
+            else:
+                if not self._retry.should_retry(method, res.status, attempt):
+                    self._record(method, url, res.status, start,
+                                 res_headers=res.headers, retries=attempt)
+                    return res
+                retry_after = res.headers.get('Retry-After')
+                res.release()
+                await asyncio.sleep(self._retry.delay(attempt, retry_after))
+
+            attempt += 1
+
+    async def _aio_blocking(self, fun, *args, **kwargs):
+        """ Run blocking disk I/O in the default executor, off the event loop """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(fun, *args, **kwargs))
+
+    async def _aio_request(self, method, endpoint, cache_key=None,
+                           cache_ttl=None, cache_immutable=None, **kwargs):
+
+        url = "{:s}/{:s}/".format(self._url, endpoint)
+
+        # Check Cache
+        cache = self._cache if cache_key is not None else None
+        entry = None
+        headers = {}
+        if cache is not None:
+            entry = await self._aio_blocking(cache.get, self._url, self._auth_user(), cache_key)
+            if entry is not None:
+                if cache.is_fresh(entry):
+                    return entry['obj']
+                headers = cache.cond_headers(entry)
+
+        async with self._semaphore:
+            async with await self._aio_send(method, url, headers=headers, **kwargs) as res:
+
+                # Revalidated
+                if entry is not None and res.status == 304:
+                    await self._aio_blocking(cache.touch, self._url, self._auth_user(),
+                                             cache_key, entry)
+                    return entry['obj']
+
+                res.raise_for_status()
+                obj = await res.json(content_type=None)
+
+        # Update Cache
+        if cache is not None:
+            immutable = cache_immutable(obj) if cache_immutable else False
+            await self._aio_blocking(cache.put, self._url, self._auth_user(), cache_key, obj,
+                                     etag=res.headers.get('ETag'),
+                                     modified=res.headers.get('Last-Modified'),
+                                     ttl=cache_ttl, immutable=immutable)
+
+        return obj
+
+    async def aio_http_post(self, endpoint, json=None, data=None):
+        return await self._aio_request('POST', endpoint, json=json, data=data)
+
+    async def aio_http_put(self, endpoint, json=None):
+        return await self._aio_request('PUT', endpoint, json=json)
+
+    def get_flight_stats(self):
+        """ Return (hits, misses) for coalesced GETs """
+        return self._flight_hits, self._flight_misses
+
+    async def aio_http_get(self, endpoint=None, json=None,
+                           cache_key=None, cache_ttl=None, cache_immutable=None):
+
+        # Join an identical in-flight GET (if any)
+        key = self._flight_key(endpoint, json)
+        flight = self._flights.get(key)
+        if flight is not None:
+            self._flight_hits += 1
+            return await asyncio.shield(flight)
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        self._flight_misses += 1
+
+        # Lead the GET and share its outcome
+        try:
+            obj = await self._aio_request('GET', endpoint, json=json, cache_key=cache_key,
+                                          cache_ttl=cache_ttl, cache_immutable=cache_immutable)
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as err:
+            flight.set_exception(err)
+            flight.exception() # Mark retrieved when no one joined
+            raise
+        else:
+            flight.set_result(obj)
+            return obj
+        finally:
+            del self._flights[key]
+
+    async def aio_http_delete(self, endpoint, json=None):
+        return await self._aio_request('DELETE', endpoint, json=json)
+
+    async def aio_http_download(self, endpoint, path, chunk_size=None, hasher=None):
+
+        url = "{:s}/{:s}/".format(self._url, endpoint)
+
+        # Process Args
+        if chunk_size is None:
+            chunk_size = self._chunk_size
+
+        # Stream to partial file, then rename into place
+        part_path = path + api_client._PART_SUFFIX
+        offset, headers = await self._aio_blocking(self._download_range, part_path)
+        async with self._semaphore:
+            async with await self._aio_send('GET', url, headers=headers) as res:
+
+                # Stale partial file: start over
+                restart = offset and res.status == 416
+                if not restart:
+                    res.raise_for_status()
+                    resumed = self._download_resumed(res.status, res.headers, offset)
+                    if hasher is not None and resumed:
+                        await self._aio_blocking(self._download_hash_part, part_path,
+                                                 hasher, chunk_size)
+                    fd = await self._aio_blocking(open, part_path, 'ab' if resumed else 'wb')
+                    try:
+                        async for chunk in res.content.iter_chunked(chunk_size):
+                            await self._aio_blocking(fd.write, chunk)
+                            if hasher is not None:
+                                hasher.update(chunk)
+                    finally:
+                        await self._aio_blocking(fd.close)
+
+        if restart:
+            await self._aio_blocking(os.remove, part_path)
+            return await self.aio_http_download(endpoint, path, chunk_size=chunk_size,
+                                                hasher=hasher)
+
+        await self._aio_blocking(os.replace, part_path, path)
+        return path
+
+class AioCOGObject(api_client.COGObject):
+
+    def __init__(self, aio_connection):
+        """ Constructor"""
+
+        # Check Type
+        if type(aio_connection) is not AioConnection:
+            raise TypeError("Connection must be AioConnection")
+
+        # Call Parent
+        super().__init__(aio_connection)
+
+    async def aio_create(self, endpoint=None, json=None, data=None):
+        if endpoint is None:
+            endpoint = self._ep
+        res = await self._conn.aio_http_post(endpoint, json=json, data=data)
+        uuid_list = res[self._key]
+        return [uuid.UUID(uid) for uid in uuid_list]
+
+    async def aio_update(self, uid, json):
+        uid = str(uid)
+        ep = "{:s}/{:s}".format(self._ep, uid)
+        await self._conn._aio_blocking(self._conn.cache_discard, uid)
+        res = await self._conn.aio_http_put(ep, json=json)
+        obj = res[uid]
+        return obj
+
+    async def aio_list(self, endpoint=None):
+
+        if endpoint is None:
+            endpoint = self._ep
+
+        res = await self._conn.aio_http_get(endpoint)
+        uuid_list = res[self._key]
+        return [uuid.UUID(uid) for uid in uuid_list]
+
+    async def aio_show(self, uid):
+        uid = str(uid)
+        ep = "{:s}/{:s}".format(self._ep, uid)
+        res = await self._conn.aio_http_get(ep, cache_key=uid, cache_ttl=self._cache_ttl,
+                                            cache_immutable=lambda res: self._is_immutable(res[uid]))
+        obj = res[uid]
+        return obj
+
+    async def aio_delete(self, uid):
+        uid = str(uid)
+        ep = "{:s}/{:s}".format(self._ep, uid)
+        await self._conn._aio_blocking(self._conn.cache_discard, uid)
+        res = await self._conn.aio_http_delete(ep)
+        obj = res[uid]
+        return obj
+
+    async def _aio_update_from(self, uid, updates):
+        return await self.aio_update(uid, **updates[uid])
+
+    def async_create(self, *args, **kwargs):
+        return self._conn.submit(self.aio_create, *args, **kwargs)
+
+    def async_list(self, *args, **kwargs):
+        return self._conn.submit(self.aio_list, *args, **kwargs)
+
+    def async_update(self, *args, **kwargs):
+        return self._conn.submit(self.aio_update, *args, **kwargs)
+
+    def async_show(self, *args, **kwargs):
+        return self._conn.submit(self.aio_show, *args, **kwargs)
+
+    def async_delete(self, *args, **kwargs):
+        return self._conn.submit(self.aio_delete, *args, **kwargs)
+
+    def _iter_call(self, coro_fun, keys, args=None, kwargs=None, window=None):
+        """ Yield (key, future) pairs in completion order, window calls at a time """
+
+        # Process Args
+        if args is None:
+            args = []
+        if kwargs is None:
+            kwargs = {}
+
+        def async_fun(key, *args, **kwargs):
+            return self._conn.submit(coro_fun, key, *args, **kwargs)
+
+        return util_cli.iter_completed(keys, async_fun, args=args, kwargs=kwargs, window=window)
+
+    def iter_show(self, uids, window=api_client._BULK_WINDOW):
+        return self._iter_call(self.aio_show, uids, window=window)
+
+    def iter_delete(self, uids, window=api_client._BULK_WINDOW):
+        return self._iter_call(self.aio_delete, uids, window=window)
+
+    def iter_update(self, updates, window=api_client._BULK_WINDOW):
+        return self._iter_call(self._aio_update_from, updates, args=[updates], window=window)
+
+class AioCOGFileAttachedObject(api_client.COGFileAttachedObject, AioCOGObject):
+
+    async def aio_attach_files(self, uid, fle_uids):
+
+        # Check Args
+        if not fle_uids:
+            raise TypeError("fle_uids must not be empty")
+
+        # Setup Endpoint
+        ep = "{:s}/{:s}/{:s}".format(self._ep, str(uid), api_client._EP_FILES)
+
+        # Setup Data
+        fle_uids = [str(uid) for uid in fle_uids]
+        data = {api_client._KEY_FILES: fle_uids}
+
+        # HTTP Call
+        await self._conn._aio_blocking(self._conn.cache_discard, uid)
+        res = await self._conn.aio_http_put(endpoint=ep, json=data)
+        uuid_list = res[api_client._KEY_FILES]
+        return [uuid.UUID(uid) for uid in uuid_list]
+
+    async def aio_detach_files(self, uid, fle_uids):
+
+        # Check Args
+        if not fle_uids:
+            raise TypeError("fle_uids must not be empty")
+
+        # Setup Endpoint
+        ep = "{:s}/{:s}/{:s}".format(self._ep, str(uid), api_client._EP_FILES)
+
+        # Setup Data
+        fle_uids = [str(uid) for uid in fle_uids]
+        data = {api_client._KEY_FILES: fle_uids}
+
+        # HTTP Call
+        await self._conn._aio_blocking(self._conn.cache_discard, uid)
+        res = await self._conn.aio_http_delete(endpoint=ep, json=data)
+        uuid_list = res[api_client._KEY_FILES]
+        return [uuid.UUID(uid) for uid in uuid_list]
+
+    def async_attach_files(self, *args, **kwargs):
+        return self._conn.submit(self.aio_attach_files, *args, **kwargs)
+
+    def async_detach_files(self, *args, **kwargs):
+        return self._conn.submit(self.aio_detach_files, *args, **kwargs)
+
+class AioFiles(api_client.Files, AioCOGObject):
+
+    async def aio_create(self, path, extract=False, name=None, reuse=False):
+
+        # Reuse Earlier Upload of the Same Bytes (shared files only)
+        idx_key, uids = None, None
+        if reuse:
+            idx_key, uids = await self._conn._aio_blocking(self._conn.upload_lookup, path,
+                                                           extract=extract, name=name)
+        if uids is not None and await self._aio_uploads_exist(uids):
+            return uids
+
+        # Process Args
+        if extract:
+            key = 'extract'
+        else:
+            key = 'file'
+        if name is None:
+            name = os.path.basename(path)
+
+        # Setup Files (FormData streams file fields)
+        with open(path, 'rb') as fd:
+            data = aiohttp.FormData()
+            data.add_field(key, fd, filename=name)
+
+            # Call Parent
+            uids = await super().aio_create(data=data)
+
+        await self._conn._aio_blocking(self._conn.upload_record, idx_key, uids)
+        return uids
+
+    async def _aio_uploads_exist(self, uids):
+
+        if not self._conn.upload_verify():
+            return True
+
+        # Show each file, bypassing the object cache
+        for uid in uids:
+            ep = "{:s}/{:s}".format(self._ep, str(uid))
+            try:
+                await self._conn.aio_http_get(ep)
+            except aiohttp.ClientError:
+                await self._conn._aio_blocking(self._conn.upload_discard, uid)
+                return False
+        return True
+
+    async def aio_delete(self, uid):
+        await self._conn._aio_blocking(self._conn.upload_discard, uid)
+        return await super().aio_delete(uid)
+
+    async def aio_create_retry(self, path, extract=False, name=None,
+                               retries=api_client._UPLOAD_RETRIES):
+
+        # Retry transport and server errors, but not client errors
+        attempt = 0
+        while True:
+            try:
+                return await self.aio_create(path, extract=extract, name=name)
+            except aiohttp.ClientError as err:
+                if isinstance(err, aiohttp.ClientResponseError) and err.status < 500:
+                    raise
+                if attempt >= retries:
+                    raise
+                attempt += 1
+
+    async def aio_list(self, tst_uid=None, sub_uid=None):
+
+        # Setup Endpoint
+        if tst_uid:
+            ep = "{:s}/{:s}/{:s}".format(api_client._EP_TESTS, str(tst_uid),
+                                         api_client._EP_FILES)
+        elif sub_uid:
+            ep = "{:s}/{:s}/{:s}".format(api_client._EP_SUBMISSIONS, str(sub_uid),
+                                         api_client._EP_FILES)
+        else:
+            ep = self._ep
+
+        # Call Parent
+        return await super().aio_list(endpoint=ep)
+
+    async def aio_list_by_tst(self, tst_uid):
+        return await self.aio_list(tst_uid=tst_uid)
+
+    async def aio_list_by_sub(self, sub_uid):
+        return await self.aio_list(sub_uid=sub_uid)
+
+    async def aio_list_by_null(self, null_uid):
+        return await self.aio_list()
+
+    async def aio_download(self, uid, path, orig_path=False, overwrite=False):
+
+        # Clean Input
+        path = os.path.abspath(path)
+
+        # Process Directory Path
+        if os.path.isdir(path):
+            fle_obj = await self.aio_show(uid)
+            fle_path = fle_obj["name"]
+            fle_path = util_cli.clean_path(fle_path)
+            fle_path = util_cli.secure_path(fle_path)
+            fle_name = os.path.basename(fle_path)
+            if orig_path:
+                path = os.path.join(path, fle_path)
+            else:
+                path = os.path.join(path, fle_name)
+
+        if overwrite or not os.path.exists(path):
+
+            # Create Directory
+            dir_path = os.path.dirname(path)
+            os.makedirs(dir_path, exist_ok=True)
+
+            # Download File
+            ep = "{:s}/{:s}/{:s}/".format(self._ep, str(uid), api_client._EP_FILES_CONTENTS)
+            path = await self._conn.aio_http_download(ep, path)
+
+        return path
+
+    async def aio_direct_download(self, uid, path, overwrite=False, hasher=None):
+
+        # Clean Input
+        path = os.path.abspath(path)
+
+        if overwrite or not os.path.exists(path):
+
+            # Download File
+            ep = "{:s}/{:s}/{:s}/".format(self._ep, str(uid), api_client._EP_FILES_CONTENTS)
+            path = await self._conn.aio_http_download(ep, path, hasher=hasher)
+
+        return path
+
+    def async_list_by_tst(self, *args, **kwargs):
+        return self._conn.submit(self.aio_list_by_tst, *args, **kwargs)
+
+    def async_list_by_sub(self, *args, **kwargs):
+        return self._conn.submit(self.aio_list_by_sub, *args, **kwargs)
+
+    def async_list_by_null(self, *args, **kwargs):
+        return self._conn.submit(self.aio_list_by_null, *args, **kwargs)
+
+    def async_download(self, *args, **kwargs):
+        return self._conn.submit(self.aio_download, *args, **kwargs)
+
+    def async_direct_download(self, *args, **kwargs):
+        return self._conn.submit(self.aio_direct_download, *args, **kwargs)
+
+    def async_create_retry(self, *args, **kwargs):
+        return self._conn.submit(self.aio_create_retry, *args, **kwargs)
+
+    def create_many(self, paths, root=None, extract=False,
+                    retries=api_client._UPLOAD_RETRIES, window=None):
+        """ Upload paths concurrently, naming each relative to root (if given).
+        Returns (uploaded, failed) dicts keyed by path """
+
+        def async_fun(path):
+            name = os.path.relpath(path, root) if root else None
+            return self.async_create_retry(path, extract=extract, name=name, retries=retries)
+
+        completed = util_cli.iter_completed(paths, async_fun, window=window)
+        return api_client.collect_completed(completed)
+
+class AioAssignments(api_client.Assignments, AioCOGObject):
+
+    async def aio_create(self, name, env='local',
+                         duedate=None, respect_duedate=None,
+                         accepting_runs=None, accepting_subs=None):
+
+        # Setup Data
+        data = {'name': str(name), 'env': str(env)}
+        if duedate is not None:
+            data['duedate'] = str(duedate)
+        if respect_duedate is not None:
+            data['respect_duedate'] = '1' if respect_duedate else '0'
+        if accepting_runs is not None:
+            data['accepting_runs'] = '1' if accepting_runs else '0'
+        if accepting_subs is not None:
+            data['accepting_submissions'] = '1' if accepting_subs else '0'
+
+        # Call Parent
+        return await super().aio_create(json=data)
+
+    async def aio_update(self, uid, name=None, env=None,
+                         duedate=None, respect_duedate=None,
+                         accepting_runs=None, accepting_subs=None):
+
+        # Setup Data
+        data = {}
+        if name is not None:
+            data['name'] = str(name)
+        if env is not None:
+            data['env'] = str(env)
+        if duedate is not None:
+            data['duedate'] = str(duedate)
+        if respect_duedate is not None:
+            data['respect_duedate'] = '1' if respect_duedate else '0'
+        if accepting_runs is not None:
+            data['accepting_runs'] = '1' if accepting_runs else '0'
+        if accepting_subs is not None:
+            data['accepting_submissions'] = '1' if accepting_subs else '0'
+
+        # Call Parent
+        return await super().aio_update(uid, json=data)
+
+    async def aio_list(self, submitable=False, runable=False):
+
+        # Limted Cases
+        if submitable or runable:
+
+            submittable_set = set([])
+            if submitable:
+                ep = "{:s}/{:s}".format(api_client._EP_ASSIGNMENTS,
+                                        api_client._EP_ASSIGNMENTS_SUBMITABLE)
+                submittable_set = set(await super().aio_list(endpoint=ep))
+
+            runable_set = set([])
+            if runable:
+                ep = "{:s}/{:s}".format(api_client._EP_ASSIGNMENTS,
+                                        api_client._EP_ASSIGNMENTS_RUNABLE)
+                runable_set = set(await super().aio_list(endpoint=ep))
+
+            # Combine
+            if submitable and runable:
+                asn_list = list(submittable_set.intersection(runable_set))
+            else:
+                asn_list = list(submittable_set.union(runable_set))
+
+        # Open Case
+        else:
+
+            ep = self._ep
+            asn_list = await super().aio_list(endpoint=ep)
+
+        # Call Parent
+        return asn_list
+
+    async def aio_list_by_null(self, null_uid):
+        return await self.aio_list()
+
+    def async_list_by_null(self, *args, **kwargs):
+        return self._conn.submit(self.aio_list_by_null, *args, **kwargs)
+
+class AioTests(api_client.Tests, AioCOGFileAttachedObject):
+
+    async def aio_create(self, asn_uid, name, maxscore, tester='script',
+                         builder=None, path_script=None):
+
+        # Setup Data
+        data = {"name": str(name), "maxscore": str(maxscore), "tester": str(tester)}
+        if builder is not None:
+            data['builder'] = str(builder)
+        if path_script is not None:
+            data['path_script'] = str(path_script)
+
+        # Setup Endpoint
+        ep = "{:s}/{:s}/{:s}".format(api_client._EP_ASSIGNMENTS, str(asn_uid),
+                                     api_client._EP_TESTS)
+
+        # Call Parent
+        return await super().aio_create(endpoint=ep, json=data)
+
+    async def aio_update(self, uid, name=None, maxscore=None, tester=None,
+                         builder=None, path_script=None):
+
+        # Setup Data
+        data = {}
+        if name is not None:
+            data['name'] = str(name)
+        if maxscore is not None:
+            data['maxscore'] = str(maxscore)
+        if tester is not None:
+            data['tester'] = str(tester)
+        if builder is not None:
+            data['builder'] = str(builder)
+        if path_script is not None:
+            data['path_script'] = str(path_script)
+
+        # Call Parent
+        return await super().aio_update(uid, json=data)
+
+    async def aio_list(self, asn_uid=None):
+
+        # Setup Endpoint
+        if asn_uid:
+            ep = "{:s}/{:s}/{:s}".format(api_client._EP_ASSIGNMENTS, str(asn_uid),
+                                         api_client._EP_TESTS)
+        else:
+            ep = self._ep
+
+        # Call Parent
+        return await super().aio_list(endpoint=ep)
+
+    async def aio_list_by_asn(self, asn_uid):
+        return await self.aio_list(asn_uid=asn_uid)
+
+    async def aio_list_by_null(self, null_uid):
+        return await self.aio_list()
+
+    async def aio_attach_reporters(self, uid, rpt_uids):
+
+        # Check Args
+        if not rpt_uids:
+            raise TypeError("rpt_uids must not be empty")
+
+        # Setup Endpoint
+        ep = "{:s}/{:s}/{:s}".format(self._ep, str(uid), api_client._EP_REPORTERS)
+
+        # Setup Data
+        rpt_uids = [str(uid) for uid in rpt_uids]
+        data = {api_client._KEY_REPORTERS: rpt_uids}
+
+        # HTTP Call
+        await self._conn._aio_blocking(self._conn.cache_discard, uid)
+        res = await self._conn.aio_http_put(endpoint=ep, json=data)
+        uuid_list = res[api_client._KEY_REPORTERS]
+        return [uuid.UUID(uid) for uid in uuid_list]
+
+    async def aio_detach_reporters(self, uid, rpt_uids):
+
+        # Check Args
+        if not rpt_uids:
+            raise TypeError("rpt_uids must not be empty")
+
+        # Setup Endpoint
+        ep = "{:s}/{:s}/{:s}".format(self._ep, str(uid), api_client._EP_REPORTERS)
+
+        # Setup Data
+        rpt_uids = [str(uid) for uid in rpt_uids]
+        data = {api_client._KEY_REPORTERS: rpt_uids}
+
+        # HTTP Call
+        await self._conn._aio_blocking(self._conn.cache_discard, uid)
+        res = await self._conn.aio_http_delete(endpoint=ep, json=data)
+        uuid_list = res[api_client._KEY_REPORTERS]
+        return [uuid.UUID(uid) for uid in uuid_list]
+
+    def async_list_by_asn(self, *args, **kwargs):
+        return self._conn.submit(self.aio_list_by_asn, *args, **kwargs)
+
+    def async_list_by_null(self, *args, **kwargs):
+        return self._conn.submit(self.aio_list_by_null, *args, **kwargs)
+
+class AioSubmissions(api_client.Submissions, AioCOGFileAttachedObject):
+
+    async def aio_create(self, asn_uid):
+
+        # Setup Data
+        data = {}
+
+        # Setup Endpoint
+        ep = "{:s}/{:s}/{:s}".format(api_client._EP_ASSIGNMENTS, str(asn_uid),
+                                     api_client._EP_SUBMISSIONS)
+
+        # Call Parent
+        return await super().aio_create(endpoint=ep, json=data)
+
+    async def aio_list(self, asn_uid=None):
+
+        # Setup Endpoint
+        if asn_uid:
+            ep = "{:s}/{:s}/{:s}".format(api_client._EP_ASSIGNMENTS, str(asn_uid),
+                                         api_client._EP_SUBMISSIONS)
+        else:
+            ep = self._ep
+
+        # Call Parent
+        return await super().aio_list(endpoint=ep)
+
+    async def aio_list_by_asn(self, asn_uid):
+        return await self.aio_list(asn_uid=asn_uid)
+
+    async def aio_list_by_null(self, null_uid):
+        return await self.aio_list()
+
+    def async_list_by_asn(self, *args, **kwargs):
+        return self._conn.submit(self.aio_list_by_asn, *args, **kwargs)
+
+    def async_list_by_null(self, *args, **kwargs):
+        return self._conn.submit(self.aio_list_by_null, *args, **kwargs)
+
+class AioRuns(api_client.Runs, AioCOGObject):
+
+    async def aio_create(self, sub_uid, tst_uid):
+
+        # Setup Data
+        data = {"test": str(tst_uid)}
+
+        # Setup Endpoint
+        ep = "{:s}/{:s}/{:s}".format(api_client._EP_SUBMISSIONS, str(sub_uid),
+                                     api_client._EP_RUNS)
+
+        # Call Parent
+        return await super().aio_create(endpoint=ep, json=data)
+
+    async def aio_list(self, sub_uid=None):
+
+        # Setup Endpoint
+        if sub_uid:
+            ep = "{:s}/{:s}/{:s}".format(api_client._EP_SUBMISSIONS, str(sub_uid),
+                                         api_client._EP_RUNS)
+        else:
+            ep = self._ep
+
+        # Call Parent
+        return await super().aio_list(endpoint=ep)
+
+    async def aio_list_by_sub(self, sub_uid):
+        return await self.aio_list(sub_uid=sub_uid)
+
+    async def aio_list_by_null(self, null_uid):
+        return await self.aio_list()
+
+    def async_list_by_sub(self, *args, **kwargs):
+        return self._conn.submit(self.aio_list_by_sub, *args, **kwargs)
+
+    def async_list_by_null(self, *args, **kwargs):
+        return self._conn.submit(self.aio_list_by_null, *args, **kwargs)
+
+class AioUsers(api_client.Users, AioCOGObject):
+
+    async def aio_create(self, *args, **kwargs):
+        raise NotImplementedError()
+
+    async def aio_delete(self, *args, **kwargs):
+        raise NotImplementedError()
+
+    async def aio_update(self, *args, **kwargs):
+        raise NotImplementedError()
+
+    async def aio_name_to_uid(self, username):
+
+        ep = "{:s}/{:s}/{:s}/".format(self._ep, api_client._EP_USERUUID, username)
+        res = await self._conn.aio_http_get(ep)
+        return uuid.UUID(res[api_client._KEY_USERUUID])
+
+    async def aio_uid_to_name(self, useruuid):
+
+        ep = "{:s}/{:s}/{:s}/".format(self._ep, api_client._EP_USERNAME, str(useruuid))
+        res = await self._conn.aio_http_get(ep)
+        return res[api_client._KEY_USERNAME]
+
+    def async_uid_to_name(self, *args, **kwargs):
+        return self._conn.submit(self.aio_uid_to_name, *args, **kwargs)
+
+    def async_name_to_uid(self, *args, **kwargs):
+        return self._conn.submit(self.aio_name_to_uid, *args, **kwargs)
+
+class AioReporters(api_client.Reporters, AioCOGFileAttachedObject):
+
+    async def aio_create(self, mod, **kwargs):
+
+        # Setup Data
+        data = {"mod": str(mod)}
+        data.update(kwargs)
+
+        # Call Parent
+        return await super().aio_create(json=data)
+
+    async def aio_update(self, uid, **kwargs):
+
+        # Setup Data
+        data = {}
+        data.update(kwargs)
+
+        # Call Parent
+        return await super().aio_update(uid, json=data)
+
+    async def aio_list(self, tst_uid=None):
+
+        # Setup Endpoint
+        if tst_uid:
+            ep = "{:s}/{:s}/{:s}".format(api_client._EP_TESTS, str(tst_uid),
+                                         api_client._EP_REPORTERS)
+        else:
+            ep = self._ep
+
+        # Call Parent
+        return await super().aio_list(endpoint=ep)
+
+    async def aio_list_by_tst(self, tst_uid):
+        return await self.aio_list(tst_uid=tst_uid)
+
+    async def aio_list_by_null(self, null_uid):
+        return await self.aio_list()
+
+    def async_list_by_tst(self, *args, **kwargs):
+        return self._conn.submit(self.aio_list_by_tst, *args, **kwargs)
+
+    def async_list_by_null(self, *args, **kwargs):
+        return self._conn.submit(self.aio_list_by_null, *args, **kwargs)
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+
+# COG API Client
+# api_client Tests
+
+import os
+import uuid
+import asyncio
+import hashlib
+import tempfile
+import threading
+import unittest
+import unittest.mock
+import concurrent.futures
+
+import api_client
+import mock_server
+
+try:
+    import api_client_aio
+except ImportError:
+    api_client_aio = None
+
+_WAITERS = 4
+
+
+class SingleFlightTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.conn = api_client.AsyncConnection('http://localhost', threads=_WAITERS + 1)
+        self.calls = []
+        self.gate = threading.Event()
+
+        # Stand-in for the parent GET: blocks until the gate opens
+        def http_get(conn, endpoint=None, json=None, **kwargs):
+            self.calls.append(endpoint)
+            self.gate.wait(5)
+            if endpoint == 'fail':
+                raise ValueError(endpoint)
+            return {'endpoint': endpoint}
+        patcher = unittest.mock.patch.object(api_client.Connection, 'http_get', http_get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+
+        self.gate.set()
+        self.conn.shutdown()
+
+    def wait_joined(self, hits):
+
+        # Waiters count as hits before blocking on the leader
+        for i in range(500):
+            if self.conn.get_flight_stats()[0] >= hits:
+                return
+            threading.Event().wait(0.01)
+        self.fail("waiters never joined")
+
+    def test_coalesce(self):
+
+        futures = [self.conn.submit(self.conn.http_get, 'files/1') for i in range(_WAITERS)]
+        self.wait_joined(_WAITERS - 1)
+        self.gate.set()
+        for future in futures:
+            self.assertEqual(future.result(), {'endpoint': 'files/1'})
+        self.assertEqual(self.calls, ['files/1'])
+        self.assertEqual(self.conn.get_flight_stats(), (_WAITERS - 1, 1))
+
+        # Finished flights are not reused
+        self.assertEqual(self.conn.http_get('files/1'), {'endpoint': 'files/1'})
+        self.assertEqual(len(self.calls), 2)
+
+    def test_errors(self):
+
+        futures = [self.conn.submit(self.conn.http_get, 'fail') for i in range(_WAITERS)]
+        self.wait_joined(_WAITERS - 1)
+        self.gate.set()
+        for future in futures:
+            with self.assertRaises(ValueError):
+                future.result()
+        self.assertEqual(self.calls, ['fail'])
+
+    def test_keys(self):
+
+        # Different endpoints or bodies never share a flight
+        self.gate.set()
+        futures = [self.conn.submit(self.conn.http_get, 'files/1'),
+                   self.conn.submit(self.conn.http_get, 'files/2'),
+                   self.conn.submit(self.conn.http_get, 'files/1', json={'a': 1})]
+        concurrent.futures.wait(futures)
+        self.assertEqual(sorted(self.calls), ['files/1', 'files/1', 'files/2'])
+        self.assertNotEqual(self.conn._flight_key('files/1', None),
+                            self.conn._flight_key('files/1', {'a': 1}))
+
+        # Nor do different credentials
+        key = self.conn._flight_key('files/1', None)
+        self.conn._auth = api_client.requests.auth.HTTPBasicAuth('other', '')
+        self.assertNotEqual(self.conn._flight_key('files/1', None), key)
+
+
+class BulkTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        dataset = mock_server.Dataset(asns=6, tsts=1, subs=1, runs=1, fles=1)
+        cls.server = mock_server.start_server(dataset)
+
+    @classmethod
+    def tearDownClass(cls):
+
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+
+        url = self.server.get_url()
+        self.conn = api_client.AsyncConnection(url, token=mock_server._TOKEN, threads=4)
+        self.clients = [api_client.Assignments(api_client.Connection(url, token=mock_server._TOKEN)),
+                        api_client.AsyncAssignments(self.conn)]
+        self.missing = uuid.uuid4()
+        if api_client_aio is not None:
+            self.aio_conn = api_client_aio.AioConnection(url, token=mock_server._TOKEN)
+            self.aio_conn.open()
+            self.clients.append(api_client_aio.AioAssignments(self.aio_conn))
+
+    def tearDown(self):
+
+        self.conn.shutdown()
+        if api_client_aio is not None:
+            self.aio_conn.close()
+
+    def asn_uids(self):
+
+        return sorted(uuid.UUID(uid) for uid in self.server.dataset.objs['assignments'])
+
+    def test_show_many(self):
+
+        uids = self.asn_uids()
+        for asns in self.clients:
+            with self.subTest(client=type(asns).__name__):
+                results, errors = asns.show_many(uids + [self.missing])
+                self.assertEqual(sorted(results), uids)
+                for uid in uids:
+                    self.assertEqual(results[uid]['name'], asns.show(uid)['name'])
+                self.assertEqual(list(errors), [self.missing])
+                self.assertIn('404', str(errors[self.missing]))
+
+    def test_update_many(self):
+
+        uids = self.asn_uids()[:2]
+        for asns in self.clients:
+            with self.subTest(client=type(asns).__name__):
+                updates = dict((uid, {'name': "upd_{}".format(i)}) for i, uid in enumerate(uids))
+                updates[self.missing] = {'name': 'none'}
+                results, errors = asns.update_many(updates)
+                self.assertEqual(sorted(results), uids)
+                self.assertEqual(list(errors), [self.missing])
+                for uid in uids:
+                    self.assertEqual(asns.show(uid)['name'], updates[uid]['name'])
+
+    def test_delete_many(self):
+
+        for asns in self.clients:
+            with self.subTest(client=type(asns).__name__):
+                uids = self.asn_uids()[:2]
+                results, errors = asns.delete_many(uids + [self.missing])
+                self.assertEqual(sorted(results), uids)
+                self.assertEqual(list(errors), [self.missing])
+                self.assertFalse(set(uids) & set(self.asn_uids()))
+
+
+class AsyncBulkTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.conn = api_client.AsyncConnection('http://localhost', threads=8)
+        self.asns = api_client.AsyncAssignments(self.conn)
+
+    def tearDown(self):
+
+        self.conn.shutdown()
+
+    def test_window(self):
+
+        lock = threading.Lock()
+        state = {'running': 0, 'max': 0}
+        def show(uid):
+            with lock:
+                state['running'] += 1
+                state['max'] = max(state['max'], state['running'])
+            threading.Event().wait(0.01)
+            with lock:
+                state['running'] -= 1
+            return {'uid': uid}
+        self.asns.show = show
+
+        results, errors = self.asns.show_many(range(12), window=3)
+        self.assertEqual(sorted(results), list(range(12)))
+        self.assertEqual(errors, {})
+        self.assertEqual(state['max'], 3)
+
+    def test_completion_order(self):
+
+        # Calls finish in the reverse of submission order
+        gates = dict((key, threading.Event()) for key in range(4))
+        def show(uid):
+            gates[uid].wait(5)
+            return uid
+        self.asns.show = show
+
+        order = []
+        gates[3].set()
+        for key, future in self.asns.iter_show(range(4)):
+            order.append(key)
+            self.assertEqual(future.result(), key)
+            if key > 0:
+                gates[key - 1].set()
+        self.assertEqual(order, [3, 2, 1, 0])
+
+
+class _StopHasher(object):
+    """ Hasher that fails once limit bytes were hashed, interrupting a download """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.hashed = 0
+
+    def update(self, data):
+        self.hashed += len(data)
+        if self.hashed >= self.limit:
+            raise IOError("interrupted")
+
+
+class DownloadTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        dataset = mock_server.Dataset(asns=1, tsts=1, subs=1, runs=1, fles=1)
+        cls.server = mock_server.start_server(dataset)
+
+    @classmethod
+    def tearDownClass(cls):
+
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'out.bin')
+        self.part_path = self.path + api_client._PART_SUFFIX
+
+        # Random bytes, so appending at a wrong offset can never look right
+        dataset = self.server.dataset
+        self.uid = next(iter(dataset.contents))
+        self.data = dataset.contents[self.uid] = os.urandom(10007)
+        conn = api_client.Connection(self.server.get_url(), token=mock_server._TOKEN)
+        self.files = api_client.Files(conn)
+
+    def tearDown(self):
+
+        self.tmp_dir.cleanup()
+
+    def download(self, hasher=None):
+
+        ep = "files/{}/contents".format(self.uid)
+        return self.files._conn.http_download(ep, self.path, chunk_size=1000, hasher=hasher)
+
+    def check_download(self):
+
+        hasher = hashlib.sha256()
+        path = self.download(hasher=hasher)
+        self.assertEqual(path, self.path)
+        with open(self.path, 'rb') as fd:
+            self.assertEqual(fd.read(), self.data)
+        self.assertEqual(hasher.hexdigest(), hashlib.sha256(self.data).hexdigest())
+        self.assertFalse(os.path.exists(self.part_path))
+
+    def write_part(self, data):
+
+        with open(self.part_path, 'wb') as fd:
+            fd.write(data)
+
+    def requests(self, method):
+
+        # Send the next ranged request through method
+        patcher = unittest.mock.patch.object(mock_server.Handler, '_contents', method)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fresh(self):
+
+        self.check_download()
+
+    def test_resume(self):
+
+        # Interrupted mid-stream: the partial file stays behind
+        with self.assertRaises(IOError):
+            self.download(hasher=_StopHasher(3000))
+        part_size = os.path.getsize(self.part_path)
+        self.assertTrue(0 < part_size < len(self.data))
+        self.assertFalse(os.path.exists(self.path))
+
+        # Resumed with a Range request; the hasher is fed the partial bytes first
+        ranges = []
+        contents = mock_server.Handler._contents
+        def ranged(handler, uid):
+            ranges.append(handler.headers.get('Range'))
+            return contents(handler, uid)
+        self.requests(ranged)
+        self.check_download()
+        self.assertEqual(ranges, ["bytes={}-".format(part_size)])
+
+    def test_range_ignored(self):
+
+        # Server answers a ranged request with the whole file (200)
+        self.write_part(self.data[:4000])
+        def full(handler, uid):
+            handler._send(200, handler.server.dataset.contents[uid])
+        self.requests(full)
+        self.check_download()
+
+    def test_range_mismatch(self):
+
+        # Server answers with a range that does not start at our offset
+        self.write_part(self.data[:4000])
+        def wrong(handler, uid):
+            data = handler.server.dataset.contents[uid]
+            handler._send(206, data, {'Content-Range': "bytes 0-{}/{}".format(
+                len(data) - 1, len(data))})
+        self.requests(wrong)
+        self.check_download()
+
+    def test_range_not_satisfiable(self):
+
+        # Stale partial file longer than the file: 416, then start over
+        self.write_part(b'x' * (len(self.data) + 10))
+        self.check_download()
+
+
+@unittest.skipIf(api_client_aio is None, "aiohttp not installed")
+class AioSingleFlightTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.conn = api_client_aio.AioConnection('http://localhost')
+        self.calls = []
+
+    async def gather(self, endpoints):
+
+        gate = asyncio.Event()
+        async def aio_request(method, endpoint, **kwargs):
+            self.calls.append(endpoint)
+            await gate.wait()
+            if endpoint == 'fail':
+                raise ValueError(endpoint)
+            return {'endpoint': endpoint}
+        self.conn._aio_request = aio_request
+
+        tasks = [asyncio.ensure_future(self.conn.aio_http_get(ep)) for ep in endpoints]
+        await asyncio.sleep(0)
+        gate.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def test_coalesce(self):
+
+        res = asyncio.run(self.gather(['files/1'] * _WAITERS + ['files/2']))
+        self.assertEqual(res, [{'endpoint': 'files/1'}] * _WAITERS + [{'endpoint': 'files/2'}])
+        self.assertEqual(self.calls, ['files/1', 'files/2'])
+        self.assertEqual(self.conn.get_flight_stats(), (_WAITERS - 1, 2))
+        self.assertEqual(self.conn._flights, {})
+
+    def test_errors(self):
+
+        res = asyncio.run(self.gather(['fail'] * _WAITERS))
+        self.assertEqual(len(res), _WAITERS)
+        for err in res:
+            self.assertIsInstance(err, ValueError)
+        self.assertEqual(self.calls, ['fail'])
+
+
+if __name__ == '__main__':
+    unittest.main()
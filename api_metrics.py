@@ -0,0 +1,146 @@
+# COG API Client
+# v2 API
+# Request Metrics
+
+import re
+import json
+import math
+import time
+import threading
+import collections
+
+_RE_UUID = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+_NAMED_EPS = ['users/useruuid/']
+_TMPL_UUID = '<uid>'
+_TMPL_NAME = '<name>'
+
+_PROM_PREFIX = 'cog_cli'
+_PROM_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+_PERCENTILES = [50, 90, 99]
+
+def endpoint_template(endpoint):
+    """ Collapse UUIDs and names in an endpoint path into placeholders """
+
+    endpoint = endpoint.strip('/')
+    for ep in _NAMED_EPS:
+        if endpoint.startswith(ep):
+            return ep + _TMPL_NAME
+    return _RE_UUID.sub(_TMPL_UUID, endpoint)
+
+def percentile(samples, pct):
+    """ Nearest-rank percentile of sorted samples """
+
+    if not samples:
+        return 0.0
+    rank = int(math.ceil(pct / 100.0 * len(samples)))
+    return samples[max(0, min(len(samples), rank) - 1)]
+
+class EndpointStats(object):
+
+    def __init__(self):
+        """ Constructor"""
+
+        self.count = 0
+        self.bytes = 0
+        self.retries = 0
+        self.statuses = collections.Counter()
+        self.latencies = []
+
+    def summary(self):
+
+        lats = sorted(self.latencies)
+        summary = {'count': self.count, 'bytes': self.bytes, 'retries': self.retries,
+                   'statuses': dict(self.statuses), 'sum': sum(lats),
+                   'max': lats[-1] if lats else 0.0}
+        for pct in _PERCENTILES:
+            summary['p{}'.format(pct)] = percentile(lats, pct)
+        return summary
+
+class Metrics(object):
+    """ Thread-safe per-endpoint request counters and latency samples """
+
+    def __init__(self):
+        """ Constructor"""
+
+        self._lock = threading.Lock()
+        self._stats = collections.defaultdict(EndpointStats)
+        self._start = time.time()
+
+    def record(self, method, endpoint, status, duration, nbytes=0, retries=0):
+
+        key = (method.upper(), endpoint_template(endpoint))
+        with self._lock:
+            stats = self._stats[key]
+            stats.count += 1
+            stats.bytes += nbytes
+            stats.retries += retries
+            stats.statuses[str(status)] += 1
+            stats.latencies.append(duration)
+
+    def summary(self):
+        """ Return {(method, template): summary dict}, busiest endpoints first """
+
+        with self._lock:
+            items = [(key, stats.summary()) for key, stats in self._stats.items()]
+        items.sort(key=lambda item: item[1]['sum'], reverse=True)
+        return collections.OrderedDict(items)
+
+    def to_json(self):
+
+        endpoints = []
+        for (method, template), summary in self.summary().items():
+            entry = {'method': method, 'endpoint': template}
+            entry.update(summary)
+            endpoints.append(entry)
+        return json.dumps({'start_time': self._start, 'end_time': time.time(),
+                           'endpoints': endpoints}, indent=4)
+
+    def to_prometheus(self):
+        """ Render metrics in the Prometheus text exposition format """
+
+        with self._lock:
+            items = [(key, stats.count, stats.bytes, stats.retries,
+                      dict(stats.statuses), sorted(stats.latencies))
+                     for key, stats in self._stats.items()]
+
+        lines = []
+        def metric(name, kind, desc):
+            lines.append("# HELP {}_{} {}".format(_PROM_PREFIX, name, desc))
+            lines.append("# TYPE {}_{} {}".format(_PROM_PREFIX, name, kind))
+
+        def labels(method, template, **extra):
+            pairs = [('method', method), ('endpoint', template)] + sorted(extra.items())
+            return ",".join('{}="{}"'.format(k, v) for k, v in pairs)
+
+        metric('requests_total', 'counter', "Requests by endpoint and status")
+        for (method, template), count, nbytes, retries, statuses, lats in items:
+            for status, cnt in sorted(statuses.items()):
+                lines.append("{}_requests_total{{{}}} {}".format(
+                    _PROM_PREFIX, labels(method, template, status=status), cnt))
+
+        metric('response_bytes_total', 'counter', "Response bytes by endpoint")
+        for (method, template), count, nbytes, retries, statuses, lats in items:
+            lines.append("{}_response_bytes_total{{{}}} {}".format(
+                _PROM_PREFIX, labels(method, template), nbytes))
+
+        metric('retries_total', 'counter', "Retried attempts by endpoint")
+        for (method, template), count, nbytes, retries, statuses, lats in items:
+            lines.append("{}_retries_total{{{}}} {}".format(
+                _PROM_PREFIX, labels(method, template), retries))
+
+        metric('request_duration_seconds', 'histogram', "Request latency by endpoint")
+        for (method, template), count, nbytes, retries, statuses, lats in items:
+            idx = 0
+            for bound in _PROM_BUCKETS:
+                while idx < len(lats) and lats[idx] <= bound:
+                    idx += 1
+                lines.append("{}_request_duration_seconds_bucket{{{}}} {}".format(
+                    _PROM_PREFIX, labels(method, template, le=bound), idx))
+            lines.append("{}_request_duration_seconds_bucket{{{}}} {}".format(
+                _PROM_PREFIX, labels(method, template, le='+Inf'), len(lats)))
+            lines.append("{}_request_duration_seconds_sum{{{}}} {}".format(
+                _PROM_PREFIX, labels(method, template), sum(lats)))
+            lines.append("{}_request_duration_seconds_count{{{}}} {}".format(
+                _PROM_PREFIX, labels(method, template), len(lats)))
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+# COG API Client
+# api_metrics Tests
+
+import json
+import uuid
+import unittest
+
+import api_metrics
+
+_UID = str(uuid.uuid4())
+
+
+class EndpointTemplateTestCase(unittest.TestCase):
+
+    def test_uuids(self):
+
+        self.assertEqual(api_metrics.endpoint_template('assignments/{}/'.format(_UID)),
+                         'assignments/<uid>')
+        self.assertEqual(api_metrics.endpoint_template('/submissions/{}/runs/'.format(_UID)),
+                         'submissions/<uid>/runs')
+        self.assertEqual(api_metrics.endpoint_template('tests/{}/files/'.format(_UID.upper())),
+                         'tests/<uid>/files')
+        self.assertEqual(api_metrics.endpoint_template('users/username/{}'.format(_UID)),
+                         'users/username/<uid>')
+
+    def test_names(self):
+
+        self.assertEqual(api_metrics.endpoint_template('users/useruuid/bob/'),
+                         'users/useruuid/<name>')
+
+    def test_plain(self):
+
+        self.assertEqual(api_metrics.endpoint_template('my/token/'), 'my/token')
+        self.assertEqual(api_metrics.endpoint_template('assignments'), 'assignments')
+
+
+class PercentileTestCase(unittest.TestCase):
+
+    def test_empty(self):
+
+        self.assertEqual(api_metrics.percentile([], 50), 0.0)
+        self.assertEqual(api_metrics.percentile([], 99), 0.0)
+
+    def test_single(self):
+
+        for pct in [0, 1, 50, 99, 100]:
+            self.assertEqual(api_metrics.percentile([0.3], pct), 0.3)
+
+    def test_nearest_rank(self):
+
+        samples = list(range(1, 101))
+        self.assertEqual(api_metrics.percentile(samples, 0), 1)
+        self.assertEqual(api_metrics.percentile(samples, 50), 50)
+        self.assertEqual(api_metrics.percentile(samples, 90), 90)
+        self.assertEqual(api_metrics.percentile(samples, 99), 99)
+        self.assertEqual(api_metrics.percentile(samples, 100), 100)
+
+        # Small samples: p99 is the max
+        self.assertEqual(api_metrics.percentile([1, 2, 3], 99), 3)
+        self.assertEqual(api_metrics.percentile([1, 2, 3], 50), 2)
+
+
+class MetricsTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.metrics = api_metrics.Metrics()
+        for dur in [0.001, 0.01, 0.3, 20.0]:
+            self.metrics.record('get', 'files/{}/'.format(uuid.uuid4()), 200, dur, nbytes=10)
+        self.metrics.record('GET', 'files/{}/'.format(_UID), 503, 0.002, retries=2)
+        self.metrics.record('DELETE', 'runs/{}/'.format(_UID), 200, 0.5)
+
+    def test_summary(self):
+
+        summary = self.metrics.summary()
+        self.assertEqual(list(summary), [('GET', 'files/<uid>'), ('DELETE', 'runs/<uid>')])
+        files = summary[('GET', 'files/<uid>')]
+        self.assertEqual(files['count'], 5)
+        self.assertEqual(files['bytes'], 40)
+        self.assertEqual(files['retries'], 2)
+        self.assertEqual(files['statuses'], {'200': 4, '503': 1})
+        self.assertEqual((files['p50'], files['p99'], files['max']), (0.01, 20.0, 20.0))
+
+        # JSON export
+        endpoints = json.loads(self.metrics.to_json())['endpoints']
+        self.assertEqual([(ep['method'], ep['endpoint'], ep['count']) for ep in endpoints],
+                         [('GET', 'files/<uid>', 5), ('DELETE', 'runs/<uid>', 1)])
+
+    def test_prometheus(self):
+
+        lines = self.metrics.to_prometheus().splitlines()
+        labels = 'method="GET",endpoint="files/<uid>"'
+
+        # Counters
+        self.assertIn('cog_cli_requests_total{{{},status="200"}} 4'.format(labels), lines)
+        self.assertIn('cog_cli_requests_total{{{},status="503"}} 1'.format(labels), lines)
+        self.assertIn('cog_cli_response_bytes_total{{{}}} 40'.format(labels), lines)
+        self.assertIn('cog_cli_retries_total{{{}}} 2'.format(labels), lines)
+
+        # Cumulative buckets: 0.001, 0.002, 0.01, 0.3, 20.0
+        prefix = 'cog_cli_request_duration_seconds_bucket{{{},le='.format(labels)
+        buckets = [line[len(prefix):] for line in lines if line.startswith(prefix)]
+        self.assertEqual(buckets, ['"0.005"} 2', '"0.01"} 3', '"0.025"} 3', '"0.05"} 3',
+                                   '"0.1"} 3', '"0.25"} 3', '"0.5"} 4', '"1.0"} 4',
+                                   '"2.5"} 4', '"5.0"} 4', '"10.0"} 4', '"+Inf"} 5'])
+        self.assertIn('cog_cli_request_duration_seconds_count{{{}}} 5'.format(labels), lines)
+        self.assertEqual(lines.count('# TYPE cog_cli_request_duration_seconds histogram'), 1)
+
+    def test_empty(self):
+
+        metrics = api_metrics.Metrics()
+        self.assertEqual(metrics.summary(), {})
+        self.assertEqual([line for line in metrics.to_prometheus().splitlines()
+                          if not line.startswith('#')], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+# COG API Client
+# v2 API
+# Streaming Multipart Upload
+
+import os
+import os.path
+import uuid
+import email.utils
+
+_CHUNK_SIZE = 1024 * 1024 #bytes
+
+def format_param(key, value):
+    """ Format a Content-Disposition parameter the way requests does for
+    files= uploads: quoted when plain ASCII, RFC 2231 encoded otherwise
+    (quotes, backslashes, line breaks or non-ASCII characters) """
+
+    if not any(ch in value for ch in '"\\\r\n'):
+        param = '{}="{}"'.format(key, value)
+        try:
+            param.encode('ascii')
+        except UnicodeEncodeError:
+            pass
+        else:
+            return param
+    return '{}*={}'.format(key, email.utils.encode_rfc2231(value, 'utf-8'))
+
+class MultipartFile(object):
+    """ Read-only multipart/form-data body for a single file field
+
+    Streams the file from disk on read() instead of building the whole
+    body in memory. Progress callbacks receive the file bytes sent per read.
+    """
+
+    def __init__(self, key, path, name=None, callback=None):
+        """ Constructor"""
+
+        # Process Args
+        if name is None:
+            name = os.path.basename(path)
+
+        # Setup Data
+        self._boundary = uuid.uuid4().hex
+        self._callback = callback
+        self._head = ('--{}\r\n'
+                      'Content-Disposition: form-data; {}; {}\r\n'
+                      '\r\n').format(self._boundary, format_param('name', key),
+                                     format_param('filename', name)).encode()
+        self._tail = '\r\n--{}--\r\n'.format(self._boundary).encode()
+        self._fd = open(path, 'rb')
+        self._size = os.fstat(self._fd.fileno()).st_size
+        self._parts = [self._head, self._fd, self._tail]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __len__(self):
+        return len(self._head) + self._size + len(self._tail)
+
+    def __iter__(self):
+        for chunk in iter(lambda: self.read(_CHUNK_SIZE), b''):
+            yield chunk
+
+    @property
+    def content_type(self):
+        return 'multipart/form-data; boundary={}'.format(self._boundary)
+
+    def close(self):
+        self._fd.close()
+
+    def read(self, size=-1):
+
+        # Fill buffer from remaining parts
+        buf = b''
+        sent = 0
+        while self._parts and (size < 0 or len(buf) < size):
+            part = self._parts[0]
+            if isinstance(part, bytes):
+                want = len(part) if size < 0 else size - len(buf)
+                buf += part[:want]
+                if want < len(part):
+                    self._parts[0] = part[want:]
+                else:
+                    self._parts.pop(0)
+            else:
+                data = part.read(-1 if size < 0 else size - len(buf))
+                if data:
+                    buf += data
+                    sent += len(data)
+                else:
+                    self._parts.pop(0)
+
+        # Report Progress
+        if sent and self._callback:
+            self._callback(sent)
+
+        return buf
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+# COG API Client
+# api_multipart Tests
+
+import os
+import tempfile
+import unittest
+import email.parser
+
+import api_multipart
+
+
+class MultipartFileTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'data.bin')
+        self.data = os.urandom(3 * api_multipart._CHUNK_SIZE + 17)
+        with open(self.path, 'wb') as fd:
+            fd.write(self.data)
+
+    def tearDown(self):
+
+        self.tmp_dir.cleanup()
+
+    def parse(self, body, content_type):
+
+        msg = email.parser.BytesParser().parsebytes(
+            b'Content-Type: ' + content_type.encode() + b'\r\n\r\n' + body)
+        parts = msg.get_payload()
+        self.assertEqual(len(parts), 1)
+        return parts[0]
+
+    def check_name(self, name):
+
+        with api_multipart.MultipartFile('file', self.path, name=name) as body:
+            part = self.parse(body.read(), body.content_type)
+        self.assertEqual(part.get_param('name', header='content-disposition'), 'file')
+        self.assertEqual(part.get_filename(), name)
+        self.assertEqual(part.get_payload(decode=True), self.data)
+
+    def test_body(self):
+
+        with api_multipart.MultipartFile('file', self.path) as body:
+            self.assertIn('boundary=', body.content_type)
+            raw = b''.join(body)
+            self.assertEqual(len(raw), len(body))
+            part = self.parse(raw, body.content_type)
+        self.assertEqual(part.get_filename(), 'data.bin')
+        self.assertEqual(part.get_payload(decode=True), self.data)
+
+    def test_read_sizes(self):
+
+        # Small reads span head, file and tail boundaries
+        with api_multipart.MultipartFile('file', self.path) as body:
+            chunks = []
+            for chunk in iter(lambda: body.read(1000), b''):
+                self.assertLessEqual(len(chunk), 1000)
+                chunks.append(chunk)
+            self.assertEqual(len(b''.join(chunks)), len(body))
+
+    def test_callback(self):
+
+        sent = []
+        with api_multipart.MultipartFile('file', self.path, callback=sent.append) as body:
+            b''.join(body)
+        self.assertEqual(sum(sent), len(self.data))
+
+    def test_names(self):
+
+        for name in ['plain.txt', 'dir/sub file.py', 'quote"d.txt', 'back\\slash.txt',
+                     'line\r\nContent-Type: text/html.txt', 'ünïcode.txt']:
+            with self.subTest(name=name):
+                self.check_name(name)
+
+    def test_format_param(self):
+
+        self.assertEqual(api_multipart.format_param('filename', 'a.txt'), 'filename="a.txt"')
+        self.assertEqual(api_multipart.format_param('filename', 'a"\r\n.txt'),
+                         "filename*=utf-8''a%22%0D%0A.txt")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# COG API Client
+# v2 API
+# Retry Policy and Rate Limiting
+
+import time
+import random
+import threading
+
+_RETRIES = 3
+_BACKOFF = 0.5 #seconds
+_BACKOFF_MAX = 30.0 #seconds
+_RETRY_STATUS = frozenset([429, 502, 503, 504])
+_RETRY_METHODS = frozenset(['GET', 'HEAD', 'PUT', 'DELETE'])
+_UPLOAD_RETRIES = 2
+
+class RetryPolicy(object):
+
+    def __init__(self, retries=_RETRIES, backoff=_BACKOFF, backoff_max=_BACKOFF_MAX):
+        """ Constructor"""
+
+        # Check Args
+        if retries < 0:
+            raise TypeError("retries must not be negative")
+
+        # Set vars
+        self.retries = retries
+        self._backoff = backoff
+        self._backoff_max = backoff_max
+
+        # Setup Stats
+        self._lock = threading.Lock()
+        self._count = 0
+
+    def can_retry(self, method, attempt):
+        return method.upper() in _RETRY_METHODS and attempt < self.retries
+
+    def should_retry(self, method, status, attempt):
+        return status in _RETRY_STATUS and self.can_retry(method, attempt)
+
+    def delay(self, attempt, retry_after=None):
+
+        # Count Retry
+        with self._lock:
+            self._count += 1
+
+        # Server Requested Delay
+        wait = parse_retry_after(retry_after)
+        if wait is not None:
+            return min(wait, self._backoff_max)
+
+        # Exponential Backoff with Full Jitter
+        cap = min(self._backoff_max, self._backoff * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    def count(self):
+        return self._count
+
+class RateLimiter(object):
+    """ Thread-safe token bucket allowing rate requests/sec in bursts of burst """
+
+    def __init__(self, rate, burst=None):
+        """ Constructor"""
+
+        # Check Args
+        if rate <= 0:
+            raise TypeError("rate must be greater than 0")
+        if burst is None:
+            burst = max(1, int(rate))
+
+        # Set vars
+        self._rate = float(rate)
+        self._burst = float(burst)
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """ Take a token and return the seconds to wait before using it """
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._stamp) * self._rate)
+            self._stamp = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            else:
+                return -self._tokens / self._rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+def parse_retry_after(value):
+
+    if value is None:
+        return None
+
+    # Delay Seconds
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    # HTTP Date (rare, so email.utils is only imported here)
+    import email.utils
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
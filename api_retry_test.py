@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+# COG API Client
+# api_retry Tests
+
+import time
+import unittest
+import unittest.mock
+import email.utils
+
+import requests
+
+import api_retry
+import api_client
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+
+    def test_args(self):
+
+        with self.assertRaises(TypeError):
+            api_retry.RetryPolicy(retries=-1)
+
+    def test_can_retry(self):
+
+        policy = api_retry.RetryPolicy(retries=2)
+        for method in ['GET', 'get', 'HEAD', 'PUT', 'DELETE']:
+            self.assertTrue(policy.can_retry(method, 0))
+        self.assertFalse(policy.can_retry('POST', 0))
+        self.assertTrue(policy.can_retry('GET', 1))
+        self.assertFalse(policy.can_retry('GET', 2))
+
+    def test_should_retry(self):
+
+        policy = api_retry.RetryPolicy(retries=1)
+        for status in [429, 502, 503, 504]:
+            self.assertTrue(policy.should_retry('GET', status, 0))
+        for status in [200, 304, 400, 404, 500]:
+            self.assertFalse(policy.should_retry('GET', status, 0))
+        self.assertFalse(policy.should_retry('POST', 503, 0))
+        self.assertFalse(policy.should_retry('GET', 503, 1))
+
+    def test_delay(self):
+
+        policy = api_retry.RetryPolicy(backoff=1.0, backoff_max=5.0)
+
+        # Full jitter up to the capped exponential backoff
+        for attempt, cap in [(0, 1.0), (1, 2.0), (2, 4.0), (3, 5.0), (10, 5.0)]:
+            for i in range(20):
+                self.assertTrue(0 <= policy.delay(attempt) <= cap)
+
+        # Server requested delays win, up to the cap
+        self.assertEqual(policy.delay(0, retry_after='3'), 3.0)
+        self.assertEqual(policy.delay(0, retry_after='60'), 5.0)
+        self.assertEqual(policy.count(), 102)
+
+
+class RateLimiterTestCase(unittest.TestCase):
+
+    def test_args(self):
+
+        with self.assertRaises(TypeError):
+            api_retry.RateLimiter(0)
+
+    def test_reserve(self):
+
+        now = [100.0]
+        with unittest.mock.patch('time.monotonic', lambda: now[0]):
+            limiter = api_retry.RateLimiter(10, burst=2)
+
+            # Burst, then one token every 1/rate seconds
+            self.assertEqual(limiter.reserve(), 0.0)
+            self.assertEqual(limiter.reserve(), 0.0)
+            self.assertAlmostEqual(limiter.reserve(), 0.1)
+            self.assertAlmostEqual(limiter.reserve(), 0.2)
+
+            # Refill never exceeds the burst
+            now[0] += 10.0
+            self.assertEqual(limiter.reserve(), 0.0)
+            self.assertEqual(limiter.reserve(), 0.0)
+            self.assertAlmostEqual(limiter.reserve(), 0.1)
+
+    def test_default_burst(self):
+
+        limiter = api_retry.RateLimiter(0.5)
+        self.assertEqual(limiter.reserve(), 0.0)
+        self.assertGreater(limiter.reserve(), 1.0)
+
+
+class ParseRetryAfterTestCase(unittest.TestCase):
+
+    def test_seconds(self):
+
+        self.assertIsNone(api_retry.parse_retry_after(None))
+        self.assertEqual(api_retry.parse_retry_after('7'), 7.0)
+        self.assertEqual(api_retry.parse_retry_after('1.5'), 1.5)
+        self.assertEqual(api_retry.parse_retry_after('-3'), 0.0)
+
+    def test_date(self):
+
+        value = email.utils.formatdate(time.time() + 30, usegmt=True)
+        self.assertTrue(25 <= api_retry.parse_retry_after(value) <= 30)
+        value = email.utils.formatdate(time.time() - 30, usegmt=True)
+        self.assertEqual(api_retry.parse_retry_after(value), 0.0)
+        self.assertIsNone(api_retry.parse_retry_after('soon'))
+
+
+class ConnectionRetryTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.conn = api_client.Connection('http://localhost', retries=2)
+        self.sleeps = []
+        patcher = unittest.mock.patch('time.sleep', self.sleeps.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def response(self, status, headers={}):
+
+        res = requests.models.Response()
+        res.status_code = status
+        res.raw = unittest.mock.Mock()
+        res.headers.update(headers)
+        return res
+
+    def set_responses(self, *responses):
+
+        session = unittest.mock.Mock()
+        session.request.side_effect = list(responses)
+        self.conn._session = session
+        return session
+
+    def test_status(self):
+
+        session = self.set_responses(self.response(503, {'Retry-After': '2'}),
+                                     self.response(200))
+        res = self.conn._request('GET', 'http://localhost/files/')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(session.request.call_count, 2)
+        self.assertEqual(self.sleeps, [2.0])
+        self.assertEqual(self.conn.get_retry_count(), 1)
+
+    def test_exhausted(self):
+
+        session = self.set_responses(*[self.response(503) for i in range(3)])
+        res = self.conn._request('GET', 'http://localhost/files/')
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(session.request.call_count, 3)
+
+    def test_connection_error(self):
+
+        err = requests.exceptions.ConnectionError()
+        session = self.set_responses(err, self.response(200))
+        self.assertEqual(self.conn._request('GET', 'http://localhost/').status_code, 200)
+        self.assertEqual(session.request.call_count, 2)
+
+        # Never retry non-idempotent calls
+        session = self.set_responses(err)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.conn._request('POST', 'http://localhost/')
+        session = self.set_responses(self.response(503))
+        self.assertEqual(self.conn._request('POST', 'http://localhost/').status_code, 503)
+
+
+if __name__ == '__main__':
+    unittest.main()
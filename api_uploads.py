@@ -0,0 +1,99 @@
+# COG API Client
+# v2 API
+# Local Upload Index
+
+import os
+import os.path
+import json
+import time
+import sqlite3
+import hashlib
+import contextlib
+
+_CHUNK_SIZE = 1024 * 1024 #bytes
+_TIMEOUT = 30.0 #seconds
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    url TEXT NOT NULL,
+    user TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    extract INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    uids TEXT NOT NULL,
+    time REAL NOT NULL,
+    PRIMARY KEY (url, user, sha256, extract, name)
+)
+"""
+
+def file_sha256(path, chunk_size=_CHUNK_SIZE):
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fd:
+        for chunk in iter(lambda: fd.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def user_key(user):
+    """ Stored in place of the credentials themselves """
+
+    return hashlib.sha1((user or '').encode()).hexdigest()
+
+class UploadIndex(object):
+    """ Map uploaded file contents (sha256, extract, name) to the file UUIDs
+    the server created for them, per server URL and credentials, so
+    identical files can be reused instead of uploaded again.
+    """
+
+    def __init__(self, path, verify=False):
+        """ Constructor"""
+
+        # Set vars
+        self._path = path
+        self.verify = verify
+
+        # Setup Database
+        dir_path = os.path.dirname(path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        with self._connect() as db:
+            # Indexes from before entries were per credentials are dropped
+            cols = [row[1] for row in db.execute("PRAGMA table_info(uploads)")]
+            if cols and 'user' not in cols:
+                db.execute("DROP TABLE uploads")
+            db.execute(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+
+        # One connection per call, so worker threads never share one
+        db = sqlite3.connect(self._path, timeout=_TIMEOUT)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def get(self, url, user, digest, extract, name):
+
+        with self._connect() as db:
+            row = db.execute("SELECT uids FROM uploads WHERE url = ? AND user = ? "
+                             "AND sha256 = ? AND extract = ? AND name = ?",
+                             (url, user_key(user), digest, int(extract), name)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def put(self, url, user, digest, extract, name, uids):
+
+        uids = json.dumps([str(uid) for uid in uids])
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (url, user_key(user), digest, int(extract), name, uids, time.time()))
+
+    def discard(self, url, uid):
+        """ Drop every entry that includes file uid (for any credentials) """
+
+        with self._connect() as db:
+            db.execute("DELETE FROM uploads WHERE url = ? AND uids LIKE ?",
+                       (url, '%"{}"%'.format(str(uid))))
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+# COG API Client
+# api_uploads Tests
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import api_client
+import api_uploads
+import mock_server
+
+_URL = 'http://localhost'
+
+
+class UploadIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'uploads.sqlite')
+        self.index = api_uploads.UploadIndex(self.path)
+
+    def tearDown(self):
+
+        self.tmp_dir.cleanup()
+
+    def test_get_put(self):
+
+        self.assertIsNone(self.index.get(_URL, 'tok_a', 'abc', False, 'a.zip'))
+        self.index.put(_URL, 'tok_a', 'abc', False, 'a.zip', ['u1', 'u2'])
+        self.assertEqual(self.index.get(_URL, 'tok_a', 'abc', False, 'a.zip'), ['u1', 'u2'])
+
+        # Every key field must match
+        self.assertIsNone(self.index.get(_URL, 'tok_b', 'abc', False, 'a.zip'))
+        self.assertIsNone(self.index.get(_URL, None, 'abc', False, 'a.zip'))
+        self.assertIsNone(self.index.get('http://other', 'tok_a', 'abc', False, 'a.zip'))
+        self.assertIsNone(self.index.get(_URL, 'tok_a', 'abd', False, 'a.zip'))
+        self.assertIsNone(self.index.get(_URL, 'tok_a', 'abc', True, 'a.zip'))
+        self.assertIsNone(self.index.get(_URL, 'tok_a', 'abc', False, 'b.zip'))
+
+    def test_credentials_not_stored(self):
+
+        self.index.put(_URL, 'secret_token', 'abc', False, 'a.zip', ['u1'])
+        with open(self.path, 'rb') as fd:
+            self.assertNotIn(b'secret_token', fd.read())
+
+    def test_discard(self):
+
+        self.index.put(_URL, 'tok_a', 'abc', False, 'a.zip', ['u1', 'u2'])
+        self.index.put(_URL, 'tok_b', 'abc', False, 'a.zip', ['u1'])
+        self.index.put(_URL, 'tok_a', 'def', False, 'b.zip', ['u3'])
+        self.index.discard(_URL, 'u1')
+        self.assertIsNone(self.index.get(_URL, 'tok_a', 'abc', False, 'a.zip'))
+        self.assertIsNone(self.index.get(_URL, 'tok_b', 'abc', False, 'a.zip'))
+        self.assertEqual(self.index.get(_URL, 'tok_a', 'def', False, 'b.zip'), ['u3'])
+
+    def test_old_schema(self):
+
+        path = os.path.join(self.tmp_dir.name, 'old.sqlite')
+        db = sqlite3.connect(path)
+        db.execute("CREATE TABLE uploads (url TEXT, sha256 TEXT, extract INTEGER, name TEXT, "
+                   "uids TEXT, time REAL, PRIMARY KEY (url, sha256, extract, name))")
+        db.execute("INSERT INTO uploads VALUES (?, 'abc', 0, 'a.zip', '[\"u1\"]', 0)", (_URL,))
+        db.commit()
+        db.close()
+
+        index = api_uploads.UploadIndex(path)
+        self.assertIsNone(index.get(_URL, None, 'abc', False, 'a.zip'))
+        index.put(_URL, None, 'abc', False, 'a.zip', ['u2'])
+        self.assertEqual(index.get(_URL, None, 'abc', False, 'a.zip'), ['u2'])
+
+
+class FilesReuseTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        dataset = mock_server.Dataset(asns=1, tsts=1, subs=1, runs=1, fles=1)
+        cls.server = mock_server.start_server(dataset)
+
+    @classmethod
+    def tearDownClass(cls):
+
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'grader.py')
+        with open(self.path, 'w') as fd:
+            fd.write("print('grade')\n")
+        self.index_path = os.path.join(self.tmp_dir.name, 'uploads.sqlite')
+
+    def tearDown(self):
+
+        self.tmp_dir.cleanup()
+
+    def files(self, verify=False):
+
+        index = api_uploads.UploadIndex(self.index_path, verify=verify)
+        conn = api_client.Connection(self.server.get_url(), token=mock_server._TOKEN,
+                                     uploads=index)
+        return api_client.Files(conn)
+
+    def uploads(self):
+
+        return self.server.dataset.contents.keys()
+
+    def test_reuse(self):
+
+        files = self.files()
+        uids = files.create(self.path, reuse=True)
+        cnt = len(self.uploads())
+        self.assertEqual(files.create(self.path, reuse=True), uids)
+        self.assertEqual(len(self.uploads()), cnt)
+
+        # Without reuse, always upload
+        self.assertNotEqual(files.create(self.path), uids)
+
+        # Changed bytes miss
+        with open(self.path, 'a') as fd:
+            fd.write("# changed\n")
+        self.assertNotEqual(files.create(self.path, reuse=True), uids)
+
+    def test_delete(self):
+
+        files = self.files()
+        uids = files.create(self.path, reuse=True)
+        files.delete(uids[0])
+        new_uids = files.create(self.path, reuse=True)
+        self.assertNotEqual(new_uids, uids)
+        self.assertIn(str(new_uids[0]), self.uploads())
+
+    def test_verify(self):
+
+        # Deleted behind the index's back (e.g. by another client)
+        uids = self.files().create(self.path, reuse=True)
+        self.server.dataset._delete('files', str(uids[0]))
+
+        # Unverified reuse trusts the index; verified reuse uploads again
+        self.assertEqual(self.files().create(self.path, reuse=True), uids)
+        new_uids = self.files(verify=True).create(self.path, reuse=True)
+        self.assertNotEqual(new_uids, uids)
+        self.assertIn(str(new_uids[0]), self.uploads())
+        self.assertEqual(self.files(verify=True).create(self.path, reuse=True), new_uids)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+# COG API Client
+# v2 API
+# Run Watcher
+
+import time
+import heapq
+
+_STATUS_QUEUED = "queued"
+_STATUS_COMPLETE = "complete"
+_INTERVAL = 0.5 #seconds
+_INTERVAL_MAX = 5.0 #seconds
+_BACKOFF = 1.5
+_ERRORS_MAX = 3
+
+def is_queued(run):
+    return run['status'].startswith(_STATUS_QUEUED)
+
+def is_complete(run):
+    return run['status'].startswith(_STATUS_COMPLETE)
+
+class RunWatcher(object):
+    """ Poll many runs at once and yield each as soon as it completes
+
+    The v2 API has no push or long-poll endpoint, so each run is polled
+    on its own backoff schedule: every interval seconds at first, growing
+    by backoff per poll up to interval_max. All runs due at the same time
+    go out in one iter_show call, so async clients poll them concurrently,
+    and cached runs are revalidated instead of refetched.
+    """
+
+    def __init__(self, runs, interval=_INTERVAL, interval_max=_INTERVAL_MAX,
+                 backoff=_BACKOFF, errors_max=_ERRORS_MAX):
+        """ Constructor"""
+
+        # Check Args
+        if interval <= 0:
+            raise TypeError("interval must be greater than 0")
+        if backoff < 1:
+            raise TypeError("backoff must be at least 1")
+
+        # Set vars
+        self._runs = runs
+        self._interval = interval
+        self._interval_max = max(interval, interval_max)
+        self._backoff = backoff
+        self._errors_max = errors_max
+
+        # Setup State
+        self._queue = []
+        self._state = {}
+        self._polls = 0
+        self.failed = {}
+
+    def _schedule(self, uid, delay):
+        heapq.heappush(self._queue, (time.monotonic() + delay, str(uid), uid))
+
+    def _reschedule(self, uid, state):
+        self._schedule(uid, state['interval'])
+        state['interval'] = min(state['interval'] * self._backoff, self._interval_max)
+
+    def add(self, uid, delay=0.0):
+
+        if uid in self._state:
+            return
+        self._state[uid] = {'interval': self._interval, 'errors': 0, 'status': None}
+        self._schedule(uid, delay)
+
+    def pending(self):
+        return set(self._state.keys())
+
+    def poll_count(self):
+        return self._polls
+
+    def watch(self, timeout=None, changes=False):
+        """ Yield (uid, run) as runs complete, and on status changes if changes
+
+        Stops when every run has completed or failed, or after timeout
+        seconds. Runs that fail errors_max polls in a row are moved to
+        failed; runs still pending are left in pending().
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue:
+
+            # Wait for Next Due Run
+            due = self._queue[0][0]
+            if deadline is not None and due > deadline:
+                break
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            # Collect All Due Runs
+            now = time.monotonic()
+            todo = []
+            while self._queue and self._queue[0][0] <= now:
+                todo.append(heapq.heappop(self._queue)[2])
+            self._polls += len(todo)
+
+            # Poll
+            for uid, future in self._runs.iter_show(todo):
+                state = self._state[uid]
+                try:
+                    run = future.result()
+                except Exception as err:
+                    state['errors'] += 1
+                    if state['errors'] >= self._errors_max:
+                        del self._state[uid]
+                        self.failed[uid] = err
+                    else:
+                        self._reschedule(uid, state)
+                    continue
+                state['errors'] = 0
+
+                # Report
+                if is_complete(run):
+                    del self._state[uid]
+                    yield uid, run
+                    continue
+                if changes and run['status'] != state['status']:
+                    yield uid, run
+                state['status'] = run['status']
+                self._reschedule(uid, state)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+# COG API Client
+# api_watch Tests
+
+import unittest
+import unittest.mock
+import concurrent.futures
+
+import api_watch
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, secs):
+        self.now += secs
+
+
+class StubRuns(object):
+    """ Runs client whose show results follow a script per run
+
+    Each script entry is a status string, or an exception to raise.
+    The last entry repeats once the script runs out.
+    """
+
+    def __init__(self, clock, scripts):
+        self.clock = clock
+        self.scripts = scripts
+        self.polls = dict((uid, []) for uid in scripts)
+
+    def iter_show(self, uids):
+        for uid in uids:
+            self.polls[uid].append(self.clock.now)
+            script = self.scripts[uid]
+            step = script[min(len(self.polls[uid]), len(script)) - 1]
+            future = concurrent.futures.Future()
+            if isinstance(step, Exception):
+                future.set_exception(step)
+            else:
+                future.set_result({'status': step})
+            yield uid, future
+
+
+class RunWatcherTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.clock = FakeClock()
+        patcher = unittest.mock.patch.object(api_watch, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def watcher(self, scripts, **kwargs):
+
+        self.runs = StubRuns(self.clock, scripts)
+        watcher = api_watch.RunWatcher(self.runs, **kwargs)
+        for uid in sorted(scripts):
+            watcher.add(uid)
+        return watcher
+
+    def test_args(self):
+
+        with self.assertRaises(TypeError):
+            api_watch.RunWatcher(None, interval=0)
+        with self.assertRaises(TypeError):
+            api_watch.RunWatcher(None, backoff=0.5)
+
+    def test_backoff(self):
+
+        watcher = self.watcher({'a': ['queued'] * 5 + ['complete'],
+                                'b': ['complete']},
+                               interval=1.0, backoff=2.0, interval_max=4.0)
+        done = list(watcher.watch())
+        self.assertEqual(done, [('b', {'status': 'complete'}), ('a', {'status': 'complete'})])
+
+        # Intervals 1, 2, 4, then capped at 4
+        self.assertEqual(self.runs.polls['a'], [0.0, 1.0, 3.0, 7.0, 11.0, 15.0])
+        self.assertEqual(self.runs.polls['b'], [0.0])
+        self.assertEqual(watcher.poll_count(), 7)
+        self.assertEqual(watcher.pending(), set())
+
+    def test_errors(self):
+
+        err = ValueError('gone')
+        watcher = self.watcher({'bad': [err],
+                                'flaky': [err, err, 'queued', err, err, 'complete']},
+                               interval=1.0, backoff=1.0, errors_max=3)
+        done = list(watcher.watch())
+
+        # Three errors in a row fail a run; a success resets the count
+        self.assertEqual(watcher.failed, {'bad': err})
+        self.assertEqual(len(self.runs.polls['bad']), 3)
+        self.assertEqual(done, [('flaky', {'status': 'complete'})])
+        self.assertEqual(watcher.pending(), set())
+
+    def test_timeout(self):
+
+        watcher = self.watcher({'a': ['queued'], 'b': ['queued', 'complete']},
+                               interval=1.0, backoff=1.0)
+        done = list(watcher.watch(timeout=5.0))
+        self.assertEqual(done, [('b', {'status': 'complete'})])
+        self.assertEqual(watcher.pending(), {'a'})
+        self.assertLessEqual(self.clock.now, 5.0)
+        self.assertEqual(self.runs.polls['a'], [0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+
+        # Watching again picks up where it stopped
+        self.runs.scripts['a'] = ['complete']
+        self.assertEqual(list(watcher.watch()), [('a', {'status': 'complete'})])
+
+    def test_changes(self):
+
+        script = ['queued', 'queued', 'running', 'running', 'running', 'complete']
+        watcher = self.watcher({'a': script}, interval=1.0, backoff=1.0)
+        statuses = [run['status'] for uid, run in watcher.watch(changes=True)]
+        self.assertEqual(statuses, ['queued', 'running', 'complete'])
+        self.assertEqual(len(self.runs.polls['a']), len(script))
+
+        # Without changes, only completion
+        watcher = self.watcher({'a': script}, interval=1.0, backoff=1.0)
+        statuses = [run['status'] for uid, run in watcher.watch()]
+        self.assertEqual(statuses, ['complete'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+
+# COG CLI
+# Benchmarks
+# Drives util commands against mock_server and records request rate,
+# server-side latency and client peak memory
+
+import sys
+import os
+import os.path
+import json
+import time
+import shutil
+import random
+import tempfile
+import contextlib
+import subprocess
+
+import click
+
+import mock_server
+import util_click
+
+_PATH_CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cog-cli.py')
+
+_SIZES = '1k,10k,100k'
+_COMMANDS = 'show-results,download-submissions,cleanup'
+_ASSIGNMENTS = 10
+_FLE_SIZE = 1024 #bytes
+
+_STARTUP_ARGS = ['--help', '--url http://localhost my --help', '--url http://localhost util --help']
+_STARTUP_GUARD = _STARTUP_ARGS
+_STARTUP_BUDGET = 0.1 #seconds
+_STARTUP_RUNS = 20
+_HEAVY_MODULES = ['requests', 'api_client', 'concurrent.futures']
+
+_TABLE_ROWS = '1k,10k,50k'
+
+_UPLOAD_SIZES = '1m,64m,256m'
+
+# Linux keeps the pre-exec RSS high-water mark in ru_maxrss, so a child
+# forked from this process (which hosts the mock server and its data)
+# would report our size. Spawn it from a small shim instead.
+_RSS_SHIM = ("import os, sys, subprocess; p = subprocess.Popen(sys.argv[2:]); "
+             "pid, status, usage = os.wait4(p.pid, 0); "
+             "open(sys.argv[1], 'w').write(str(usage.ru_maxrss)); "
+             "sys.exit(os.waitstatus_to_exitcode(status) & 0xff)")
+_TABLE_HEADINGS = ["Run", "Date", "User", "Assignment", "Test", "Submission", "Status", "Score"]
+
+def parse_size(size):
+
+    size = size.strip().lower()
+    if size.endswith('k'):
+        return int(float(size[:-1]) * 1000)
+    elif size.endswith('m'):
+        return int(float(size[:-1]) * 1000000)
+    else:
+        return int(size)
+
+def run_cli(url, args, cli_opts=[], home=None):
+    """ Run cog-cli.py in a child process and return (duration, peak RSS KiB, status) """
+
+    cmd = [sys.executable, _PATH_CLI, '--url', url, '--token', mock_server._TOKEN]
+    cmd += list(cli_opts) + list(args)
+    env = dict(os.environ)
+    if home:
+        env['HOME'] = home
+
+    start = time.time()
+    with tempfile.TemporaryFile() as err, tempfile.NamedTemporaryFile('r') as rss:
+        proc = subprocess.run([sys.executable, '-c', _RSS_SHIM, rss.name] + cmd,
+                              stdout=subprocess.DEVNULL, stderr=err, env=env)
+        dur = time.time() - start
+        if proc.returncode:
+            err.seek(0)
+            msg = err.read().decode(errors='replace').strip().splitlines()
+            click.echo("  '{}' failed: {}".format(' '.join(args), msg[-1] if msg else ''), err=True)
+        rss_kib = int(rss.read() or 0)
+
+    return dur, rss_kib, proc.returncode
+
+def time_python(args, runs):
+    """ Run the interpreter with args runs times and return sorted wall times """
+
+    durs = []
+    for i in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + list(args),
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        durs.append(time.perf_counter() - start)
+    return sorted(durs)
+
+def heavy_imports(args):
+    """ Return the _HEAVY_MODULES imported by one cog-cli.py run """
+
+    proc = subprocess.run([sys.executable, '-X', 'importtime', _PATH_CLI] + list(args),
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                          universal_newlines=True)
+    imported = set(line.split('|')[-1].strip() for line in proc.stderr.splitlines())
+    return [mod for mod in _HEAVY_MODULES if mod in imported]
+
+def table_rows(cnt, seed=0):
+    """ Return cnt show-results style rows """
+
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(cnt):
+        rows.append(["{:012X}".format(rnd.getrandbits(48)),
+                     "10/{:02d}/26 12:{:02d}:{:02d}".format(rnd.randint(1, 28),
+                                                          rnd.randint(0, 59), rnd.randint(0, 59)),
+                     "user{:06d}".format(rnd.randint(0, 999)),
+                     "asn{:04d}".format(rnd.randint(0, 9)), "tst0000",
+                     "{:012X}".format(rnd.getrandbits(48)),
+                     rnd.choice(["complete-success", "complete-error", "queued"]),
+                     str(rnd.randint(0, 10))])
+    return rows
+
+def command_args(command, work_dir):
+
+    if command == 'show-results':
+        return ['util', 'show-results']
+    elif command == 'download-submissions':
+        dest_dir = os.path.join(work_dir, 'download')
+        os.makedirs(dest_dir, exist_ok=True)
+        return ['util', 'download-submissions', '--overwrite', dest_dir]
+    elif command == 'cleanup':
+        return ['util', 'cleanup', '--all']
+    else:
+        raise TypeError("Unknown command '{}'".format(command))
+
+def echo_results(results):
+
+    fmt = "{:>6s}  {:21s}  {:>8s}  {:>8s}  {:>9s}  {:>8s}  {:>8s}  {:>8s}  {:>7s}"
+    click.echo(fmt.format("Size", "Command", "Requests", "Errors", "Req/sec",
+                          "p50 ms", "p99 ms", "RSS MiB", "Wall s"))
+    for res in results:
+        click.echo(fmt.format(res['size'], res['command'],
+                              str(res['requests']), str(res['errors']),
+                              "{:.1f}".format(res['req_per_sec']),
+                              "{:.2f}".format(res['p50'] * 1000),
+                              "{:.2f}".format(res['p99'] * 1000),
+                              "{:.1f}".format(res['rss_kib'] / 1024),
+                              "{:.2f}".format(res['duration'])))
+
+@click.group()
+def bench():
+    """COG CLI Benchmarks"""
+    pass
+
+@bench.command(name='e2e')
+@click.option('--sizes', default=_SIZES,
+              help="Comma separated submission counts ('{}')".format(_SIZES))
+@click.option('--commands', default=_COMMANDS,
+              help="Comma separated util commands ('{}')".format(_COMMANDS))
+@click.option('--asns', default=_ASSIGNMENTS, help='Assignments to spread submissions over')
+@click.option('--fle_size', default=_FLE_SIZE, help='Submission file size (bytes)')
+@click.option('--latency', default=0.0, help='Added server latency per request (seconds)')
+@click.option('--error_rate', default=0.0, help='Fraction of requests failing with 503')
+@click.option('--cli_opt', 'cli_opts', multiple=True,
+              help="Extra cog-cli.py option, e.g. --cli_opt=--aio (repeatable)")
+@click.option('--cache', is_flag=True, help='Leave the client object cache enabled')
+@click.option('--out', 'out_path', default=None, type=click.Path(writable=True),
+              help='Write results as JSON to this path')
+def bench_e2e(sizes, commands, asns, fle_size, latency, error_rate, cli_opts, cache, out_path):
+    """Run util commands end-to-end against a mock server per dataset size"""
+
+    cli_opts = list(cli_opts)
+    if not cache:
+        cli_opts.append('--no_cache')
+
+    results = []
+    for size in sizes.split(','):
+
+        # Setup Dataset: one test, run and file per submission
+        cnt = parse_size(size)
+        subs = max(1, cnt // asns)
+        click.echo("Building dataset {}: {} asns x {} subs...".format(size, asns, subs), err=True)
+        dataset = mock_server.Dataset(asns=asns, tsts=1, subs=subs, runs=1, fles=1,
+                                      fle_size=fle_size)
+        server = mock_server.start_server(dataset, latency=latency, error_rate=error_rate)
+        work_dir = tempfile.mkdtemp(prefix='cog-bench-')
+
+        try:
+            for command in commands.split(','):
+                click.echo("Running {} @ {}...".format(command, size), err=True)
+                args = command_args(command, work_dir)
+                server.stats.reset()
+                dur, rss, status = run_cli(server.get_url(), args, cli_opts=cli_opts, home=work_dir)
+                stats = server.stats.summary()
+                results.append({'size': size, 'command': command, 'objects': cnt,
+                                'requests': stats['count'], 'errors': stats['errors'],
+                                'req_per_sec': stats['count'] / dur if dur else 0.0,
+                                'p50': stats['p50'], 'p99': stats['p99'],
+                                'rss_kib': rss, 'duration': dur, 'status': status})
+        finally:
+            server.shutdown()
+            server.server_close()
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    # Display Results
+    echo_results(results)
+    if out_path:
+        with open(out_path, 'w') as fd:
+            json.dump(results, fd, indent=4)
+
+@bench.command(name='startup')
+@click.option('--args', 'arg_sets', multiple=True, default=_STARTUP_ARGS,
+              help="cog-cli.py arguments to time (repeatable, default {})".format(_STARTUP_ARGS))
+@click.option('--guard', 'guards', multiple=True, default=_STARTUP_GUARD,
+              help="Arguments that must meet --budget and stay lazy (repeatable)")
+@click.option('--budget', default=_STARTUP_BUDGET, help='Max best-of-runs startup time over the interpreter (seconds)')
+@click.option('--runs', default=_STARTUP_RUNS, help='Invocations per argument set')
+def bench_startup(arg_sets, guards, budget, runs):
+    """Time offline cog-cli.py invocations and fail if guarded ones regress"""
+
+    # Interpreter Baseline
+    base = time_python(['-c', 'pass'], runs)
+
+    fmt = "{:40s}  {:>8s}  {:>8s}  {:>8s}  {:s}"
+    click.echo(fmt.format("Arguments", "Best ms", "p50 ms", "Over ms", "Heavy imports"))
+    click.echo(fmt.format("(python -c pass)", "{:.1f}".format(base[0] * 1000),
+                          "{:.1f}".format(base[len(base) // 2] * 1000), "", ""))
+
+    failed = []
+    for args in arg_sets:
+        durs = time_python([_PATH_CLI] + args.split(), runs)
+        heavy = heavy_imports(args.split())
+        click.echo(fmt.format(args, "{:.1f}".format(durs[0] * 1000),
+                              "{:.1f}".format(durs[len(durs) // 2] * 1000),
+                              "{:.1f}".format((durs[0] - base[0]) * 1000),
+                              ", ".join(heavy) if heavy else "-"))
+        if args in guards:
+            if durs[0] - base[0] > budget:
+                failed.append("'{}' took {:.1f} ms over the interpreter (budget {:.1f} ms)".format(
+                    args, (durs[0] - base[0]) * 1000, budget * 1000))
+            if heavy:
+                failed.append("'{}' imported {}".format(args, ", ".join(heavy)))
+
+    # Check Budget
+    for msg in failed:
+        click.echo("FAIL: {}".format(msg), err=True)
+    if failed:
+        sys.exit(1)
+
+@bench.command(name='upload')
+@click.option('--sizes', default=_UPLOAD_SIZES,
+              help="Comma separated file sizes in bytes ('{}')".format(_UPLOAD_SIZES))
+@click.option('--cli_opt', 'cli_opts', multiple=True,
+              help="Extra cog-cli.py option, e.g. --cli_opt=--aio (repeatable)")
+def bench_upload(sizes, cli_opts):
+    """Record client peak RSS while uploading one large file"""
+
+    dataset = mock_server.Dataset(asns=1, tsts=1, subs=1, runs=1, fles=1, fle_size=_FLE_SIZE)
+    server = mock_server.start_server(dataset)
+    work_dir = tempfile.mkdtemp(prefix='cog-bench-')
+
+    fmt = "{:>8s}  {:>8s}  {:>8s}  {:>8s}  {:>8s}"
+    rows = []
+    try:
+        for size in ['0'] + sizes.split(','):
+
+            # Setup File (sparse, so setup stays fast)
+            path = os.path.join(work_dir, 'upload.bin')
+            with open(path, 'wb') as fd:
+                fd.truncate(parse_size(size))
+
+            click.echo("Uploading {} bytes...".format(size), err=True)
+            args = ['file', 'create', '--path', path]
+            dur, rss, status = run_cli(server.get_url(), args, cli_opts=['--no_cache'] + list(cli_opts),
+                                       home=work_dir)
+            rows.append((size, dur, rss, status))
+            os.remove(path)
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    # Display Results (RSS over the empty upload is what the body costs)
+    base = rows[0][2]
+    click.echo(fmt.format("Size", "RSS MiB", "Over MiB", "Wall s", "MiB/s"))
+    for size, dur, rss, status in rows:
+        mib = parse_size(size) / 2**20
+        click.echo(fmt.format(size, "{:.1f}".format(rss / 1024),
+                              "{:.1f}".format((rss - base) / 1024),
+                              "{:.2f}".format(dur), "{:.1f}".format(mib / dur if dur else 0.0)))
+
+@bench.command(name='table')
+@click.option('--rows', default=_TABLE_ROWS,
+              help="Comma separated row counts ('{}')".format(_TABLE_ROWS))
+@click.option('--line_limit', default=80, help='Line limit passed to echo_table (0 for none)')
+@click.option('--repeat', default=3, help='Renders per row count (best is reported)')
+def bench_table(rows, line_limit, repeat):
+    """Time util_click.echo_table rendering show-results style rows to /dev/null"""
+
+    fmt = "{:>8s}  {:>10s}  {:>12s}"
+    click.echo(fmt.format("Rows", "Best s", "Rows/sec"))
+    for size in rows.split(','):
+        cnt = parse_size(size)
+        table = table_rows(cnt)
+        best = None
+        for i in range(repeat):
+            with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+                start = time.perf_counter()
+                util_click.echo_table(table, headings=list(_TABLE_HEADINGS),
+                                      line_limit=line_limit, sort_by="Date")
+                dur = time.perf_counter() - start
+            best = dur if best is None else min(best, dur)
+        click.echo(fmt.format(size, "{:.3f}".format(best), "{:.0f}".format(cnt / best)))
+
+if __name__ == '__main__':
+    sys.exit(bench())
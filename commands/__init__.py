@@ -0,0 +1,2 @@
+# COG CLI
+# Command Groups (imported on demand by cog-cli.py)
@@ -0,0 +1,113 @@
+# COG CLI
+# Assignment Commands
+
+import click
+
+from commands.common import auth_required, get_connection
+from commands.common import format_option, echo_uid_list
+
+
+@click.group()
+@click.pass_obj
+def assignment(obj):
+
+    # Setup Client Class
+    import api_client
+    obj['assignments'] = api_client.Assignments(get_connection(obj))
+
+@assignment.command(name='create')
+@click.option('--name', default=None, prompt=True, help='Assignment Name')
+@click.option('--env', default='local', help='Assignment Environment')
+@click.option('--duedate', default=None, help='Assignment Due Date')
+@click.option('--respect_duedate', default=None, help='Respect Assignment Due Date')
+@click.option('--accepting_runs', default=False, help='Assignment Accepting Test Runs')
+@click.option('--accepting_subs', default=False, help='Assignment Accepting Submissions')
+@click.pass_obj
+@auth_required
+def assignment_create(obj, name, env, duedate, respect_duedate,
+                      accepting_runs, accepting_subs):
+
+
+    asn_list = obj['assignments'].create(name, env=env,
+                                         duedate=duedate,
+                                         respect_duedate=respect_duedate,
+                                         accepting_runs=accepting_runs,
+                                         accepting_subs=accepting_subs)
+    click.echo("{}".format(asn_list))
+
+@assignment.command(name='update')
+@click.option('--uid', prompt=True, type=click.UUID, help='Assignment UUID')
+@click.option('--name', default=None, help='Assignment Name')
+@click.option('--env', default=None, help='Assignment Environment')
+@click.option('--duedate', default=None, help='Assignment Due Date')
+@click.option('--respect_duedate', default=None, help='Respect Assignment Due Date')
+@click.option('--accepting_runs', default=None, help='Assignment Accepting Test Runs')
+@click.option('--accepting_subs', default=None, help='Assignment Accepting Submissions')
+@click.pass_obj
+@auth_required
+def assignment_update(obj, uid, name, env, duedate, respect_duedate,
+                      accepting_runs, accepting_subs):
+
+    asn = obj['assignments'].update(uid, name=name, env=env,
+                                         duedate=duedate,
+                                         respect_duedate=respect_duedate,
+                                         accepting_runs=accepting_runs,
+                                         accepting_subs=accepting_subs)
+    click.echo("{}".format(asn))
+
+@assignment.command(name='list')
+@click.option('--submitable', is_flag=True, help='Limit to submitable assignments')
+@click.option('--runable', is_flag=True, help='Limit to runable assignments')
+@format_option
+@click.pass_obj
+@auth_required
+def assignment_list(obj, submitable, runable, fmt):
+
+    asn_list = obj['assignments'].list(submitable=submitable, runable=runable)
+    echo_uid_list(asn_list, fmt)
+
+@assignment.command(name='count')
+@click.option('--submitable', is_flag=True, help='Limit to submitable assignments')
+@click.option('--runable', is_flag=True, help='Limit to runable assignments')
+@click.pass_obj
+@auth_required
+def assignment_count(obj, submitable, runable):
+
+    asn_list = obj['assignments'].list(submitable=submitable, runable=runable)
+    click.echo("{}".format(len(asn_list)))
+
+@assignment.command(name='show')
+@click.option('--uid', prompt=True, type=click.UUID, help='Assignment UUID')
+@click.pass_obj
+@auth_required
+def assignment_show(obj, uid):
+
+    asn = obj['assignments'].show(uid)
+    click.echo("{}".format(asn))
+
+@assignment.command(name='delete')
+@click.option('--uid', prompt=True, type=click.UUID, help='Assignment UUID')
+@click.pass_obj
+@auth_required
+def assignment_delete(obj, uid):
+
+    asn = obj['assignments'].delete(uid)
+    click.echo("{}".format(asn))
+
+@assignment.command(name='activate')
+@click.option('--uid', prompt=True, type=click.UUID, help='Assignment UUID')
+@click.pass_obj
+@auth_required
+def assignment_activate(obj, uid):
+
+    asn = obj['assignments'].update(uid, accepting_runs=True, accepting_subs=True)
+    click.echo("{}".format(asn))
+
+@assignment.command(name='deactivate')
+@click.option('--uid', prompt=True, type=click.UUID, help='Assignment UUID')
+@click.pass_obj
+@auth_required
+def assignment_deactivate(obj, uid):
+
+    asn = obj['assignments'].update(uid, accepting_runs=False, accepting_subs=False)
+    click.echo("{}".format(asn))
@@ -0,0 +1,577 @@
+# COG CLI
+# Shared Command Helpers
+
+import os.path
+import time
+import uuid
+import queue
+import functools
+import collections
+
+import click
+
+import util_click
+import util_cli
+
+
+_APP_NAME = 'cog-cli'
+_PATH_SERVER_CONF = os.path.join(click.get_app_dir(_APP_NAME), 'servers')
+_PATH_CACHE = os.path.join(click.get_app_dir(_APP_NAME), 'cache')
+_PATH_UPLOADS = os.path.join(click.get_app_dir(_APP_NAME), 'uploads.sqlite')
+_ASYNC_WINDOW = 1000 #max outstanding calls per async_obj_map
+
+
+### Connection Functions ###
+
+def get_connection(obj):
+    """ Return the API connection, building it on first use
+
+    Deferred so '--help' and group listings never import requests or
+    open sessions and caches.
+    """
+
+    if obj['connection'] is not None:
+        return obj['connection']
+
+    # Setup Cache
+    opts = obj['conn_opts']
+    if opts['no_cache']:
+        cache = None
+    else:
+        import api_cache
+        cache = api_cache.ObjectCache(_PATH_CACHE, ttl=opts['cache_ttl'],
+                                      refresh=opts['refresh'])
+
+    # Setup Upload Index
+    if opts['no_upload_index']:
+        uploads = None
+    else:
+        import api_uploads
+        uploads = api_uploads.UploadIndex(_PATH_UPLOADS, verify=opts['verify_uploads'])
+
+    # Setup Connection
+    if obj['aio']:
+        import api_client_aio
+        obj['connection'] = api_client_aio.AioConnection(obj['url'],
+                                                         concurrency=opts['threads'],
+                                                         pool_size=opts['pool_size'],
+                                                         keep_alive=(not opts['no_keepalive']),
+                                                         cache=cache,
+                                                         uploads=uploads,
+                                                         chunk_size=opts['chunk_size'],
+                                                         retries=opts['retries'],
+                                                         rate_limit=opts['rate_limit'],
+                                                         metrics=obj['metrics'])
+    else:
+        import api_client
+        obj['connection'] = api_client.AsyncConnection(obj['url'], threads=opts['threads'],
+                                                       pool_size=opts['pool_size'],
+                                                       keep_alive=(not opts['no_keepalive']),
+                                                       cache=cache,
+                                                       uploads=uploads,
+                                                       chunk_size=opts['chunk_size'],
+                                                       retries=opts['retries'],
+                                                       rate_limit=opts['rate_limit'],
+                                                       metrics=obj['metrics'])
+
+    return obj['connection']
+
+
+### Auth Functions ###
+
+def auth_required(func):
+
+    @functools.wraps(func)
+    def _wrapper(obj, *args, **kwargs):
+
+        connection = get_connection(obj)
+        if not connection.is_authenticated():
+
+            # Token
+            if obj['token']:
+                connection.authenticate(token=obj['token'])
+
+            # Username:Password
+            else:
+                if not obj['username']:
+                    obj['username'] = click.prompt("Username", hide_input=False)
+                if not obj['password']:
+                    obj['password'] = click.prompt("Password", hide_input=True)
+                connection.authenticate(username=obj['username'],
+                                        password=obj['password'])
+
+        # Call Function
+        return func(obj, *args, **kwargs)
+
+    return _wrapper
+
+
+### Output Functions ###
+
+format_option = click.option('--format', 'fmt', default='table',
+                             type=click.Choice(['table'] + util_click.ROW_FORMATS),
+                             help="Output format (rows stream as they arrive except in 'table')")
+
+def echo_uid_list(uids, fmt):
+
+    if fmt == 'table':
+        click.echo("{}".format(uids))
+    else:
+        writer = util_click.RowWriter(fmt, ['uid'])
+        for uid in uids:
+            writer.write([str(uid)])
+
+
+### Async Helper Functions ###
+
+def async_obj_map(obj_list, async_fun,
+                  async_func_args=[], async_func_kwargs={},
+                  label=None, timing=False, window=_ASYNC_WINDOW, sink=None):
+    """ Call async_fun for every key in obj_list and return (output, failed)
+
+    If sink is given, each result is passed to sink(key, result) as it
+    completes instead of being kept in output. Errors raised by sink are
+    reported in failed.
+    """
+
+    if timing:
+        start = time.time()
+
+    # Progress and timing go to stderr so stdout can be piped
+    output = {}
+    failed = {}
+    with click.progressbar(label=label, length=len(obj_list),
+                           file=click.get_text_stream('stderr')) as bar:
+        for key, f in util_cli.iter_completed(obj_list, async_fun,
+                                              args=async_func_args,
+                                              kwargs=async_func_kwargs,
+                                              window=window):
+            try:
+                if sink is None:
+                    output[key] = f.result()
+                else:
+                    sink(key, f.result())
+            except Exception as err:
+                failed[key] = err
+            finally:
+                bar.update(1)
+
+    if timing:
+        end = time.time()
+        dur = end - start
+        dur_str = "Dur: {}".format(util_cli.duration_to_str(dur))
+        ops = len(obj_list)/dur
+        ops_str = "Objs/sec: {:6.0f}".format(ops)
+        offset = "{val:{width}s}".format(val="", width=(len(label)+1))
+        click.echo("{}  {},   {}".format(offset, dur_str, ops_str), err=True)
+
+    return output, failed
+
+def echo_transport_stats(connection):
+
+    click.echo("Retries:     {:11d}".format(connection.get_retry_count()), err=True)
+    hits, misses = connection.get_flight_stats()
+    click.echo("Coalesced:   {:11d} of {:d} GETs".format(hits, hits + misses), err=True)
+
+    # Per-Endpoint Metrics
+    metrics = connection.get_metrics()
+    if metrics is None:
+        return
+    headings = ["Method", "Endpoint", "Count", "Errors", "Retries", "KiB",
+                "p50 ms", "p90 ms", "p99 ms", "Max ms"]
+    table = []
+    for (method, template), summary in metrics.summary().items():
+        errors = sum([cnt for status, cnt in summary['statuses'].items()
+                      if not status.startswith('2') and not status.startswith('3')])
+        table.append([method, template, str(summary['count']), str(errors),
+                      str(summary['retries']), "{:.1f}".format(summary['bytes'] / 1024),
+                      "{:.1f}".format(summary['p50'] * 1000),
+                      "{:.1f}".format(summary['p90'] * 1000),
+                      "{:.1f}".format(summary['p99'] * 1000),
+                      "{:.1f}".format(summary['max'] * 1000)])
+    if table:
+        # Never truncate: the endpoint column is the point of the table
+        util_click.echo_table(table, headings=headings, line_limit=0, err=True)
+
+def async_obj_fetch(iter_parent, obj_name=None, obj_client=None,
+                    async_list=None, async_show=None, timing=False,
+                    prefilter_list=None, prefilter_func=None,
+                    prefilter_func_args=[], prefilter_func_kwargs={},
+                    postfilter_list=None, postfilter_func=None,
+                    postfilter_func_args=[], postfilter_func_kwargs={},
+                    parent_attr=None, prefetched=None):
+
+    # Nothing to fetch without parents
+    iter_parent = list(iter_parent)
+    if not iter_parent:
+        return {}, set(), {}, {}, {}
+
+    # Plan: show named objects directly instead of listing every parent
+    if prefilter_list and (parent_attr or iter_parent == [None]):
+        tup = async_obj_fetch_direct(iter_parent, prefilter_list, obj_name=obj_name,
+                                     obj_client=obj_client, async_show=async_show,
+                                     timing=timing, parent_attr=parent_attr,
+                                     prefetched=prefetched, prefilter_func=prefilter_func,
+                                     prefilter_func_args=prefilter_func_args,
+                                     prefilter_func_kwargs=prefilter_func_kwargs)
+        lists, todo_set, objs, lists_failed, objs_failed = tup
+        objs = postfilter_objs(objs, obj_name=obj_name,
+                               postfilter_list=postfilter_list,
+                               postfilter_func=postfilter_func,
+                               postfilter_func_args=postfilter_func_args,
+                               postfilter_func_kwargs=postfilter_func_kwargs)
+        return lists, todo_set, objs, lists_failed, objs_failed
+
+    # Async List
+    if async_list is None:
+        if obj_client is not None:
+            async_list = obj_client.async_list()
+        else:
+            raise TypeError("Requires either obj_client or async_list")
+    label = "Listing  {}".format(obj_name if obj_name else "")
+    lists, lists_failed = async_obj_map(iter_parent, async_list,
+                                        label=label, timing=timing)
+    todo_set = lists_to_set(lists)
+
+    # Pre-Filter List
+    if prefilter_list:
+        todo_set_orig = todo_set
+        todo_set = set()
+        for ouid in prefilter_list:
+            if ouid in todo_set_orig:
+                todo_set.add(ouid)
+            else:
+                obj_str = obj_name if obj_name else "object"
+                msg = "Pre-filtered {} '{}' not found in '{}'".format(obj_str, ouid, todo_set_orig)
+                raise TypeError(msg)
+
+    # Pre-Filter Function
+    if prefilter_func:
+        todo_set_orig = todo_set
+        todo_set = set()
+        for ouid in todo_set_orig:
+            if prefilter_func(ouid, *prefilter_func_args, **prefilter_func_kwargs):
+                todo_set.add(ouid)
+
+    # Async Get
+    if async_show is None:
+        if obj_client is not None:
+            async_show = obj_client.async_show()
+        else:
+            raise TypeError("Requires either obj_clientn ot async_show")
+    label = "Getting  {}".format(obj_name if obj_name else "")
+    objs, objs_failed = async_obj_map(todo_set, async_show,
+                                      label=label, timing=timing)
+
+    # Post-Filter
+    objs = postfilter_objs(objs, obj_name=obj_name,
+                           postfilter_list=postfilter_list,
+                           postfilter_func=postfilter_func,
+                           postfilter_func_args=postfilter_func_args,
+                           postfilter_func_kwargs=postfilter_func_kwargs)
+
+    # Return
+    return lists, todo_set, objs, lists_failed, objs_failed
+
+def async_obj_fetch_direct(iter_parent, uids, obj_name=None, obj_client=None,
+                           async_show=None, timing=False, parent_attr=None, prefetched=None,
+                           prefilter_func=None, prefilter_func_args=[], prefilter_func_kwargs={}):
+
+    # Pre-Filter Function
+    todo_set = set(uids)
+    if prefilter_func:
+        todo_set = set([ouid for ouid in todo_set
+                        if prefilter_func(ouid, *prefilter_func_args, **prefilter_func_kwargs)])
+
+    # Async Get (reusing objects already fetched while planning)
+    if async_show is None:
+        if obj_client is not None:
+            async_show = obj_client.async_show
+        else:
+            raise TypeError("Requires either obj_client or async_show")
+    prefetched = prefetched if prefetched else {}
+    label = "Getting  {}".format(obj_name if obj_name else "")
+    objs, objs_failed = async_obj_map(todo_set - set(prefetched.keys()), async_show,
+                                      label=label, timing=timing)
+    for ouid in todo_set:
+        if ouid in prefetched:
+            objs[ouid] = prefetched[ouid]
+
+    # Rebuild Lists from Parent Attribute
+    lists = {}
+    if parent_attr:
+        parents = set(iter_parent)
+        for ouid, obj in objs.items():
+            puid = uuid.UUID(obj[parent_attr])
+            if puid not in parents:
+                obj_str = obj_name if obj_name else "object"
+                msg = "Pre-filtered {} '{}' not found in '{}'".format(obj_str, ouid, parents)
+                raise TypeError(msg)
+            lists.setdefault(puid, []).append(ouid)
+    else:
+        lists[None] = list(objs.keys())
+
+    # Return
+    return lists, todo_set, objs, {}, objs_failed
+
+def postfilter_objs(objs, obj_name=None,
+                    postfilter_list=None, postfilter_func=None,
+                    postfilter_func_args=[], postfilter_func_kwargs={}):
+
+    # Post-Filter List
+    if postfilter_list:
+        objs_orig = objs
+        objs = {}
+        for ouid in postfilter_list:
+            if ouid in objs_orig:
+                objs[ouid] = objs_orig[ouid]
+            else:
+                obj_str = obj_name if obj_name else "object"
+                msg = "Post-filtered {} '{}' not found".format(obj_str, ouid)
+                raise TypeError(msg)
+
+    # Post-Filter Function
+    if postfilter_func:
+        objs_orig = objs
+        objs = {}
+        for ouid, obj in objs_orig.items():
+            if postfilter_func(ouid, obj, *postfilter_func_args, **postfilter_func_kwargs):
+                objs[ouid] = obj
+
+    return objs
+
+def plan_fetch(obj_name, named=None, derived_from=None, derived_max=None,
+               parents=None, parent_name=None):
+    """ Return an (obj_name, strategy, lists, shows, source) plan row """
+
+    if named:
+        return (obj_name, "direct", "0", str(len(named)), "named")
+    elif derived_from:
+        shows = "<={}".format(derived_max) if derived_max is not None else "?"
+        return (obj_name, "direct", "0", shows, "from {}".format(derived_from))
+    else:
+        lists = parents if parents is not None else "?"
+        source = "per {}".format(parent_name) if parent_name else "all"
+        return (obj_name, "listed", lists, "?", source)
+
+def plan_parents(plan_row):
+
+    obj_name, strategy, lists, shows, source = plan_row
+    return shows if strategy == "direct" else "?"
+
+def echo_fetch_plan(plan):
+
+    click.echo("{:11s}  {:8s}  {:>6s}  {:>6s}  {}".format("Stage", "Strategy",
+                                                         "Lists", "Shows", "Source"))
+    for obj_name, strategy, lists, shows, source in plan:
+        click.echo("{:11s}  {:8s}  {:>6s}  {:>6s}  {}".format(obj_name, strategy,
+                                                             lists, shows, source))
+
+def async_obj_pipeline(stages, timing=False, window=_ASYNC_WINDOW):
+
+    if timing:
+        start = time.time()
+
+    # Setup Stages
+    children = {}
+    results = {}
+    prefilter = {}
+    times = {}
+    for stage in stages:
+        children.setdefault(stage.get('parent'), []).append(stage)
+        results[stage['name']] = ({}, set(), {}, {}, {})
+        if stage.get('prefilter_list'):
+            prefilter[stage['name']] = set(stage['prefilter_list'])
+        else:
+            prefilter[stage['name']] = None
+        if not (stage.get('async_list') or stage.get('derive_func')):
+            raise TypeError("Stage '{}' requires either async_list or derive_func".format(stage['name']))
+        if not stage.get('async_show'):
+            raise TypeError("Stage '{}' requires async_show".format(stage['name']))
+
+    done = queue.Queue()
+    backlog = collections.deque()
+
+    def _put(stage, kind, key, future):
+        done.put((stage, kind, key, future))
+
+    def _listed(stage, puid, ouids):
+
+        lists, todo_set, objs, lists_failed, objs_failed = results[stage['name']]
+        lists[puid] = ouids
+
+        for ouid in ouids:
+
+            # Skip Duplicates
+            if ouid in todo_set:
+                continue
+
+            # Pre-Filter List
+            if prefilter[stage['name']] is not None:
+                if ouid not in prefilter[stage['name']]:
+                    continue
+
+            # Pre-Filter Function
+            func = stage.get('prefilter_func')
+            if func:
+                if not func(ouid, *stage.get('prefilter_func_args', []),
+                            **stage.get('prefilter_func_kwargs', {})):
+                    continue
+
+            # Queue Get
+            todo_set.add(ouid)
+            backlog.append((stage, 'show', ouid))
+
+    def _got(stage, ouid, obj):
+
+        lists, todo_set, objs, lists_failed, objs_failed = results[stage['name']]
+
+        # Post-Filter List
+        if stage.get('postfilter_list'):
+            if ouid not in stage['postfilter_list']:
+                return
+
+        # Post-Filter Function
+        func = stage.get('postfilter_func')
+        if func:
+            if not func(ouid, obj, *stage.get('postfilter_func_args', []),
+                        **stage.get('postfilter_func_kwargs', {})):
+                return
+
+        # Feed Child Stages
+        objs[ouid] = obj
+        for child in children.get(stage['name'], []):
+            if child.get('derive_func'):
+                _listed(child, ouid, child['derive_func'](ouid, obj))
+            else:
+                backlog.append((child, 'list', ouid))
+
+    def _run():
+
+        pending = 0
+        while backlog or pending:
+
+            # Fill Window
+            while backlog and pending < window:
+                stage, kind, key = backlog.popleft()
+                if kind == 'list':
+                    f = stage['async_list'](key)
+                else:
+                    f = stage['async_show'](key)
+                f.add_done_callback(functools.partial(_put, stage, kind, key))
+                times.setdefault(stage['name'], [time.time(), None, 0])
+                pending += 1
+
+            # Process Next Completion
+            stage, kind, key, f = done.get()
+            pending -= 1
+            lists, todo_set, objs, lists_failed, objs_failed = results[stage['name']]
+            try:
+                ret = f.result()
+            except Exception as err:
+                if kind == 'list':
+                    lists_failed[key] = err
+                else:
+                    objs_failed[key] = err
+            else:
+                if kind == 'list':
+                    _listed(stage, key, ret)
+                else:
+                    _got(stage, key, ret)
+            finally:
+                times[stage['name']][1] = time.time()
+                times[stage['name']][2] += 1
+
+            yield stage
+
+    # Seed Root Stages
+    for stage in children.get(None, []):
+        for puid in stage['iter_parent']:
+            backlog.append((stage, 'list', puid))
+
+    # Run Pipeline
+    def _show_stage(stage):
+        return stage.get('obj_name', stage['name']).strip() if stage else ""
+    with click.progressbar(_run(), label="Pipeline   ", item_show_func=_show_stage,
+                           file=click.get_text_stream('stderr')) as bar:
+        for stage in bar:
+            pass
+
+    # Check Filter Lists
+    for stage in stages:
+        lists, todo_set, objs, lists_failed, objs_failed = results[stage['name']]
+        obj_str = stage.get('obj_name', stage['name']).strip()
+        if prefilter[stage['name']] is not None:
+            found_set = lists_to_set(lists)
+            for ouid in prefilter[stage['name']]:
+                if ouid not in found_set:
+                    msg = "Pre-filtered {} '{}' not found in '{}'".format(obj_str, ouid, found_set)
+                    raise TypeError(msg)
+        if stage.get('postfilter_list'):
+            for ouid in stage['postfilter_list']:
+                if ouid not in objs:
+                    msg = "Post-filtered {} '{}' not found".format(obj_str, ouid)
+                    raise TypeError(msg)
+
+    if timing:
+        for stage in stages:
+            if stage['name'] not in times:
+                continue
+            first, last, cnt = times[stage['name']]
+            dur = last - first
+            dur_str = "Dur: {}".format(util_cli.duration_to_str(dur))
+            ops = cnt/dur if dur else 0.0
+            ops_str = "Calls/sec: {:6.0f}".format(ops)
+            label = stage.get('obj_name', stage['name'])
+            click.echo("{}  {},   {}".format(label, dur_str, ops_str), err=True)
+        end = time.time()
+        dur = end - start
+        click.echo("Pipeline Dur: {}".format(util_cli.duration_to_str(dur)), err=True)
+
+    # Return
+    return results
+
+def drop_failed(named, failed):
+    """ Drop named objects that failed to show while planning """
+    return [ouid for ouid in named if ouid not in failed]
+
+def lists_to_set(lists):
+
+    sset = set([ouid for puid, ouids in lists.items() for ouid in ouids])
+    return sset
+
+def objs_to_attr_set(objs, attr):
+
+    aset = set([uuid.UUID(obj[attr]) for obj in objs.values()])
+    return aset
+
+
+### Pre Processing Filters ###
+
+def prefilter_not_in(ouid, exclude):
+
+    return ouid not in exclude
+
+
+### Post Processing Filters ###
+
+def postfilter_attr_owner(ouid, obj, owners):
+
+    if owners:
+        return uuid.UUID(obj['owner']) in owners
+    else:
+        return True
+
+def postfilter_attr_test(ouid, obj, tests):
+
+    if tests:
+        return uuid.UUID(obj['test']) in tests
+    else:
+        return True
+
+
+### Pipeline Derive Functions ###
+
+def derive_attr_owner(ouid, obj):
+
+    return [uuid.UUID(obj['owner'])]
@@ -0,0 +1,93 @@
+# COG CLI
+# File Commands
+
+import os.path
+
+import click
+
+from commands.common import auth_required, get_connection
+from commands.common import format_option, echo_uid_list
+
+
+@click.group(name='file')
+@click.pass_obj
+def fle(obj):
+
+    # Setup Client Class
+    import api_client
+    obj['files'] = api_client.Files(get_connection(obj))
+
+@fle.command(name='create')
+@click.option('--path', default=None, prompt=True,
+              type=click.Path(exists=True, readable=True, resolve_path=True),
+              help='Source Path')
+@click.option('--extract', is_flag=True, help='Control whether file is extracted')
+@click.option('--progress', is_flag=True, help='Display upload progress')
+@click.pass_obj
+@auth_required
+def fle_create(obj, path, extract, progress):
+
+    if progress:
+        size = os.path.getsize(path)
+        with click.progressbar(length=size, label="Uploading") as bar:
+            fle_list = obj['files'].create(path, extract, callback=bar.update)
+    else:
+        fle_list = obj['files'].create(path, extract)
+    click.echo("{}".format(fle_list))
+
+@fle.command(name='list')
+@click.option('--tst_uid', default=None, type=click.UUID,
+              help='Only list files attached to a specific test')
+@click.option('--sub_uid', default=None, type=click.UUID,
+              help='Only list files attached to a specific submission')
+@format_option
+@click.pass_obj
+@auth_required
+def fle_list(obj, tst_uid, sub_uid, fmt):
+
+    fle_list = obj['files'].list(tst_uid=tst_uid, sub_uid=sub_uid)
+    echo_uid_list(fle_list, fmt)
+
+@fle.command(name='count')
+@click.option('--tst_uid', default=None, type=click.UUID,
+              help='Only count files attached to a specific test')
+@click.option('--sub_uid', default=None, type=click.UUID,
+              help='Only count files attached to a specific submission')
+@click.pass_obj
+@auth_required
+def fle_count(obj, tst_uid, sub_uid):
+
+    fle_list = obj['files'].list(tst_uid=tst_uid, sub_uid=sub_uid)
+    click.echo("{}".format(len(fle_list)))
+
+@fle.command(name='show')
+@click.option('--uid', prompt=True, type=click.UUID, help='File UUID')
+@click.pass_obj
+@auth_required
+def fle_show(obj, uid):
+
+    fle = obj['files'].show(uid)
+    click.echo("{}".format(fle))
+
+@fle.command(name='delete')
+@click.option('--uid', prompt=True, type=click.UUID, help='File UUID')
+@click.pass_obj
+@auth_required
+def fle_delete(obj, uid):
+
+    fle = obj['files'].delete(uid)
+    click.echo("{}".format(fle))
+
+@fle.command(name='download')
+@click.option('--uid', prompt=True, type=click.UUID, help='File UUID')
+@click.option('--path', default=None, prompt=True,
+              type=click.Path(writable=True, resolve_path=True),
+              help='Destination Path')
+@click.option('--orig_path', is_flag=True,
+              help='Control whether original path is used')
+@click.pass_obj
+@auth_required
+def fle_download(obj, uid, path, orig_path):
+
+    path = obj['files'].download(uid, path, orig_path=orig_path)
+    click.echo("{}".format(path))
@@ -0,0 +1,48 @@
+# COG CLI
+# My Commands
+
+import click
+
+from commands.common import auth_required, get_connection
+
+
+@click.group(name='my')
+@click.pass_obj
+def my(obj):
+
+    # Setup Client Class
+    import api_client
+    obj['my'] = api_client.My(get_connection(obj))
+
+@my.command(name='token')
+@click.pass_obj
+@auth_required
+def my_token(obj):
+
+    token = obj['my'].token()
+    click.echo("{}".format(token))
+
+@my.command(name='username')
+@click.pass_obj
+@auth_required
+def my_username(obj):
+
+    username = obj['my'].username()
+    click.echo("{}".format(username))
+
+@my.command(name='useruuid')
+@click.pass_obj
+@auth_required
+def my_useruuid(obj):
+
+    useruuid = obj['my'].useruuid()
+    click.echo("{}".format(useruuid))
+
+@my.command(name='submissions')
+@click.option('--asn_uid', default=None, prompt=True, help='Assignment UUID')
+@click.pass_obj
+@auth_required
+def my_submissions(obj, asn_uid):
+
+    useruuid = obj['my'].submissions(asn_uid=asn_uid)
+    click.echo("{}".format(useruuid))
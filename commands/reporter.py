@@ -0,0 +1,75 @@
+# COG CLI
+# Reporter Commands
+
+import click
+
+from commands.common import auth_required, get_connection
+from commands.common import format_option, echo_uid_list
+
+
+@click.group()
+@click.pass_obj
+def reporter(obj):
+
+    # Setup Client Class
+    import api_client
+    obj['reporters'] = api_client.Reporters(get_connection(obj))
+
+@reporter.command(name='create')
+@click.option('--mod', default=None, prompt=True, help='Reporter Module')
+@click.option('--mod_opt', 'mod_opts', nargs=2, multiple=True, help='Key:Value Option')
+@click.pass_obj
+@auth_required
+def reporter_create(obj, mod, mod_opts):
+
+    mod_kwargs = dict(list(mod_opts))
+    rpt_list = obj['reporters'].create(mod, **mod_kwargs)
+    click.echo("{}".format(rpt_list))
+
+@reporter.command(name='update')
+@click.option('--uid', prompt=True, type=click.UUID, help='Reporter UUID')
+@click.option('--mod_opt', 'mod_opts', nargs=2, multiple=True, help='Key:Value Option')
+@click.pass_obj
+@auth_required
+def reporter_update(obj, uid, mod_opts):
+
+    mod_kwargs = dict(list(mod_opts))
+    rpt = obj['reporters'].update(uid, **mod_kwargs)
+    click.echo("{}".format(rpt))
+
+@reporter.command(name='list')
+@click.option('--tst_uid', default=None, type=click.UUID, help='Test UUID')
+@format_option
+@click.pass_obj
+@auth_required
+def reporter_list(obj, tst_uid, fmt):
+
+    rpt_list = obj['reporters'].list(tst_uid=tst_uid)
+    echo_uid_list(rpt_list, fmt)
+
+@reporter.command(name='count')
+@click.option('--tst_uid', default=None, type=click.UUID, help='Test UUID')
+@click.pass_obj
+@auth_required
+def reporter_count(obj, tst_uid):
+
+    rpt_list = obj['reporters'].list(tst_uid=tst_uid)
+    click.echo("{}".format(len(rpt_list)))
+
+@reporter.command(name='show')
+@click.option('--uid', prompt=True, type=click.UUID, help='Reporter UUID')
+@click.pass_obj
+@auth_required
+def reporter_show(obj, uid):
+
+    rpt = obj['reporters'].show(uid)
+    click.echo("{}".format(rpt))
+
+@reporter.command(name='delete')
+@click.option('--uid', prompt=True, type=click.UUID, help='Reporter UUID')
+@click.pass_obj
+@auth_required
+def reporter_delete(obj, uid):
+
+    rpt = obj['reporters'].delete(uid)
+    click.echo("{}".format(rpt))
@@ -0,0 +1,63 @@
+# COG CLI
+# Run Commands
+
+import click
+
+from commands.common import auth_required, get_connection
+from commands.common import format_option, echo_uid_list
+
+
+@click.group()
+@click.pass_obj
+def run(obj):
+
+    # Setup Client Class
+    import api_client
+    obj['runs'] = api_client.Runs(get_connection(obj))
+
+@run.command(name='create')
+@click.option('--sub_uid', prompt=True, type=click.UUID, help='Submission UUID')
+@click.option('--tst_uid', prompt=True, type=click.UUID, help='Test UUID')
+@click.pass_obj
+@auth_required
+def run_create(obj, sub_uid, tst_uid):
+
+    run_list = obj['runs'].create(sub_uid, tst_uid)
+    click.echo("{}".format(run_list))
+
+@run.command(name='list')
+@click.option('--sub_uid', default=None, type=click.UUID, help='Submission UUID')
+@format_option
+@click.pass_obj
+@auth_required
+def run_list(obj, sub_uid, fmt):
+
+    run_list = obj['runs'].list(sub_uid=sub_uid)
+    echo_uid_list(run_list, fmt)
+
+@run.command(name='count')
+@click.option('--sub_uid', default=None, type=click.UUID, help='Submission UUID')
+@click.pass_obj
+@auth_required
+def run_count(obj, sub_uid):
+
+    run_list = obj['runs'].list(sub_uid=sub_uid)
+    click.echo("{}".format(len(run_list)))
+
+@run.command(name='show')
+@click.option('--uid', prompt=True, type=click.UUID, help='Run UUID')
+@click.pass_obj
+@auth_required
+def run_show(obj, uid):
+
+    run = obj['runs'].show(uid)
+    click.echo("{}".format(run))
+
+@run.command(name='delete')
+@click.option('--uid', prompt=True, type=click.UUID, help='Run UUID')
+@click.pass_obj
+@auth_required
+def run_delete(obj, uid):
+
+    run = obj['runs'].delete(uid)
+    click.echo("{}".format(run))
@@ -0,0 +1,82 @@
+# COG CLI
+# Submission Commands
+
+import click
+
+from commands.common import auth_required, get_connection
+from commands.common import format_option, echo_uid_list
+
+
+@click.group()
+@click.pass_obj
+def submission(obj):
+
+    # Setup Client Class
+    import api_client
+    obj['submissions'] = api_client.Submissions(get_connection(obj))
+
+@submission.command(name='create')
+@click.option('--asn_uid', default=None, prompt=True, help='Assignment UUID')
+@click.pass_obj
+@auth_required
+def submission_create(obj, asn_uid):
+
+    sub_list = obj['submissions'].create(asn_uid)
+    click.echo("{}".format(sub_list))
+
+@submission.command(name='list')
+@click.option('--asn_uid', default=None, type=click.UUID, help='Assignment UUID')
+@format_option
+@click.pass_obj
+@auth_required
+def submission_list(obj, asn_uid, fmt):
+
+    sub_list = obj['submissions'].list(asn_uid=asn_uid)
+    echo_uid_list(sub_list, fmt)
+
+@submission.command(name='count')
+@click.option('--asn_uid', default=None, type=click.UUID, help='Assignment UUID')
+@click.pass_obj
+@auth_required
+def submission_count(obj, asn_uid):
+
+    sub_list = obj['submissions'].list(asn_uid=asn_uid)
+    click.echo("{}".format(len(sub_list)))
+
+@submission.command(name='show')
+@click.option('--uid', prompt=True, type=click.UUID, help='Submission UUID')
+@click.pass_obj
+@auth_required
+def submission_show(obj, uid):
+
+    sub = obj['submissions'].show(uid)
+    click.echo("{}".format(sub))
+
+@submission.command(name='delete')
+@click.option('--uid', prompt=True, type=click.UUID, help='Submission UUID')
+@click.pass_obj
+@auth_required
+def submission_delete(obj, uid):
+
+    sub = obj['submissions'].delete(uid)
+    click.echo("{}".format(sub))
+
+@submission.command(name='attach_files')
+@click.option('--uid', prompt=True, type=click.UUID, help='Submission UUID')
+@click.option('--fle_uid', multiple=True, type=click.UUID, help='File UUID')
+@click.pass_obj
+@auth_required
+def submission_attach_files(obj, uid, fle_uid):
+
+    sub = obj['submissions'].attach_files(uid, fle_uid)
+    click.echo("{}".format(sub))
+
+@submission.command(name='detach_files')
+@click.option('--uid', prompt=True, type=click.UUID, help='Submission UUID')
+@click.option('--fle_uid', multiple=True, type=click.UUID, help='File UUID')
+@click.pass_obj
+@auth_required
+def submission_detach_files(obj, uid, fle_uid):
+
+    sub = obj['submissions'].detach_files(uid, fle_uid)
+    click.echo("{}".format(sub))
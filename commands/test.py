@@ -0,0 +1,125 @@
+# COG CLI
+# Test Commands
+
+import click
+
+from commands.common import auth_required, get_connection
+from commands.common import format_option, echo_uid_list
+
+
+@click.group()
+@click.pass_obj
+def test(obj):
+
+    # Setup Client Class
+    import api_client
+    obj['tests'] = api_client.Tests(get_connection(obj))
+
+@test.command(name='create')
+@click.option('--asn_uid', default=None, prompt=True, help='Assignment UUID')
+@click.option('--name', default=None, prompt=True, help='Test Name')
+@click.option('--maxscore', default=None, prompt=True, help='Max Score')
+@click.option('--tester', default='script', help='Test Module')
+@click.option('--builder', default=None, help='Build Module')
+@click.option('--path_script', default=None, help='Relative Path to Grading Script')
+@click.pass_obj
+@auth_required
+def test_create(obj, asn_uid, name, maxscore, tester, builder, path_script):
+
+    tst_list = obj['tests'].create(asn_uid, name, maxscore,
+                                   tester=tester, builder=builder,
+                                   path_script=path_script)
+    click.echo("{}".format(tst_list))
+
+@test.command(name='update')
+@click.option('--uid', prompt=True, type=click.UUID, help='Test UUID')
+@click.option('--name', default=None, help='Test Name')
+@click.option('--maxscore', default=None, help='Max Score')
+@click.option('--tester', default=None, help='Test Module')
+@click.option('--builder', default=None, help='Build Module')
+@click.option('--path_script', default=None, help='Relative Path to Grading Script')
+@click.pass_obj
+@auth_required
+def test_update(obj, uid, name, maxscore, tester, builder, path_script):
+
+    tst = obj['tests'].update(uid, name=name, maxscore=maxscore,
+                              tester=tester, builder=builder,
+                              path_script=path_script)
+    click.echo("{}".format(tst))
+
+@test.command(name='list')
+@click.option('--asn_uid', default=None, type=click.UUID, help='Assignment UUID')
+@format_option
+@click.pass_obj
+@auth_required
+def test_list(obj, asn_uid, fmt):
+
+    tst_list = obj['tests'].list(asn_uid=asn_uid)
+    echo_uid_list(tst_list, fmt)
+
+@test.command(name='count')
+@click.option('--asn_uid', default=None, type=click.UUID, help='Assignment UUID')
+@click.pass_obj
+@auth_required
+def test_count(obj, asn_uid):
+
+    tst_list = obj['tests'].list(asn_uid=asn_uid)
+    click.echo("{}".format(len(tst_list)))
+
+@test.command(name='show')
+@click.option('--uid', prompt=True, type=click.UUID, help='Test UUID')
+@click.pass_obj
+@auth_required
+def test_show(obj, uid):
+
+    tst = obj['tests'].show(uid)
+    click.echo("{}".format(tst))
+
+@test.command(name='delete')
+@click.option('--uid', prompt=True, type=click.UUID, help='Test UUID')
+@click.pass_obj
+@auth_required
+def test_delete(obj, uid):
+
+    tst = obj['tests'].delete(uid)
+    click.echo("{}".format(tst))
+
+@test.command(name='attach_files')
+@click.option('--uid', prompt=True, type=click.UUID, help='Test UUID')
+@click.option('--fle_uid', multiple=True, type=click.UUID, help='File UUID')
+@click.pass_obj
+@auth_required
+def test_attach_files(obj, uid, fle_uid):
+
+    tst = obj['tests'].attach_files(uid, fle_uid)
+    click.echo("{}".format(tst))
+
+@test.command(name='detach_files')
+@click.option('--uid', prompt=True, type=click.UUID, help='Test UUID')
+@click.option('--fle_uid', multiple=True, type=click.UUID, help='File UUID')
+@click.pass_obj
+@auth_required
+def test_detach_files(obj, uid, fle_uid):
+
+    tst = obj['tests'].detach_files(uid, fle_uid)
+    click.echo("{}".format(tst))
+
+@test.command(name='attach_reporters')
+@click.option('--uid', prompt=True, type=click.UUID, help='Test UUID')
+@click.option('--rpt_uid', multiple=True, type=click.UUID, help='Reporter UUID')
+@click.pass_obj
+@auth_required
+def test_attach_reporters(obj, uid, rpt_uid):
+
+    tst = obj['tests'].attach_reporters(uid, rpt_uid)
+    click.echo("{}".format(tst))
+
+@test.command(name='detach_reporters')
+@click.option('--uid', prompt=True, type=click.UUID, help='Test UUID')
+@click.option('--rpt_uid', multiple=True, type=click.UUID, help='Reporter UUID')
+@click.pass_obj
+@auth_required
+def test_detach_reporters(obj, uid, rpt_uid):
+
+    tst = obj['tests'].detach_reporters(uid, rpt_uid)
+    click.echo("{}".format(tst))
@@ -0,0 +1,60 @@
+# COG CLI
+# User Commands
+
+import click
+
+from commands.common import auth_required, get_connection
+from commands.common import format_option, echo_uid_list
+
+
+@click.group()
+@click.pass_obj
+def user(obj):
+
+    # Setup Client Class
+    import api_client
+    obj['users'] = api_client.Users(get_connection(obj))
+
+@user.command(name='list')
+@format_option
+@click.pass_obj
+@auth_required
+def user_list(obj, fmt):
+
+    usr_list = obj['users'].list()
+    echo_uid_list(usr_list, fmt)
+
+@user.command(name='count')
+@click.pass_obj
+@auth_required
+def user_count(obj):
+
+    usr_list = obj['users'].list()
+    click.echo("{}".format(len(usr_list)))
+
+@user.command(name='show')
+@click.option('--uid', prompt=True, type=click.UUID, help='User UUID')
+@click.pass_obj
+@auth_required
+def user_show(obj, uid):
+
+    usr = obj['users'].show(uid)
+    click.echo("{}".format(usr))
+
+@user.command(name='uid_to_name')
+@click.argument('uid', type=click.UUID)
+@click.pass_obj
+@auth_required
+def user_uid_to_name(obj, uid):
+
+    name = obj['users'].uid_to_name(uid)
+    click.echo("{}".format(name))
+
+@user.command(name='name_to_uid')
+@click.argument('username', type=click.STRING)
+@click.pass_obj
+@auth_required
+def user_name_to_uid(obj, username):
+
+    uid = obj['users'].name_to_uid(username)
+    click.echo("{}".format(uid))
@@ -0,0 +1,1373 @@
+# COG CLI
+# Util Commands
+
+import os
+import os.path
+import time
+import uuid
+import hashlib
+import configparser
+
+import click
+
+import api_retry
+import api_watch
+import api_metrics
+import util_click
+import util_cli
+import util_manifest
+import util_dedupe
+
+from commands.common import _PATH_SERVER_CONF
+from commands.common import auth_required, get_connection, echo_transport_stats
+from commands.common import format_option
+from commands.common import async_obj_map, async_obj_fetch, async_obj_pipeline
+from commands.common import plan_fetch, plan_parents, echo_fetch_plan
+from commands.common import lists_to_set, objs_to_attr_set, drop_failed
+from commands.common import prefilter_not_in, postfilter_attr_owner, postfilter_attr_test
+from commands.common import derive_attr_owner
+
+
+_REGRADE_RATE = 10.0 #runs/sec
+_CLEANUP_WAVES = [['run'], ['sub', 'tst'], ['asn'], ['fle']] #delete order
+
+
+@click.group()
+@click.pass_obj
+def util(obj):
+
+    connection = get_connection(obj)
+
+    # Setup asyncio Client Class
+    if obj['aio']:
+        import api_client_aio
+        obj['files'] = api_client_aio.AioFiles(connection)
+        obj['assignments'] = api_client_aio.AioAssignments(connection)
+        obj['tests'] = api_client_aio.AioTests(connection)
+        obj['submissions'] = api_client_aio.AioSubmissions(connection)
+        obj['runs'] = api_client_aio.AioRuns(connection)
+        obj['users'] = api_client_aio.AioUsers(connection)
+        obj['reporters'] = api_client_aio.AioReporters(connection)
+        return
+
+    # Setup Client Class
+    import api_client
+    obj['files'] = api_client.AsyncFiles(connection)
+    obj['assignments'] = api_client.AsyncAssignments(connection)
+    obj['tests'] = api_client.AsyncTests(connection)
+    obj['submissions'] = api_client.AsyncSubmissions(connection)
+    obj['runs'] = api_client.AsyncRuns(connection)
+    obj['users'] = api_client.AsyncUsers(connection)
+    obj['reporters'] = api_client.AsyncReporters(connection)
+
+@util.command(name='save-config')
+@click.argument('name')
+@click.option('--conf_path', default=_PATH_SERVER_CONF, prompt=False,
+              type=click.Path(resolve_path=True),
+              help="Config Path ('{}')".format(_PATH_SERVER_CONF))
+@click.pass_obj
+@auth_required
+def util_save_config(obj, name, conf_path):
+
+    conf_obj = configparser.ConfigParser()
+
+    if os.path.isfile(conf_path):
+        click.echo("Reading existing '{}'".format(conf_path))
+        conf_obj.read(conf_path)
+
+    conf_dict = {}
+    conf_dict['url'] = obj['connection'].get_url()
+    conf_dict['user'] = obj['connection'].get_user()
+    conf_dict['token'] = obj['connection'].get_token()
+    click.echo("New config for '{}': {}".format(name, conf_dict))
+    conf_obj[name] = conf_dict
+
+    conf_dir = os.path.dirname(conf_path)
+    os.makedirs(conf_dir, exist_ok=True)
+    with open(conf_path, 'w') as conf_file:
+        click.echo("Writing new config to '{}'".format(conf_path))
+        conf_obj.write(conf_file)
+
+@util.command(name='submit')
+@click.option('--asn_uid', default=None, type=click.UUID, help='Assignment UUID')
+@click.option('--tst_uid', prompt=True, type=click.UUID, help='Test UUID')
+@click.option('--path', default=None, prompt=True,
+              type=click.Path(exists=True, readable=True, resolve_path=True),
+              help='Files to Upload Path')
+@click.option('--noextract', is_flag=True, help='Control whether file is extracted')
+@click.pass_obj
+@auth_required
+def util_submit(obj, asn_uid, tst_uid, path, noextract):
+
+    click.echo("Creating submission...")
+    sub_list = obj['submissions'].create(asn_uid)
+    click.echo("{}".format(sub_list))
+    sub_uid = sub_list[0]
+
+    click.echo("Uploading files...")
+    extract = not noextract
+    new_fle_list = obj['files'].create(path, extract)
+    click.echo("{}".format(new_fle_list))
+
+    click.echo("Attaching files...")
+    sub_fle_list = obj['submissions'].attach_files(sub_uid, new_fle_list)
+    click.echo("{}".format(sub_fle_list))
+
+    click.echo("Launching test run...")
+    run_list = obj['runs'].create(sub_uid, tst_uid)
+    click.echo("{}".format(run_list))
+    run_uid = run_list[0]
+
+    click.echo("Fetching run results...")
+    watcher = api_watch.RunWatcher(obj['runs'])
+    watcher.add(run_uid)
+    for ruid, run in watcher.watch(changes=True):
+        click.echo("status: {}".format(run['status']))
+    if run_uid in watcher.failed:
+        raise watcher.failed[run_uid]
+    click.echo("assignment: {}".format(run['assignment']))
+    click.echo("test: {}".format(run['test']))
+    click.echo("retcode: {}".format(run['retcode']))
+    click.echo("score: {}".format(run['score']))
+    click.echo("output:\n{}".format(run['output']))
+
+@util.command(name='watch-runs')
+@click.option('-r', '--run_uid', 'run_list',
+              multiple=True, type=click.UUID, help='Run UUID to watch')
+@click.option('-s', '--sub_uid', 'sub_list',
+              multiple=True, type=click.UUID, help='Watch all Runs of Submission UUID')
+@click.option('--timeout', default=None, type=click.FLOAT,
+              help='Give up after this many seconds (exits 1 if runs are still pending)')
+@click.option('--interval', default=api_watch._INTERVAL, type=click.FLOAT,
+              help='Initial seconds between polls of a run')
+@click.option('--interval_max', default=api_watch._INTERVAL_MAX, type=click.FLOAT,
+              help='Max seconds between polls of a run')
+@format_option
+@click.option('--show_timing', 'timing', is_flag=True,
+              help='Collect and show timing data')
+@click.pass_obj
+@auth_required
+def util_watch_runs(obj, run_list, sub_list, timeout, interval, interval_max, fmt, timing):
+
+    start = time.time()
+    watcher = api_watch.RunWatcher(obj['runs'], interval=interval, interval_max=interval_max)
+
+    with obj['connection']:
+
+        # Collect Runs
+        for ruid in run_list:
+            watcher.add(ruid)
+        if sub_list:
+            run_lsts, run_lsts_failed = async_obj_map(sub_list, obj['runs'].async_list_by_sub,
+                                                      label="Listing  Runs       ",
+                                                      timing=timing)
+            for suid, err in run_lsts_failed.items():
+                click.echo("Failed to list Runs for Sub '{}': {}".format(suid, str(err)), err=True)
+            for ruid in lists_to_set(run_lsts):
+                watcher.add(ruid)
+        total = len(watcher.pending())
+
+        # Report Completions as Observed
+        headings = ["Run", "Status", "Score", "Retcode", "Seconds"]
+        if fmt == 'table':
+            line = "{:36s}  {:20s}  {:>5s}  {:>7s}  {:>8s}"
+            click.echo(line.format(*headings))
+        else:
+            writer = util_click.RowWriter(fmt, headings)
+        for ruid, run in watcher.watch(timeout=timeout):
+            row = [str(ruid), run['status'], str(run['score']), str(run['retcode']),
+                   "{:.2f}".format(time.time() - start)]
+            if fmt == 'table':
+                click.echo(line.format(*row))
+            else:
+                writer.write(row)
+                writer.flush()
+
+    # Display Errors
+    for ruid, err in watcher.failed.items():
+        click.echo("Failed to get Run '{}': {}".format(ruid, str(err)), err=True)
+
+    # Display Transport Stats
+    pending = watcher.pending()
+    if timing:
+        dur = time.time() - start
+        click.echo("Runs: {} complete, {} failed, {} pending".format(
+            total - len(pending) - len(watcher.failed), len(watcher.failed), len(pending)), err=True)
+        click.echo("Polls: {} in {}".format(watcher.poll_count(),
+                                            util_cli.duration_to_str(dur)), err=True)
+        echo_transport_stats(obj['connection'])
+    if pending:
+        raise click.ClickException("Timed out with {} Runs pending".format(len(pending)))
+
+@util.command(name='regrade')
+@click.option('-a', '--asn_uid', 'asn_list', required=True,
+              multiple=True, type=click.UUID, help='Assignment UUID to regrade')
+@click.option('-t', '--tst_uid', 'tst_list',
+              multiple=True, type=click.UUID, help='Limit to Test UUID (default: all tests)')
+@click.option('-s', '--sub_uid', 'sub_list',
+              multiple=True, type=click.UUID, help='Limit to Submission UUID')
+@click.option('--rate', default=_REGRADE_RATE, type=click.FLOAT,
+              help='Max runs created per second (0 for no limit)')
+@click.option('--timeout', default=None, type=click.FLOAT,
+              help='Stop following runs after this many seconds')
+@click.option('--no_wait', is_flag=True, help='Create runs without following them')
+@click.option('--dry_run', is_flag=True, help='Count the runs that would be created, then exit')
+@click.option('--show_timing', 'timing', is_flag=True,
+              help='Collect and show timing data')
+@click.pass_obj
+@auth_required
+def util_regrade(obj, asn_list, tst_list, sub_list, rate, timeout, no_wait, dry_run, timing):
+
+    with obj['connection']:
+
+        # List Tests and Submissions
+        tst_lsts, tst_lsts_failed = async_obj_map(asn_list, obj['tests'].async_list_by_asn,
+                                                  label="Listing  Tests      ", timing=timing)
+        sub_lsts, sub_lsts_failed = async_obj_map(asn_list, obj['submissions'].async_list_by_asn,
+                                                  label="Listing  Submissions", timing=timing)
+        lsts_failed = list(tst_lsts_failed.items()) + list(sub_lsts_failed.items())
+        if lsts_failed:
+            auid, err = lsts_failed[0]
+            raise click.ClickException("Failed to list Asn '{}': {}".format(auid, str(err)))
+        missing = ((set(tst_list) - lists_to_set(tst_lsts)) |
+                   (set(sub_list) - lists_to_set(sub_lsts)))
+        if missing:
+            msg = "Tests/Submissions {} not found in {}".format(
+                [str(ouid) for ouid in missing], [str(auid) for auid in asn_list])
+            raise click.UsageError(msg)
+
+        # Pair Submissions x Tests per Assignment
+        pairs = []
+        for auid in asn_list:
+            tsts = [tuid for tuid in tst_lsts[auid] if not tst_list or tuid in tst_list]
+            subs = [suid for suid in sub_lsts[auid] if not sub_list or suid in sub_list]
+            pairs += [(suid, tuid) for suid in subs for tuid in tsts]
+        click.echo("Regrading: {} Runs".format(len(pairs)))
+        if dry_run:
+            return
+
+        # Create Runs at rate
+        limiter = api_retry.RateLimiter(rate) if rate else None
+        def async_create(pair):
+            if limiter:
+                limiter.acquire()
+            return obj['runs'].async_create(*pair)
+        start = time.time()
+        created, create_failed = async_obj_map(pairs, async_create,
+                                               label="Creating Runs       ", timing=timing)
+        for (suid, tuid), err in create_failed.items():
+            click.echo("Failed to create Run for Sub '{}', Test '{}': {}".format(
+                suid, tuid, str(err)), err=True)
+        run_uids = [ruid for ruids in created.values() for ruid in ruids]
+        if no_wait:
+            click.echo("Created: {} Runs".format(len(run_uids)))
+            return
+
+        # Follow Runs to Completion
+        watcher = api_watch.RunWatcher(obj['runs'])
+        for ruid in run_uids:
+            watcher.add(ruid)
+        started = {}
+        done = {}
+        with click.progressbar(label="Waiting  Runs       ", length=len(run_uids),
+                               file=click.get_text_stream('stderr')) as bar:
+            for ruid, run in watcher.watch(timeout=timeout, changes=True):
+                if api_watch.is_complete(run):
+                    done[ruid] = run
+                    bar.update(1)
+                elif ruid not in started and not api_watch.is_queued(run):
+                    started[ruid] = float(run['modified_time'])
+        dur = time.time() - start
+
+    # Display Errors
+    for ruid, err in watcher.failed.items():
+        click.echo("Failed to get Run '{}': {}".format(ruid, str(err)), err=True)
+
+    # Summarize (server timestamps, so poll intervals don't skew durations)
+    def echo_durs(label, durs, note=""):
+        durs = sorted(durs)
+        if not durs:
+            click.echo("{:12s} -{}".format(label, note))
+            return
+        click.echo("{:12s} p50 {:8.2f}s  p90 {:8.2f}s  max {:8.2f}s{}".format(
+            label, api_metrics.percentile(durs, 50), api_metrics.percentile(durs, 90),
+            durs[-1], note))
+    created_times = [float(run['created_time']) for run in done.values()]
+    finished_times = [float(run['modified_time']) for run in done.values()]
+    click.echo("Runs:        {} created, {} complete, {} failed, {} pending".format(
+        len(run_uids), len(done), len(watcher.failed) + len(create_failed),
+        len(watcher.pending())))
+    span = (max(finished_times) - min(created_times)) if done else 0.0
+    click.echo("Throughput:  {:.1f} runs/min over {} (wall {})".format(
+        (len(done) / span * 60) if span else 0.0, util_cli.duration_to_str(span),
+        util_cli.duration_to_str(dur)))
+    echo_durs("Queue wait:", [started[ruid] - float(run['created_time'])
+                              for ruid, run in done.items() if ruid in started],
+              "  ({} of {} seen running)".format(len(set(started) & set(done)), len(done)))
+    echo_durs("Execution:", [float(run['modified_time']) - started[ruid]
+                             for ruid, run in done.items() if ruid in started])
+    echo_durs("Turnaround:", [float(run['modified_time']) - float(run['created_time'])
+                              for run in done.values()])
+
+    # Display Transport Stats
+    if timing:
+        echo_transport_stats(obj['connection'])
+    if watcher.pending():
+        raise click.ClickException("Timed out with {} Runs pending".format(len(watcher.pending())))
+
+@util.command(name='replace-test-files')
+@click.option('--path', default=None, prompt=True,
+              type=click.Path(exists=True, readable=True, resolve_path=True),
+              help='Source Path')
+@click.option('--extract', is_flag=True, help='Control whether file is extracted')
+@click.option('--tst_uid', prompt=True, type=click.UUID, help='Test UUID')
+@click.pass_obj
+@auth_required
+def util_replace_test_files(obj, path, extract, tst_uid):
+
+    with obj['connection']:
+
+        # Start Upload, and List Old Files while it runs
+        click.echo("Creating new files...")
+        new_future = obj['files'].async_create(path, extract=extract)
+        click.echo("Listing old files...")
+        old_fle_list = obj['files'].async_list_by_tst(tst_uid).result()
+        click.echo("Old files:\n{}".format(old_fle_list))
+        try:
+            new_fle_list = new_future.result()
+        except Exception as e:
+            raise click.ClickException("Failed to create new files: {}".format(str(e)))
+        click.echo("New files:\n{}".format(new_fle_list))
+        # Never detach or delete a file that is also one of the new ones
+        old_fle_list = [fuid for fuid in old_fle_list if fuid not in new_fle_list]
+
+        # Swap Files: attach new before detaching old so the test is never empty
+        click.echo("Attaching files...")
+        tst_fle_list = obj['tests'].async_attach_files(tst_uid, new_fle_list).result()
+        if old_fle_list:
+            click.echo("Removing old files...")
+            tst_fle_list = obj['tests'].async_detach_files(tst_uid, old_fle_list).result()
+        else:
+            click.echo("No old files found")
+        click.echo("Attached files:\n{}".format(tst_fle_list))
+
+        # Delete Old Files
+        deleted, failed = async_obj_map(old_fle_list, obj['files'].async_delete,
+                                        label="Deleting Old Files  ")
+
+    for fle_uid, err in failed.items():
+        click.echo("Failed to delete file '{}': {}".format(fle_uid, str(err)), err=True)
+
+@util.command(name='duplicate-test')
+@click.option('--tst_uid', prompt=True, type=click.UUID, help='Test UUID')
+@click.pass_obj
+@auth_required
+def util_duplicate_test(obj, tst_uid):
+
+    click.echo("Getting original test...")
+    orig_tst_uid = tst_uid
+    orig_tst_obj = obj['tests'].show(orig_tst_uid)
+    click.echo("Found test:\n{}".format(orig_tst_obj))
+
+    click.echo("Creating new test...")
+    new_tst_list = obj['tests'].create(orig_tst_obj['assignment'], orig_tst_obj['name'],
+                                       orig_tst_obj['maxscore'], tester=orig_tst_obj['tester'],
+                                       builder=orig_tst_obj['builder'],
+                                       path_script=(orig_tst_obj['path_script'] if
+                                                    orig_tst_obj['path_script'] else None))
+    new_tst_uid = new_tst_list[0]
+    click.echo("Created test:\n{}".format(new_tst_uid))
+
+    click.echo("Getting original files...")
+    orig_fle_list = obj['files'].list(tst_uid=orig_tst_uid)
+    click.echo("Found files:\n{}".format(orig_fle_list))
+
+    click.echo("Attaching files to new test...")
+    new_fle_list = obj['tests'].attach_files(new_tst_uid, orig_fle_list)
+    click.echo("Attached files:\n{}".format(new_fle_list))
+
+@util.command(name='setup-assignment')
+@click.option('--asn_name', default=None, prompt=True, help='Assignment Name')
+@click.option('--env', default=None, prompt=True, help='Assignment Environment')
+@click.option('--tst_name', default=None, prompt=True, help='Test Name')
+@click.option('--maxscore', default=None, prompt=True, help='Max Score')
+@click.option('--tester', default='script', help='Test Module')
+@click.option('--path_script', default=None, help='Relative Path to Grading Script')
+@click.option('--path', default=None, prompt=True,
+              type=click.Path(exists=True, readable=True, resolve_path=True),
+              help='Source Path')
+@click.option('--extract', is_flag=True, help='Control whether file is extracted')
+@click.option('--activate', is_flag=True, help='Control whether or not to make assignment live')
+@click.option('--rptmod', default=None, help='Reporter Module')
+@click.option('--rptmod_opt', 'rptmod_opts', nargs=2, multiple=True, help='Key:Value Option')
+@click.pass_obj
+@auth_required
+def util_setup_assignment(obj, asn_name, env, tst_name, maxscore, tester,
+                          path_script, path, extract, activate,
+                          rptmod, rptmod_opts):
+
+    click.echo("Creating assignment...")
+    asn_list = obj['assignments'].create(asn_name, env=env)
+    click.echo("Created assignments:\n{}".format(asn_list))
+    asn_uid = asn_list[0]
+
+    click.echo("Creating test...")
+    tst_list = obj['tests'].create(asn_uid, tst_name, maxscore,
+                                   tester=tester, path_script=path_script)
+    click.echo("Created tests:\n{}".format(tst_list))
+    tst_uid = tst_list[0]
+
+    click.echo("Creating files...")
+    new_fle_list = obj['files'].create(path, extract, reuse=True)
+    click.echo("Created files:\n{}".format(new_fle_list))
+
+    click.echo("Attaching files...")
+    tst_fle_list = obj['tests'].attach_files(tst_uid, new_fle_list)
+    click.echo("Attached files:\n{}".format(tst_fle_list))
+
+    if rptmod:
+
+        rptmod_kwargs = dict(list(rptmod_opts))
+        click.echo("Creating reporter...")
+        new_rpt_list = obj['reporters'].create(rptmod, **rptmod_kwargs)
+        click.echo("Created reporters:\n{}".format(new_rpt_list))
+
+        click.echo("Attaching reporters...")
+        tst_rpt_list = obj['tests'].attach_reporters(tst_uid, new_rpt_list)
+        click.echo("Attached reporters:\n{}".format(tst_rpt_list))
+
+    if activate:
+
+        click.echo("Activating Assignment...")
+        obj['assignments'].update(asn_uid, accepting_runs=True, accepting_subs=True)
+        click.echo("Assignment Activated")
+
+@util.command(name='setup-assignment-test')
+@click.option('--asn_uid', prompt=True, type=click.UUID, help='Assignment UUID')
+@click.option('--tst_name', default=None, prompt=True, help='Test Name')
+@click.option('--maxscore', default=None, prompt=True, help='Max Score')
+@click.option('--tester', default='script', help='Test Module')
+@click.option('--path_script', default=None, help='Relative Path to Grading Script')
+@click.option('--path', default=None, prompt=True,
+              type=click.Path(exists=True, readable=True, resolve_path=True),
+              help='Source Path')
+@click.option('--extract', is_flag=True, help='Control whether file is extracted')
+@click.option('--rptmod', default=None, help='Reporter Module')
+@click.option('--rptmod_opt', 'rptmod_opts', nargs=2, multiple=True, help='Key:Value Option')
+@click.pass_obj
+@auth_required
+def util_setup_assignment_test(obj, asn_uid, tst_name, maxscore, tester,
+                               path_script, path, extract,
+                               rptmod, rptmod_opts):
+
+    click.echo("Creating test...")
+    tst_list = obj['tests'].create(asn_uid, tst_name, maxscore,
+                                   tester=tester, path_script=path_script)
+    click.echo("Created tests:\n{}".format(tst_list))
+    tst_uid = tst_list[0]
+
+    click.echo("Creating files...")
+    new_fle_list = obj['files'].create(path, extract, reuse=True)
+    click.echo("Created files:\n{}".format(new_fle_list))
+
+    click.echo("Attaching files...")
+    tst_fle_list = obj['tests'].attach_files(tst_uid, new_fle_list)
+    click.echo("Attached files:\n{}".format(tst_fle_list))
+
+    if rptmod:
+
+        rptmod_kwargs = dict(list(rptmod_opts))
+        click.echo("Creating reporter...")
+        new_rpt_list = obj['reporters'].create(rptmod, **rptmod_kwargs)
+        click.echo("Created reporters:\n{}".format(new_rpt_list))
+
+        click.echo("Attaching reporters...")
+        tst_rpt_list = obj['tests'].attach_reporters(tst_uid, new_rpt_list)
+        click.echo("Attached reporters:\n{}".format(tst_rpt_list))
+
+@util.command(name='upload-dir')
+@click.argument('src_dir',
+                type=click.Path(exists=True, file_okay=False, readable=True, resolve_path=True))
+@click.option('--tst_uid', default=None, type=click.UUID, help='Attach files to this Test')
+@click.option('--sub_uid', default=None, type=click.UUID, help='Attach files to this Submission')
+@click.option('--hidden', is_flag=True, help='Include hidden files and directories')
+@click.option('--retries', default=api_retry._UPLOAD_RETRIES, type=click.INT,
+              help='Retry failed uploads up to this many times')
+@click.option('--show_timing', 'timing', is_flag=True,
+              help='Collect and show timing data')
+@click.pass_obj
+@auth_required
+def util_upload_dir(obj, src_dir, tst_uid, sub_uid, hidden, retries, timing):
+
+    # Check Args
+    if (tst_uid is None) == (sub_uid is None):
+        raise click.UsageError("Exactly one of --tst_uid or --sub_uid required")
+
+    # Start Timing
+    if timing:
+        start = time.time()
+
+    # Walk Directory
+    paths = []
+    for dir_path, dir_names, file_names in os.walk(src_dir):
+        if not hidden:
+            dir_names[:] = [d for d in dir_names if not d.startswith('.')]
+            file_names = [f for f in file_names if not f.startswith('.')]
+        for file_name in sorted(file_names):
+            paths.append(os.path.join(dir_path, file_name))
+    if not paths:
+        click.echo("No files found in '{}'".format(src_dir))
+        return
+
+    # Async Upload Files
+    def async_fun(path):
+        name = os.path.relpath(path, src_dir)
+        return obj['files'].async_create_retry(path, name=name, retries=retries)
+    label="Uploading Files     "
+    with obj['connection']:
+        fle_lsts, paths_failed = async_obj_map(paths, async_fun,
+                                               label=label, timing=timing)
+    fle_uids = lists_to_set(fle_lsts)
+
+    # Attach Files
+    if fle_uids:
+        click.echo("Attaching {} files...".format(len(fle_uids)))
+        if tst_uid is not None:
+            obj['tests'].attach_files(tst_uid, fle_uids)
+        else:
+            obj['submissions'].attach_files(sub_uid, fle_uids)
+
+    # Display Errors:
+    for path, err in paths_failed.items():
+        rel_path = os.path.relpath(path, src_dir)
+        click.echo("Failed to upload '{}': {}".format(rel_path, str(err)), err=True)
+
+    # Display Stats:
+    click.echo("Uploaded:   {:6d} files".format(len(fle_lsts)))
+    click.echo("Failed:     {:6d} files".format(len(paths_failed)))
+
+    # Display Timing
+    if timing:
+        end = time.time()
+        dur = end - start
+        dur_str = "Duration:    {}".format(util_cli.duration_to_str(dur))
+        ops = len(paths)/dur
+        ops_str = "Files/sec:   {:11.2f}".format(ops)
+        click.echo(dur_str)
+        click.echo(ops_str)
+        echo_transport_stats(obj['connection'])
+
+@util.command(name='download-submissions')
+@click.argument('dest_dir',
+                type=click.Path(exists=True, writable=True,
+                                resolve_path=True, file_okay=False))
+@click.option('-a', '--asn_uid', 'asn_list',
+              multiple=True, type=click.UUID, help='Limit to Assignment UUID')
+@click.option('-s', '--sub_uid', 'sub_list',
+              multiple=True, type=click.UUID, help='Limit to Submission UUID')
+@click.option('-u', '--usr_uid', 'usr_uid_list',
+              multiple=True, type=click.UUID, help='Limit to User UUID')
+@click.option('--usr_name', 'usr_name_list',
+              multiple=True, type=click.STRING, help='Limit to User Name')
+@click.option('--full_uuid', is_flag=True,
+              help='Force use of full UUIDs in output')
+@click.option('--full_name', is_flag=True,
+              help='Display full names instead of usernames in output')
+@click.option('--show_timing', 'timing', is_flag=True,
+              help='Collect and show timing data')
+@click.option('--overwrite', is_flag=True,
+              help='Overwrite existing files (skipped by default)')
+@click.option('--pipeline', is_flag=True,
+              help='Stream each listing straight into its fetches instead of running stages in lock-step')
+@click.option('--sync', is_flag=True,
+              help="Only fetch submissions not yet recorded in dest_dir's sync manifest")
+@click.option('--dedupe', default=None, type=click.Choice(util_dedupe.MODES),
+              help="Keep one copy of identical files in dest_dir and link duplicates to it")
+@click.pass_obj
+@auth_required
+def util_download_submissions(obj, dest_dir, asn_list, sub_list,
+                              usr_uid_list, usr_name_list,
+                              full_uuid, full_name, timing, overwrite, pipeline, sync,
+                              dedupe):
+
+    # Start Timing
+    if timing:
+        start = time.time()
+
+    # Load Sync Manifest
+    if sync:
+        manifest_path = os.path.join(dest_dir, util_manifest.MANIFEST_NAME)
+        manifest = util_manifest.SyncManifest(manifest_path)
+        synced_info = manifest.synced_info()
+        synced_files = manifest.synced_files()
+    else:
+        synced_info = {}
+        synced_files = {}
+    synced_set = set(synced_info.keys())
+
+    # Make Async Calls
+    with obj['connection']:
+
+        # Convert usernames to UIDs
+        if usr_name_list:
+            usr_uids, usr_uids_failed = async_obj_map(usr_name_list, obj['users'].async_name_to_uid,
+                                                      label="Getting  User UIDs  ", timing=timing)
+        usr_uid_list = list(usr_uid_list)
+        usr_uid_list += [usr_uids[name] for name in usr_name_list]
+
+        # Synced Submissions in Scope (rechecked for new files below)
+        sync_todo = [suid for suid, (auid, usid, path) in synced_info.items()
+                     if (not asn_list or auid in asn_list) and
+                     (not sub_list or suid in sub_list) and
+                     (not usr_uid_list or usid in usr_uid_list)]
+
+        sub_pre_failed = {}
+        if pipeline:
+
+            # Stream Assignments -> Submissions -> Files + Users
+            stages = [{'name': 'asn', 'obj_name': "Assignments",
+                       'iter_parent': [None],
+                       'async_list': obj['assignments'].async_list_by_null,
+                       'async_show': obj['assignments'].async_show,
+                       'prefilter_list': asn_list},
+                      {'name': 'sub', 'obj_name': "Submissions", 'parent': 'asn',
+                       'async_list': obj['submissions'].async_list_by_asn,
+                       'async_show': obj['submissions'].async_show,
+                       'prefilter_list': sub_list,
+                       'prefilter_func': prefilter_not_in,
+                       'prefilter_func_args': [synced_set],
+                       'postfilter_func': postfilter_attr_owner,
+                       'postfilter_func_args': [usr_uid_list]},
+                      {'name': 'fle', 'obj_name': "Files      ", 'parent': 'sub',
+                       'async_list': obj['files'].async_list_by_sub,
+                       'async_show': obj['files'].async_show},
+                      {'name': 'usr', 'obj_name': "Users      ", 'parent': 'sub',
+                       'derive_func': derive_attr_owner,
+                       'async_show': obj['users'].async_show}]
+            res = async_obj_pipeline(stages, timing=timing)
+            asn_lsts, asn_set, asn_objs, asn_lsts_failed, asn_objs_failed = res['asn']
+            sub_lsts, sub_set, sub_objs, sub_lsts_failed, sub_objs_failed = res['sub']
+            fle_lsts, fle_set, fle_objs, fle_lsts_failed, fle_objs_failed = res['fle']
+            usr_lsts, usr_set, usr_objs, usr_lsts_failed, usr_objs_failed = res['usr']
+
+        else:
+
+            # Derive Parents of Named Submissions (dropping synced and failed ones)
+            sub_pre = {}
+            resolved = True
+            if sub_list and not asn_list:
+                sub_todo = [suid for suid in sub_list if suid not in synced_set]
+                sub_pre, sub_pre_failed = async_obj_map(sub_todo, obj['submissions'].async_show,
+                                                        label="Planning Submissions",
+                                                        timing=timing)
+                sub_list = drop_failed(sub_todo, sub_pre_failed)
+                asn_list = objs_to_attr_set(sub_pre, 'assignment')
+                resolved = bool(sub_list)
+
+            # Fetch Assignments (none if no named submission resolved, never all)
+            if resolved:
+                tup = async_obj_fetch([None], obj_name="Assignments", timing=timing,
+                                      async_list=obj['assignments'].async_list_by_null,
+                                      async_show=obj['assignments'].async_show,
+                                      prefilter_list=asn_list)
+            else:
+                tup = ({}, set(), {}, {}, {})
+            asn_lsts, asn_set, asn_objs, asn_lsts_failed, asn_objs_failed = tup
+
+            # Fetch Submissions
+            tup = async_obj_fetch(asn_objs.keys(), obj_name="Submissions", timing=timing,
+                                  async_list=obj['submissions'].async_list_by_asn,
+                                  async_show=obj['submissions'].async_show,
+                                  prefilter_list=sub_list,
+                                  prefilter_func=prefilter_not_in,
+                                  prefilter_func_args=[synced_set],
+                                  postfilter_func=postfilter_attr_owner,
+                                  postfilter_func_args=[usr_uid_list],
+                                  parent_attr='assignment', prefetched=sub_pre)
+            sub_lsts, sub_set, sub_objs, sub_lsts_failed, sub_objs_failed = tup
+
+            # Fetch Files
+            tup = async_obj_fetch(sub_objs.keys(), obj_name="Files      ", timing=timing,
+                                  async_list=obj['files'].async_list_by_sub,
+                                  async_show=obj['files'].async_show)
+            fle_lsts, fle_set, fle_objs, fle_lsts_failed, fle_objs_failed = tup
+
+            # Fetch Users
+            usr_set = set()
+            for sub in sub_objs.values():
+                usr_set.add(uuid.UUID(sub["owner"]))
+            usr_objs, usr_objs_failed = async_obj_map(usr_set, obj['users'].async_show,
+                                                      label="Getting  Users      ", timing=timing)
+
+        # Check Synced Submissions for Files Not in the Manifest
+        sync_new = {}
+        sync_lsts_failed = {}
+        if sync_todo:
+            sync_lsts, sync_lsts_failed = async_obj_map(sync_todo, obj['files'].async_list_by_sub,
+                                                        label="Checking Synced Subs",
+                                                        timing=timing)
+            for suid, fle_list in sync_lsts.items():
+                new_list = [fuid for fuid in fle_list if fuid not in synced_files.get(suid, set())]
+                if new_list:
+                    sync_new[suid] = new_list
+            new_objs, new_objs_failed = async_obj_map(lists_to_set(sync_new),
+                                                      obj['files'].async_show,
+                                                      label="Getting  New Files  ",
+                                                      timing=timing)
+            fle_lsts_failed.update(sync_lsts_failed)
+            fle_objs.update(new_objs)
+            fle_objs_failed.update(new_objs_failed)
+
+        # Build File Lists
+        paths_map = {}
+        sub_paths = {}
+        sub_dirs = {}
+        def add_paths(suid, sub_path, fle_list):
+            for fuid in fle_list:
+                if fuid not in fle_objs:
+                    continue
+                rel_path = fle_objs[fuid]["name"]
+                rel_path = util_cli.clean_path(rel_path)
+                rel_path = util_cli.secure_path(rel_path)
+                fle_path = os.path.join(sub_path, rel_path)
+                paths_map[fle_path] = fuid
+                sub_paths.setdefault(suid, []).append(fle_path)
+
+        for suid, fle_list in fle_lsts.items():
+
+            sub = sub_objs[suid]
+            usid = uuid.UUID(sub_objs[suid]['owner'])
+            usr = usr_objs[usid]
+            auid = uuid.UUID(sub_objs[suid]['assignment'])
+            asn = asn_objs[auid]
+
+            if full_uuid:
+                sub_str = "sub_{}".format(str(suid))
+                usr_str = "usr_{}".format(str(usid))
+                asn_str = "asn_{}".format(str(auid))
+            else:
+                date = time.localtime(float(sub["created_time"]))
+                date_str = time.strftime("%y%m%d_%H%M%S", date)
+                sub_str = "sub_{}_{:012x}".format(date_str, suid.node)
+                if full_name:
+                    full_nme = "".join("{}_{}".format(usr['last'], usr['first']).split())
+                    usr_str = "usr_{}_{:012x}".format(full_nme, usid.node)
+                else:
+                    user_nme = "".join(usr['username'].split())
+                    usr_str = "usr_{}".format(user_nme)
+                asgn_nme = "".join(asn['name'].split())
+                asn_str = "asn_{}_{:012x}".format(asgn_nme, auid.node)
+
+            sub_path = os.path.join(dest_dir, asn_str, usr_str, sub_str)
+            os.makedirs(sub_path, exist_ok=True)
+            sub_dirs[suid] = sub_path
+            add_paths(suid, sub_path, fle_list)
+
+        # New files of synced submissions go to their recorded directory
+        for suid, fle_list in sync_new.items():
+            sub_path = os.path.join(dest_dir, synced_info[suid][2])
+            os.makedirs(sub_path, exist_ok=True)
+            add_paths(suid, sub_path, fle_list)
+
+        paths_set = set(paths_map.keys())
+
+        # Async Download Files (hashing each new file as it streams when deduping)
+        hashers = {}
+        def async_fun(path, paths_map):
+            fuid = paths_map[path]
+            hasher = None
+            if dedupe and (overwrite or not os.path.exists(path)):
+                hasher = hashers[path] = hashlib.sha256()
+            return obj['files'].async_direct_download(fuid, path, overwrite=overwrite,
+                                                      hasher=hasher)
+        label="Downloading Files   "
+        paths_out, paths_failed = async_obj_map(paths_set, async_fun,
+                                                label=label, timing=timing,
+                                                async_func_args=[paths_map])
+
+    # Link Duplicate Files
+    digests = {}
+    if dedupe:
+        store = util_dedupe.ContentStore(dest_dir, mode=dedupe)
+        for path in sorted(paths_out):
+            if path not in hashers:
+                continue
+            digests[path] = hashers[path].hexdigest()
+            try:
+                store.add(path, digests[path])
+            except OSError as err:
+                click.echo("Failed to dedupe '{}': {}".format(os.path.basename(path), str(err)),
+                           err=True)
+        if store.error is not None:
+            click.echo("Failed to link some duplicates: {}".format(str(store.error)), err=True)
+
+    # Update Sync Manifest
+    if sync:
+        synced_cnt = 0
+        for suid, fle_list in fle_lsts.items():
+            paths = sub_paths.get(suid, [])
+            if all(path in paths_out for path in paths):
+                for path in paths:
+                    manifest.add_file(paths_map[path], suid, path, sha256=digests.get(path))
+                sub = sub_objs[suid]
+                manifest.mark_synced(suid, sub['assignment'], sub['owner'],
+                                     os.path.relpath(sub_dirs[suid], dest_dir))
+                synced_cnt += 1
+
+        # Synced submissions: record each new file that arrived
+        updated_cnt = 0
+        for suid, fle_list in sync_new.items():
+            paths = sub_paths.get(suid, [])
+            for path in paths:
+                if path in paths_out:
+                    manifest.add_file(paths_map[path], suid, path, sha256=digests.get(path))
+            if len(paths) == len(fle_list) and all(path in paths_out for path in paths):
+                updated_cnt += 1
+        skipped_cnt = len(sync_todo) - len(sync_new) - len(sync_lsts_failed)
+        manifest.commit()
+        manifest.close()
+
+    # Display Errors:
+    for suid, err in sub_pre_failed.items():
+        click.echo("Failed to get Submission '{}': {}".format(suid, str(err)))
+    for puid, err in asn_lsts_failed.items():
+        click.echo("Failed to list Assignments: {}".format(str(err)))
+    for auid, err in asn_objs_failed.items():
+        click.echo("Failed to get Assignment '{}': {}".format(auid, str(err)))
+    for auid, err in sub_lsts_failed.items():
+        click.echo("Failed to list Subs for Asn '{}': {}".format(auid, str(err)))
+    for suid, err in sub_objs_failed.items():
+        click.echo("Failed to get Submission '{}': {}".format(suid, str(err)))
+    for suid, err in fle_lsts_failed.items():
+        click.echo("Failed to list Files for Sub '{}': {}".format(suid, str(err)))
+    for fuid, err in fle_objs_failed.items():
+        click.echo("Failed to get File '{}': {}".format(fuid, str(err)))
+    for path, err in paths_failed.items():
+        basename = os.path.basename(path)
+        click.echo("Failed to download '{}': {}".format(basename, str(err)))
+
+    # Display Stats:
+    click.echo("Downloaded: {:6d} files".format(len(paths_out)))
+    click.echo("Failed:     {:6d} files".format(len(paths_failed)))
+    if sync:
+        click.echo("Skipped:    {:6d} previously synced submissions".format(skipped_cnt))
+        click.echo("Synced:     {:6d} new submissions".format(synced_cnt))
+        click.echo("Updated:    {:6d} synced submissions with new files".format(updated_cnt))
+    if dedupe:
+        click.echo("Linked:     {:6d} duplicate files".format(store.linked))
+        click.echo("Saved:      {:6.1f} of {:.1f} MiB".format(store.bytes_saved / 2**20,
+                                                           store.bytes_total / 2**20))
+    if timing:
+        end = time.time()
+        dur = end - start
+        dur_str = "Duration:    {}".format(util_cli.duration_to_str(dur))
+        ops = len(paths_set)/dur
+        ops_str = "Files/sec:   {:11.2f}".format(ops)
+        click.echo(dur_str)
+        click.echo(ops_str)
+        echo_transport_stats(obj['connection'])
+
+@util.command(name='show-results')
+@click.option('-a', '--asn_uid', 'asn_list',
+              multiple=True, type=click.UUID, help='Limit to Assignment UUID')
+@click.option('-t', '--tst_uid', 'tst_list',
+              multiple=True, type=click.UUID, help='Limit to Test UUID')
+@click.option('-s', '--sub_uid', 'sub_list',
+              multiple=True, type=click.UUID, help='Limit to Submission UUID')
+@click.option('-r', '--run_uid', 'run_list',
+              multiple=True, type=click.UUID, help='Limit to Run UUID')
+@click.option('-u', '--usr_uid', 'usr_uid_list',
+              multiple=True, type=click.UUID, help='Limit to User UUID')
+@click.option('--usr_name', 'usr_name_list',
+              multiple=True, type=click.STRING, help='Limit to User Name')
+@click.option('--sort_by', default=None,
+              type=click.Choice(['User', 'Assignment', 'Test', 'Submission',
+                                 'Run', 'Date', 'Status', 'Score']),
+              help='Coulumn to sort data by')
+@click.option('--line_limit', default=None, type=click.INT,
+              help='Limit output to line length')
+@click.option('--pager', is_flag=True, help='Page table output')
+@format_option
+@click.option('--full_uuid', is_flag=True,
+              help='Force use of full UUIDs in output')
+@click.option('--full_name', is_flag=True,
+              help='Display full names instead of usernames in output')
+@click.option('--show_timing', 'timing', is_flag=True,
+              help='Collect and show timing data')
+@click.option('--no_usr', is_flag=True,
+              help='Disable display of User column')
+@click.option('--no_asn', is_flag=True,
+              help='Disable display of Assignment column')
+@click.option('--no_tst', is_flag=True,
+              help='Disable display of Test column')
+@click.option('--no_sub', is_flag=True,
+              help='Disable display of Sub column')
+@click.option('--no_date', is_flag=True,
+              help='Disable display of Date column')
+@click.option('--no_status', is_flag=True,
+              help='Disbale display of Status column')
+@click.option('--no_score', is_flag=True,
+              help='Control whether to display Score Column')
+@click.option('--pipeline', is_flag=True,
+              help='Stream each listing straight into its fetches instead of running stages in lock-step')
+@click.option('--explain', is_flag=True,
+              help='Print the planned fetches and request counts, then exit')
+@click.pass_obj
+@auth_required
+def util_show_results(obj, asn_list, tst_list, sub_list, run_list,
+                      usr_uid_list, usr_name_list,
+                      sort_by, line_limit, pager, fmt, full_uuid, full_name, timing,
+                      no_usr, no_asn, no_tst, no_sub,
+                      no_date, no_status, no_score, pipeline, explain):
+
+    # Table Objects
+    headings = ["Run"]
+    if not no_date:
+        headings.append("Date")
+    if not no_usr:
+        headings.append("User")
+    if not no_asn:
+        headings.append("Assignment")
+    if not no_tst:
+        headings.append("Test")
+    if not no_sub:
+        headings.append("Submission")
+    if not no_status:
+        headings.append("Status")
+    if not no_score:
+        headings.append("Score")
+    stream = (fmt != 'table')
+    if stream and sort_by is not None:
+        raise click.UsageError("--sort_by requires '--format table'")
+    if sort_by is None:
+        if not no_date:
+            sort_by = "Date"
+        else:
+            sort_by = "Run"
+    table = []
+
+    # Table Rows (objects are looked up once fetched below)
+    def build_row(ruid, run, usr):
+        """ Return the display row for run """
+
+        # Get Objects
+        usid = uuid.UUID(run["owner"])
+        suid = uuid.UUID(run["submission"])
+        sub = sub_objs[suid]
+        tuid = uuid.UUID(run["test"])
+        tst = tst_objs[tuid]
+        auid = uuid.UUID(sub["assignment"])
+        asn = asn_objs[auid]
+
+        # Display Objects
+        if full_uuid:
+            usr_str = str(usid)
+            asn_str = str(auid)
+            tst_str = str(tuid)
+            sub_str = str(suid)
+            run_str = str(ruid)
+        else:
+            if full_name:
+                usr_str = "{}, {}".format(usr["last"], usr["first"])
+            else:
+                usr_str = usr["username"]
+            asn_str = asn["name"]
+            tst_str = tst["name"]
+            sub_str = "{:012X}".format(suid.node)
+            run_str = "{:012X}".format(ruid.node)
+
+        # Display Date
+        date = time.localtime(float(run["created_time"]))
+        date_str = time.strftime("%m/%d/%y %H:%M:%S", date)
+
+        # Display Results
+        stat_str = run["status"]
+        score_str = run["score"]
+
+        # Add row
+        row = [run_str]
+        if not no_date:
+            row.append(date_str)
+        if not no_usr:
+            row.append(usr_str)
+        if not no_asn:
+            row.append(asn_str)
+        if not no_tst:
+            row.append(tst_str)
+        if not no_sub:
+            row.append(sub_str)
+        if not no_status:
+            row.append(stat_str)
+        if not no_score:
+            row.append(score_str)
+        return row
+
+    # Plan: derive missing parents from the objects named on the command line
+    derive_sub = bool(run_list) and not sub_list
+    derive_asn = bool(sub_list or derive_sub or tst_list) and not asn_list
+    if explain:
+        asn_max = len(tst_list) + (len(sub_list) if sub_list else len(run_list))
+        asn_plan = plan_fetch("Assignments", named=asn_list,
+                              derived_from=("Subs/Tests" if derive_asn else None),
+                              derived_max=asn_max, parents="1")
+        tst_plan = plan_fetch("Tests      ", named=tst_list,
+                              parents=plan_parents(asn_plan), parent_name="Assignment")
+        sub_plan = plan_fetch("Submissions", named=sub_list,
+                              derived_from=("Runs" if derive_sub else None),
+                              derived_max=len(run_list),
+                              parents=plan_parents(asn_plan), parent_name="Assignment")
+        run_plan = plan_fetch("Runs       ", named=run_list,
+                              parents=plan_parents(sub_plan), parent_name="Submission")
+        usr_plan = plan_fetch("Users      ", derived_from="Runs")
+        echo_fetch_plan([asn_plan, tst_plan, sub_plan, run_plan, usr_plan])
+        return
+
+    # Make Async Calls
+    with obj['connection']:
+
+        # Convert usernames to UIDs
+        if usr_name_list:
+            usr_uids, usr_uids_failed = async_obj_map(usr_name_list, obj['users'].async_name_to_uid,
+                                                      label="Getting  User UIDs  ", timing=timing)
+        usr_uid_list = list(usr_uid_list)
+        usr_uid_list += [usr_uids[name] for name in usr_name_list]
+
+        run_pre = {}
+        run_pre_failed = {}
+        sub_pre_failed = {}
+        tst_pre_failed = {}
+        if pipeline:
+
+            # Stream Assignments -> Tests + Submissions -> Runs -> Users
+            stages = [{'name': 'asn', 'obj_name': "Assignments",
+                       'iter_parent': [None],
+                       'async_list': obj['assignments'].async_list_by_null,
+                       'async_show': obj['assignments'].async_show,
+                       'prefilter_list': asn_list},
+                      {'name': 'tst', 'obj_name': "Tests      ", 'parent': 'asn',
+                       'async_list': obj['tests'].async_list_by_asn,
+                       'async_show': obj['tests'].async_show,
+                       'prefilter_list': tst_list},
+                      {'name': 'sub', 'obj_name': "Submissions", 'parent': 'asn',
+                       'async_list': obj['submissions'].async_list_by_asn,
+                       'async_show': obj['submissions'].async_show,
+                       'prefilter_list': sub_list,
+                       'postfilter_func': postfilter_attr_owner,
+                       'postfilter_func_args': [usr_uid_list]},
+                      {'name': 'run', 'obj_name': "Runs       ", 'parent': 'sub',
+                       'async_list': obj['runs'].async_list_by_sub,
+                       'async_show': obj['runs'].async_show,
+                       'prefilter_list': run_list,
+                       'postfilter_func': postfilter_attr_test,
+                       'postfilter_func_args': [tst_list]},
+                      {'name': 'usr', 'obj_name': "Users      ", 'parent': 'run',
+                       'derive_func': derive_attr_owner,
+                       'async_show': obj['users'].async_show}]
+            if stream:
+                stages = stages[:3]
+            res = async_obj_pipeline(stages, timing=timing)
+            asn_lsts, asn_set, asn_objs, asn_lsts_failed, asn_objs_failed = res['asn']
+            tst_lsts, tst_set, tst_objs, tst_lsts_failed, tst_objs_failed = res['tst']
+            sub_lsts, sub_set, sub_objs, sub_lsts_failed, sub_objs_failed = res['sub']
+            if not stream:
+                run_lsts, run_set, run_objs, run_lsts_failed, run_objs_failed = res['run']
+                usr_lsts, usr_set, usr_objs, usr_lsts_failed, usr_objs_failed = res['usr']
+
+        else:
+
+            # Derive Parents of Named Objects (dropping any that fail to show)
+            resolved = True
+            if derive_sub:
+                run_pre, run_pre_failed = async_obj_map(run_list, obj['runs'].async_show,
+                                                        label="Planning Runs       ",
+                                                        timing=timing)
+                run_list = drop_failed(run_list, run_pre_failed)
+                sub_list = objs_to_attr_set(run_pre, 'submission')
+                resolved = bool(run_list)
+            sub_pre = {}
+            tst_pre = {}
+            if derive_asn and resolved:
+                sub_pre, sub_pre_failed = async_obj_map(sub_list, obj['submissions'].async_show,
+                                                        label="Planning Submissions",
+                                                        timing=timing)
+                tst_pre, tst_pre_failed = async_obj_map(tst_list, obj['tests'].async_show,
+                                                        label="Planning Tests      ",
+                                                        timing=timing)
+                resolved = ((bool(sub_pre) or not sub_list) and
+                            (bool(tst_pre) or not tst_list))
+                sub_list = drop_failed(sub_list, sub_pre_failed)
+                tst_list = drop_failed(tst_list, tst_pre_failed)
+                asn_list = (objs_to_attr_set(sub_pre, 'assignment') |
+                            objs_to_attr_set(tst_pre, 'assignment'))
+
+            # Fetch Assignments (none if no named object resolved, never all)
+            if resolved:
+                tup = async_obj_fetch([None], obj_name="Assignments", timing=timing,
+                                      async_list=obj['assignments'].async_list_by_null,
+                                      async_show=obj['assignments'].async_show,
+                                      prefilter_list=asn_list)
+            else:
+                tup = ({}, set(), {}, {}, {})
+            asn_lsts, asn_set, asn_objs, asn_lsts_failed, asn_objs_failed = tup
+
+            # Fetch Tests
+            tup = async_obj_fetch(asn_objs.keys(), obj_name="Tests      ", timing=timing,
+                                  async_list=obj['tests'].async_list_by_asn,
+                                  async_show=obj['tests'].async_show,
+                                  prefilter_list=tst_list,
+                                  parent_attr='assignment', prefetched=tst_pre)
+            tst_lsts, tst_set, tst_objs, tst_lsts_failed, tst_objs_failed = tup
+
+            # Fetch Submissions
+            tup = async_obj_fetch(asn_objs.keys(), obj_name="Submissions", timing=timing,
+                                  async_list=obj['submissions'].async_list_by_asn,
+                                  async_show=obj['submissions'].async_show,
+                                  prefilter_list=sub_list,
+                                  postfilter_func=postfilter_attr_owner,
+                                  postfilter_func_args=[usr_uid_list],
+                                  parent_attr='assignment', prefetched=sub_pre)
+            sub_lsts, sub_set, sub_objs, sub_lsts_failed, sub_objs_failed = tup
+
+        if stream:
+
+            # Fetch Users (submission owners up front, any others on demand)
+            usr_set = objs_to_attr_set(sub_objs, 'owner')
+            usr_objs, usr_objs_failed = async_obj_map(usr_set, obj['users'].async_show,
+                                                      label="Getting  Users      ", timing=timing)
+
+            # Write each Run as it arrives instead of collecting them
+            writer = util_click.RowWriter(fmt, headings)
+            def write_run(ruid, run):
+                if uuid.UUID(run["submission"]) not in sub_objs:
+                    return
+                if not postfilter_attr_test(ruid, run, tst_list):
+                    return
+                usid = uuid.UUID(run["owner"])
+                if usid not in usr_objs:
+                    usr_objs[usid] = obj['users'].async_show(usid).result()
+                writer.write(build_row(ruid, run, usr_objs[usid]))
+
+            # Stream Runs
+            if not sub_objs:
+                run_set = set()
+                run_lsts_failed = {}
+            elif run_list:
+                run_set = set(run_list)
+                run_lsts_failed = {}
+            else:
+                run_lsts, run_lsts_failed = async_obj_map(sub_objs.keys(),
+                                                          obj['runs'].async_list_by_sub,
+                                                          label="Listing  Runs       ",
+                                                          timing=timing)
+                run_set = lists_to_set(run_lsts)
+            for ruid in run_set & set(run_pre.keys()):
+                write_run(ruid, run_pre[ruid])
+            run_objs, run_objs_failed = async_obj_map(run_set - set(run_pre.keys()),
+                                                      obj['runs'].async_show,
+                                                      label="Getting  Runs       ",
+                                                      timing=timing, sink=write_run)
+            writer.flush()
+
+        elif not pipeline:
+
+            # Fetch Runs
+            tup = async_obj_fetch(sub_objs.keys(), obj_name="Runs       ", timing=timing,
+                                  async_list=obj['runs'].async_list_by_sub,
+                                  async_show=obj['runs'].async_show,
+                                  prefilter_list=run_list,
+                                  postfilter_func=postfilter_attr_test,
+                                  postfilter_func_args=[tst_list],
+                                  parent_attr='submission', prefetched=run_pre)
+            run_lsts, run_set, run_objs, run_lsts_failed, run_objs_failed = tup
+
+            # Fetch Users
+            usr_set = set()
+            for run in run_objs.values():
+                usr_set.add(uuid.UUID(run["owner"]))
+            usr_objs, usr_objs_failed = async_obj_map(usr_set, obj['users'].async_show,
+                                                      label="Getting  Users      ", timing=timing)
+
+    # Build Table Rows
+    if not stream:
+        for ruid, run in run_objs.items():
+            table.append(build_row(ruid, run, usr_objs[uuid.UUID(run["owner"])]))
+
+    # Display Errors:
+    for ruid, err in run_pre_failed.items():
+        click.echo("Failed to get Run '{}': {}".format(ruid, str(err)), err=True)
+    for suid, err in sub_pre_failed.items():
+        click.echo("Failed to get Submission '{}': {}".format(suid, str(err)), err=True)
+    for tuid, err in tst_pre_failed.items():
+        click.echo("Failed to get Test '{}': {}".format(tuid, str(err)), err=True)
+    for puid, err in asn_lsts_failed.items():
+        click.echo("Failed to list Assignments: {}".format(str(err)), err=True)
+    for auid, err in asn_objs_failed.items():
+        click.echo("Failed to get Assignment '{}': {}".format(auid, str(err)), err=True)
+    for auid, err in tst_lsts_failed.items():
+        click.echo("Failed to list Tests for Asn '{}': {}".format(auid, str(err)), err=True)
+    for tuid, err in tst_objs_failed.items():
+        click.echo("Failed to get Test '{}': {}".format(tuid, str(err)), err=True)
+    for auid, err in sub_lsts_failed.items():
+        click.echo("Failed to list Subs for Asn '{}': {}".format(auid, str(err)), err=True)
+    for suid, err in sub_objs_failed.items():
+        click.echo("Failed to get Submission '{}': {}".format(suid, str(err)), err=True)
+    for suid, err in run_lsts_failed.items():
+        click.echo("Failed to list Runs for Sub '{}': {}".format(suid, str(err)), err=True)
+    for ruid, err in run_objs_failed.items():
+        click.echo("Failed to get Run '{}': {}".format(ruid, str(err)), err=True)
+
+    # Display Table
+    if not stream:
+        util_click.echo_table(table, headings=headings,
+                              line_limit=line_limit, sort_by=sort_by, pager=pager)
+
+    # Display Transport Stats
+    if timing:
+        echo_transport_stats(obj['connection'])
+
+@util.command(name='cleanup')
+@click.option('--all', 'cleanup_all', is_flag=True,
+              help='Delete All Objects')
+@click.option('--show_timing', 'timing', is_flag=True,
+              help='Collect and show timing data')
+@click.option('--dry_run', is_flag=True,
+              help='List objects and show the delete plan, then exit')
+@click.option('--assignments', 'cleanup_asn', is_flag=True,
+              help='Delete Assigments')
+@click.option('-a', '--asn_uid', 'asn_list',
+              multiple=True, type=click.UUID, help='Limit to Assignment UUID')
+@click.option('--tests', 'cleanup_tst', is_flag=True,
+              help='Delete Tests')
+@click.option('-t', '--tst_uid', 'tst_list',
+              multiple=True, type=click.UUID, help='Limit to Test UUID')
+@click.option('--submissions', 'cleanup_sub', is_flag=True,
+              help='Delete Submissions')
+@click.option('-s', '--sub_uid', 'sub_list',
+              multiple=True, type=click.UUID, help='Limit to Submission UUID')
+@click.option('--runs', 'cleanup_run', is_flag=True,
+              help='Delete Runs')
+@click.option('-r', '--run_uid', 'run_list',
+              multiple=True, type=click.UUID, help='Limit to Run UUID')
+@click.option('--files', 'cleanup_fle', is_flag=True,
+              help='Delete Files')
+@click.option('-f', '--file_uid', 'fle_list',
+              multiple=True, type=click.UUID, help='Limit to File UUID')
+@click.pass_obj
+@auth_required
+def util_cleanup(obj, cleanup_all, timing, dry_run,
+                 cleanup_asn, asn_list, cleanup_tst, tst_list,
+                 cleanup_sub, sub_list, cleanup_run, run_list,
+                 cleanup_fle, fle_list):
+
+    # Setup Plan: (key, name, client, selected, named)
+    kinds = [('run', "Runs",        obj['runs'],        cleanup_run, run_list),
+             ('fle', "Files",       obj['files'],       cleanup_fle, fle_list),
+             ('sub', "Submissions", obj['submissions'], cleanup_sub, sub_list),
+             ('tst', "Tests",       obj['tests'],       cleanup_tst, tst_list),
+             ('asn', "Assignments", obj['assignments'], cleanup_asn, asn_list)]
+    kinds = [kind for kind in kinds if kind[3] or cleanup_all]
+    names = {key: name for key, name, client, selected, named in kinds}
+    clients = {key: client for key, name, client, selected, named in kinds}
+
+    with obj['connection']:
+
+        # List Objects (named objects are deleted as given, without a list or show)
+        to_list = [key for key, name, client, selected, named in kinds if not named]
+        lsts, lsts_failed = async_obj_map(to_list, lambda key: clients[key].async_list_by_null(None),
+                                          label="Listing  Objects    ", timing=timing)
+        todo = {}
+        for key, name, client, selected, named in kinds:
+            todo[key] = set(named) if named else set(lsts.get(key, []))
+
+        # Plan Detaches: files still attached to Tests or Submissions that are
+        # not all being deleted are detached before anything is deleted
+        detach = []
+        detach_lists = 0
+        detach_failed = {}
+        if 'fle' in todo:
+            parents = [('tst', "Test", obj['tests'], obj['files'].async_list_by_tst),
+                       ('sub', "Submission", obj['submissions'], obj['files'].async_list_by_sub)]
+            for key, name, client, async_list_fles in parents:
+                if key in to_list:
+                    continue
+                par_lsts, par_failed = async_obj_map([None], client.async_list_by_null,
+                                                     label="Listing  {:11s}".format(name + "s"),
+                                                     timing=timing)
+                puids = lists_to_set(par_lsts) - todo.get(key, set())
+                fle_lsts, fle_failed = async_obj_map(puids, async_list_fles,
+                                                     label="Listing  Attached   ",
+                                                     timing=timing)
+                detach_lists += 1 + len(puids)
+                for puid, err in list(par_failed.items()) + list(fle_failed.items()):
+                    detach_failed[("list Files for", name, puid)] = err
+                for puid, fuids in fle_lsts.items():
+                    fuids = tuple([fuid for fuid in fuids if fuid in todo['fle']])
+                    if fuids:
+                        detach.append((key, puid, fuids))
+
+        # Order Deletes: each wave only runs once the objects that reference
+        # its objects are gone, and all types within a wave run concurrently
+        waves = []
+        for i, wave in enumerate(_CLEANUP_WAVES):
+            keys = [(key, ouid) for key in wave if key in todo for ouid in todo[key]]
+            if keys:
+                waves.append((i + 1, keys))
+
+        # Display Plan
+        click.echo("{:4s}  {:11s}  {:>8s}  {:>6s}  {:>8s}".format(
+            "Wave", "Type", "Objects", "Lists", "Deletes"))
+        for i, wave in enumerate(_CLEANUP_WAVES):
+            for key in wave:
+                if key in todo:
+                    click.echo("{:4d}  {:11s}  {:>8d}  {:>6d}  {:>8d}".format(
+                        i + 1, names[key], len(todo[key]), int(key in to_list), len(todo[key])))
+        if detach:
+            click.echo("Detach: {} Files from {} Tests/Submissions first".format(
+                len(set([fuid for key, puid, fuids in detach for fuid in fuids])), len(detach)))
+        deletes = sum([len(keys) for num, keys in waves])
+        lists = len(to_list) + detach_lists
+        click.echo("Requests: {} lists + {} detaches + {} deletes = {}".format(
+            lists, len(detach), deletes, lists + len(detach) + deletes))
+        if dry_run:
+            for key, err in lsts_failed.items():
+                click.echo("Failed to list {}: {}".format(names[key], str(err)), err=True)
+            for (action, name, puid), err in detach_failed.items():
+                click.echo("Failed to {} {} '{}': {}".format(action, name, puid, str(err)),
+                           err=True)
+            return
+
+        # Detach Files
+        def async_detach(item):
+            key, puid, fuids = item
+            client = obj['tests'] if key == 'tst' else obj['submissions']
+            return client.async_detach_files(puid, fuids)
+        detached, detach_items_failed = async_obj_map(detach, async_detach,
+                                                      label="Detaching Files     ",
+                                                      timing=timing)
+        for (key, puid, fuids), err in detach_items_failed.items():
+            name = "Test" if key == 'tst' else "Submission"
+            detach_failed[("detach Files from", name, puid)] = err
+
+        # Delete Objects
+        def async_delete(item):
+            key, ouid = item
+            return clients[key].async_delete(ouid)
+        failed = {}
+        for num, keys in waves:
+            deleted, wave_failed = async_obj_map(keys, async_delete,
+                                                 label="Deleting Wave {}     ".format(num),
+                                                 timing=timing)
+            failed.update(wave_failed)
+
+    # Display Errors
+    for key, err in lsts_failed.items():
+        click.echo("Failed to list {}: {}".format(names[key], str(err)), err=True)
+    for (action, name, puid), err in detach_failed.items():
+        click.echo("Failed to {} {} '{}': {}".format(action, name, puid, str(err)), err=True)
+    for (key, ouid), err in sorted(failed.items(), key=lambda item: str(item[0])):
+        click.echo("Failed to delete {} '{}': {}".format(names[key][:-1], ouid, str(err)),
+                   err=True)
+
+    # Display Transport Stats
+    if timing:
+        echo_transport_stats(obj['connection'])
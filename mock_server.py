@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+
+# COG CLI
+# Mock COG API Server
+# Local stand-in for the COG API endpoints used by api_client, for
+# testing and benchmarking without a live server
+
+import sys
+import json
+import base64
+import collections
+import time
+import uuid
+import random
+import hashlib
+import threading
+import io
+import zipfile
+import email.parser
+import http.server
+import socketserver
+import urllib.parse
+
+import click
+
+_TOKEN = 'mocktoken'
+_USERNAME = 'admin'
+_PASSWORD = 'admin'
+_STATUS_QUEUED = 'queued'
+_STATUS_RUNNING = 'running'
+_STATUS_COMPLETE = 'complete'
+
+_COLLECTIONS = ['assignments', 'tests', 'submissions', 'runs',
+                'files', 'users', 'reporters']
+
+# Child collections indexed by parent attribute
+_INDEXES = {'tests': 'assignment', 'submissions': 'assignment', 'runs': 'submission'}
+
+
+class Dataset(object):
+
+    def __init__(self, asns=1, tsts=1, subs=10, runs=1, fles=1, usrs=None,
+                 fle_size=1024, run_delay=0.0, seed=0):
+
+        self.lock = threading.Lock()
+        self.run_delay = run_delay
+        self.objs = {key: {} for key in _COLLECTIONS}
+        self.children = {key: collections.defaultdict(list) for key in _INDEXES}
+        self.contents = {}
+        self._rand = random.Random(seed)
+
+        # Users
+        if usrs is None:
+            usrs = max(1, subs)
+        usr_uids = []
+        for i in range(usrs):
+            uid = self._uid()
+            self.objs['users'][uid] = {'username': "user{:06d}".format(i),
+                                       'first': "First{}".format(i),
+                                       'last': "Last{}".format(i)}
+            usr_uids.append(uid)
+        self.admin = self._uid()
+        self.objs['users'][self.admin] = {'username': _USERNAME,
+                                          'first': 'Admin', 'last': 'User'}
+
+        # Assignments, Tests, Submissions, Files, Runs
+        for a in range(asns):
+            auid = self._new('assignments', {'name': "asn{:04d}".format(a), 'env': 'local',
+                                             'owner': self.admin})
+            tst_uids = []
+            for t in range(tsts):
+                tuid = self._new('tests', {'assignment': auid, 'name': "tst{:04d}".format(t),
+                                           'maxscore': '10', 'tester': 'script',
+                                           'builder': '', 'path_script': '',
+                                           'owner': self.admin, 'files': [],
+                                           'reporters': []})
+                tst_uids.append(tuid)
+            for s in range(subs):
+                owner = usr_uids[s % len(usr_uids)]
+                fle_uids = []
+                for f in range(fles):
+                    data = self._content(fle_size, shared=(f == 0))
+                    fle_uids.append(self._new_file("file{:03d}.txt".format(f), data, owner))
+                suid = self._new('submissions', {'assignment': auid, 'owner': owner,
+                                                 'files': fle_uids})
+                for r in range(runs):
+                    tuid = tst_uids[r % len(tst_uids)] if tst_uids else self._uid()
+                    self._new('runs', {'submission': suid, 'test': tuid,
+                                       'assignment': auid, 'owner': owner,
+                                       'status': "{}-success".format(_STATUS_COMPLETE),
+                                       'score': '10', 'retcode': '0', 'output': 'ok'})
+
+    def _uid(self):
+        return str(uuid.UUID(int=self._rand.getrandbits(128), version=4))
+
+    def _content(self, size, shared=False):
+        if shared:
+            return b'S' * size
+        block = bytes(self._rand.getrandbits(8) for i in range(min(size, 64)))
+        return (block * (size // 64 + 1))[:size]
+
+    def _new(self, key, obj, uid=None):
+        if uid is None:
+            uid = self._uid()
+        now = time.time()
+        obj.setdefault('created_time', repr(now))
+        obj.setdefault('modified_time', repr(now))
+        self.objs[key][uid] = obj
+        if key in _INDEXES and _INDEXES[key] in obj:
+            self.children[key][obj[_INDEXES[key]]].append(uid)
+        return uid
+
+    def _delete(self, key, uid):
+        obj = self.objs[key].pop(uid)
+        if key in _INDEXES and _INDEXES[key] in obj:
+            self.children[key][obj[_INDEXES[key]]].remove(uid)
+        if key == 'files':
+            self.contents.pop(uid, None)
+        return obj
+
+    def list_children(self, key, parent):
+        return list(self.children[key].get(parent, []))
+
+    def _new_file(self, name, data, owner):
+        uid = self._new('files', {'name': name, 'owner': owner, 'size': str(len(data))})
+        self.contents[uid] = data
+        return uid
+
+    def run_status(self, obj):
+        # Queued for the first half of run_delay, running for the second
+        created = float(obj['created_time'])
+        age = time.time() - created
+        if obj['status'] == _STATUS_QUEUED and age >= self.run_delay / 2:
+            obj['status'] = _STATUS_RUNNING
+            obj['modified_time'] = repr(created + self.run_delay / 2)
+        if obj['status'] == _STATUS_RUNNING:
+            if age >= self.run_delay:
+                obj['status'] = "{}-success".format(_STATUS_COMPLETE)
+                obj['score'] = '10'
+                obj['retcode'] = '0'
+                obj['output'] = 'ok'
+                obj['modified_time'] = repr(created + self.run_delay)
+        return obj
+
+
+class Stats(object):
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.errors = 0
+        self.latencies = []
+
+    def record(self, dur, error=False):
+        with self.lock:
+            self.count += 1
+            self.latencies.append(dur)
+            if error:
+                self.errors += 1
+
+    def summary(self):
+        with self.lock:
+            lats = sorted(self.latencies)
+        def pct(p):
+            if not lats:
+                return 0.0
+            return lats[min(len(lats) - 1, int(p * len(lats)))]
+        return {'count': self.count, 'errors': self.errors,
+                'p50': pct(0.50), 'p99': pct(0.99)}
+
+
+class APIError(Exception):
+
+    def __init__(self, status, msg=''):
+        super().__init__(msg)
+        self.status = status
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def _handle(self, method):
+
+        srv = self.server
+        start = time.time()
+        error = False
+        self._reply = None
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = self.rfile.read(length) if length else b''
+            if srv.latency:
+                time.sleep(srv.latency)
+            if srv.error_rate and srv.rand.random() < srv.error_rate:
+                error = True
+                self._send(503, b'{"message": "injected"}', {'Retry-After': '0'})
+                return
+            self._check_auth()
+            path = urllib.parse.urlparse(self.path).path
+            parts = [p for p in path.split('/') if p]
+            self._route(method, parts, body)
+        except APIError as err:
+            error = True
+            msg = json.dumps({'message': str(err)}).encode()
+            self._send(err.status, msg)
+        finally:
+            if self._reply is not None:
+                self._flush()
+            srv.stats.record(time.time() - start, error=error)
+
+    def _check_auth(self):
+        auth = self.headers.get('Authorization', '')
+        if not auth.startswith('Basic '):
+            raise APIError(401, 'auth required')
+        user, _, pw = base64.b64decode(auth[6:]).decode().partition(':')
+        if user == _TOKEN or (user == _USERNAME and pw == _PASSWORD):
+            return
+        raise APIError(401, 'bad auth')
+
+    def _send(self, status, data, headers={}):
+        # Queued until _handle returns, so bodies are written without ds.lock
+        self._reply = (status, data, headers)
+
+    def _flush(self):
+        status, data, headers = self._reply
+        self._reply = None
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(data)))
+        if self.headers.get('Connection', '').lower() == 'close':
+            self.send_header('Connection', 'close')
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _json(self, obj, status=200, cond=False):
+        data = json.dumps(obj).encode()
+        headers = {'Content-Type': 'application/json'}
+        if cond:
+            etag = '"{}"'.format(hashlib.sha1(data).hexdigest())
+            headers['ETag'] = etag
+            if self.headers.get('If-None-Match') == etag:
+                self._send(304, b'', headers)
+                return
+        self._send(status, data, headers)
+
+    def _route(self, method, parts, body):
+
+        ds = self.server.dataset
+        if not parts:
+            raise APIError(404)
+        head = parts[0]
+        rest = parts[1:]
+
+        with ds.lock:
+
+            if head == 'my':
+                if rest == ['token']:
+                    return self._json({'token': _TOKEN})
+                if rest == ['username']:
+                    return self._json({'username': _USERNAME})
+                if rest == ['useruuid']:
+                    return self._json({'useruuid': ds.admin})
+                if rest == ['submissions']:
+                    return self._json({'submissions': list(ds.objs['submissions'])})
+                raise APIError(404)
+
+            if head not in ds.objs:
+                raise APIError(404)
+            coll = ds.objs[head]
+
+            # Collection
+            if not rest:
+                if method == 'GET':
+                    return self._json({head: list(coll)})
+                if method == 'POST':
+                    return self._create(head, body)
+                raise APIError(405)
+
+            # Special Collections
+            if head == 'assignments' and rest[0] in ('submitable', 'runable'):
+                return self._json({head: list(coll)})
+            if head == 'users' and rest[0] == 'useruuid':
+                for uid, usr in coll.items():
+                    if usr['username'] == rest[1]:
+                        return self._json({'useruuid': uid})
+                raise APIError(404)
+            if head == 'users' and rest[0] == 'username':
+                if rest[1] not in coll:
+                    raise APIError(404)
+                return self._json({'username': coll[rest[1]]['username']})
+
+            uid = rest[0]
+            if uid not in coll:
+                raise APIError(404, "{} not found".format(uid))
+            obj = coll[uid]
+
+            # Object
+            if len(rest) == 1:
+                if method == 'GET':
+                    if head == 'runs':
+                        ds.run_status(obj)
+                    return self._json({uid: obj}, cond=True)
+                if method == 'PUT':
+                    obj.update(json.loads(body.decode() or '{}'))
+                    obj['modified_time'] = repr(time.time())
+                    return self._json({uid: obj})
+                if method == 'DELETE':
+                    ds._delete(head, uid)
+                    return self._json({uid: obj})
+                raise APIError(405)
+
+            # Sub Resources
+            sub = rest[1]
+            if head == 'files' and sub == 'contents':
+                return self._contents(uid)
+            if head == 'assignments' and sub in ('tests', 'submissions'):
+                if method == 'GET':
+                    return self._json({sub: ds.list_children(sub, uid)})
+                if method == 'POST':
+                    data = json.loads(body.decode() or '{}')
+                    data['assignment'] = uid
+                    data['owner'] = ds.admin
+                    data['files'] = []
+                    if sub == 'tests':
+                        data['reporters'] = []
+                    return self._json({sub: [ds._new(sub, data)]})
+            if head == 'submissions' and sub == 'runs':
+                if method == 'GET':
+                    return self._json({'runs': ds.list_children('runs', uid)})
+                if method == 'POST':
+                    data = json.loads(body.decode() or '{}')
+                    data.update({'submission': uid, 'assignment': obj['assignment'],
+                                 'owner': obj['owner'], 'status': _STATUS_QUEUED,
+                                 'score': '', 'retcode': '', 'output': ''})
+                    return self._json({'runs': [ds._new('runs', data)]})
+            if sub in ('files', 'reporters') and sub in obj:
+                if method == 'GET':
+                    return self._json({sub: list(obj[sub])})
+                data = json.loads(body.decode() or '{}')
+                if method == 'PUT':
+                    for k in data.get(sub, []):
+                        if k not in obj[sub]:
+                            obj[sub].append(k)
+                elif method == 'DELETE':
+                    obj[sub] = [k for k in obj[sub] if k not in data.get(sub, [])]
+                return self._json({sub: list(obj[sub])})
+            raise APIError(404)
+
+    def _create(self, head, body):
+
+        ds = self.server.dataset
+        if head != 'files':
+            data = json.loads(body.decode() or '{}')
+            data['owner'] = ds.admin
+            return self._json({head: [ds._new(head, data)]})
+
+        # Parse Multipart Upload
+        ctype = self.headers.get('Content-Type', '')
+        msg = email.parser.BytesParser().parsebytes(
+            b'Content-Type: ' + ctype.encode() + b'\r\n\r\n' + body)
+        uids = []
+        for part in msg.get_payload():
+            field = part.get_param('name', header='content-disposition')
+            name = part.get_filename()
+            data = part.get_payload(decode=True)
+            if field == 'extract':
+                with zipfile.ZipFile(io.BytesIO(data)) as zf:
+                    for info in zf.infolist():
+                        if not info.is_dir():
+                            uids.append(ds._new_file(info.filename, zf.read(info), ds.admin))
+            else:
+                uids.append(ds._new_file(name, data, ds.admin))
+        return self._json({'files': uids})
+
+    def _contents(self, uid):
+
+        ds = self.server.dataset
+        data = memoryview(ds.contents[uid]) # no copy while ds.lock is held
+        rng = self.headers.get('Range')
+        if rng and rng.startswith('bytes='):
+            start = int(rng[6:].split('-')[0])
+            if start >= len(data):
+                self._send(416, b'', {'Content-Range': "bytes */{}".format(len(data))})
+                return
+            self._send(206, data[start:],
+                       {'Content-Range': "bytes {}-{}/{}".format(start, len(data) - 1, len(data))})
+        else:
+            self._send(200, data)
+
+
+class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+    def __init__(self, addr, dataset, latency=0.0, error_rate=0.0, seed=0):
+        super().__init__(addr, Handler)
+        self.dataset = dataset
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rand = random.Random(seed)
+        self.stats = Stats()
+
+    def get_url(self):
+        return "http://{}:{}".format(*self.server_address[:2])
+
+
+def start_server(dataset, host='127.0.0.1', port=0, **kwargs):
+
+    server = Server((host, port), dataset, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+@click.command()
+@click.option('--host', default='127.0.0.1', help='Bind Address')
+@click.option('--port', default=5000, help='Bind Port')
+@click.option('--asns', default=1, help='Number of Assignments')
+@click.option('--tsts', default=1, help='Tests per Assignment')
+@click.option('--subs', default=10, help='Submissions per Assignment')
+@click.option('--runs', default=1, help='Runs per Submission')
+@click.option('--fles', default=1, help='Files per Submission')
+@click.option('--fle_size', default=1024, help='File Size (bytes)')
+@click.option('--run_delay', default=0.0, help='Seconds before new runs complete')
+@click.option('--latency', default=0.0, help='Added latency per request (seconds)')
+@click.option('--error_rate', default=0.0, help='Fraction of requests failing with 503')
+@click.option('--seed', default=0, help='Random seed for UUIDs and contents')
+def main(host, port, asns, tsts, subs, runs, fles, fle_size, run_delay, latency, error_rate, seed):
+
+    dataset = Dataset(asns=asns, tsts=tsts, subs=subs, runs=runs, fles=fles,
+                      fle_size=fle_size, run_delay=run_delay, seed=seed)
+    server = Server((host, port), dataset, latency=latency, error_rate=error_rate, seed=seed)
+    click.echo("Serving mock COG API on {} (token '{}')".format(server.get_url(), _TOKEN))
+    server.serve_forever()
+
+if __name__ == '__main__':
+    sys.exit(main())
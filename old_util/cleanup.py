@@ -1,10 +1,13 @@
 #!/usr/bin/env python
 
 import sys
+import concurrent.futures
 
 import requests
 import click
 
+THREADS = 16
+
 def _cleanup_objects(site, endpoint, auth=None):
 
     list_path = "{:s}/{:s}/".format(site, endpoint)
@@ -33,20 +36,25 @@ def _cleanup_objects(site, endpoint, auth=None):
 
     elif (i == len(object_uuids)):
         errors = []
-        with click.progressbar(object_uuids,
-                               label='Deleting {:s}'.format(endpoint),
-                               item_show_func=str) as bar:
-            for object_uuid in bar:
-                object_path = "{:s}/{:s}/{:s}/".format(site, endpoint, object_uuid)
-                r = requests.delete(object_path, auth=auth)
+        def _delete_object(object_uuid):
+            object_path = "{:s}/{:s}/{:s}/".format(site, endpoint, object_uuid)
+            r = requests.delete(object_path, auth=auth)
+            try:
+                r.raise_for_status()
+            except requests.exceptions.HTTPError as error:
                 try:
-                    r.raise_for_status()
-                except requests.exceptions.HTTPError as error:
-                    try:
-                        output = r.json()
-                    except ValueError:
-                        output = r.text
-                    errors.append([object_uuid, error, output])
+                    output = r.json()
+                except ValueError:
+                    output = r.text
+                errors.append([object_uuid, error, output])
+            return object_uuid
+        with concurrent.futures.ThreadPoolExecutor(THREADS) as pool:
+            with click.progressbar(pool.map(_delete_object, object_uuids),
+                                   length=len(object_uuids),
+                                   label='Deleting {:s}'.format(endpoint),
+                                   item_show_func=str) as bar:
+                for object_uuid in bar:
+                    pass
         if errors:
             print("Errors:")
             for object_uuid, error, output in errors:
@@ -80,10 +88,11 @@ def cleanup(url, username, password, token):
     else:
         auth = None
 
-    _cleanup_objects(url, 'assignments', auth)
-    _cleanup_objects(url, 'tests', auth)
-    _cleanup_objects(url, 'submissions', auth)
+    # Delete objects before the objects they reference
     _cleanup_objects(url, 'runs', auth)
+    _cleanup_objects(url, 'submissions', auth)
+    _cleanup_objects(url, 'tests', auth)
+    _cleanup_objects(url, 'assignments', auth)
     _cleanup_objects(url, 'reporters', auth)
     _cleanup_objects(url, 'files', auth)
 
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+# COG CLI
+# Startup Tests
+# Offline invocations must not load the API client and must stay
+# within the startup budget
+
+import unittest
+
+import benchmark
+
+_RUNS = 10
+
+
+class StartupTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        # Interpreter Baseline
+        cls.base = benchmark.time_python(['-c', 'pass'], _RUNS)[0]
+
+    def check_startup(self, args):
+
+        args = args.split()
+
+        # Lazy Imports
+        self.assertEqual(benchmark.heavy_imports(args), [])
+
+        # Budget (best-of-runs over the bare interpreter)
+        dur = benchmark.time_python([benchmark._PATH_CLI] + args, _RUNS)[0]
+        self.assertLessEqual(dur - self.base, benchmark._STARTUP_BUDGET,
+                             "'{}' took {:.1f} ms over the interpreter".format(
+                                 ' '.join(args), (dur - self.base) * 1000))
+
+    def test_guarded(self):
+
+        for args in benchmark._STARTUP_GUARD:
+            with self.subTest(args=args):
+                self.check_startup(args)
+
+    def test_other_group_help(self):
+
+        for group in ['assignment', 'file', 'run', 'submission', 'test', 'user', 'reporter']:
+            with self.subTest(group=group):
+                self.check_startup('--url http://localhost {} --help'.format(group))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,8 @@
 import collections
 import string
 import os.path
+import queue
+import functools
 
 
 VALID_FILENAME_CHARS = "+-_.() {}{}".format(string.ascii_letters, string.digits)
@@ -87,3 +89,39 @@ def duration_to_str(dur):
 
     hours, minutes, seconds = split_duration(dur)
     return "{:02.0f}:{:02.0f}:{:05.2f}".format(hours, minutes, seconds)
+
+
+### Future Functions ###
+
+def iter_completed(keys, fun, args=[], kwargs={}, window=None):
+    """ Call fun(key, *args, **kwargs) for each key and yield (key, future)
+    pairs in completion order, keeping at most window futures in flight """
+
+    done = queue.Queue()
+    keys = iter(keys)
+    pending = 0
+    exhausted = False
+
+    while True:
+
+        # Fill Window
+        while not exhausted and (window is None or pending < window):
+            try:
+                key = next(keys)
+            except StopIteration:
+                exhausted = True
+                break
+            future = fun(key, *args, **kwargs)
+            future.add_done_callback(functools.partial(_put_completed, done, key))
+            pending += 1
+
+        # Wait for Next Completion
+        if not pending:
+            break
+        key, future = done.get()
+        pending -= 1
+        yield key, future
+
+def _put_completed(done, key, future):
+
+    done.put((key, future))
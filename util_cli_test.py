@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+# COG CLI
+# util_cli Tests
+
+import threading
+import unittest
+import concurrent.futures
+
+import util_cli
+
+
+class IterCompletedTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.executor = concurrent.futures.ThreadPoolExecutor(8)
+
+    def tearDown(self):
+
+        self.executor.shutdown(wait=True)
+
+    def test_completion_order(self):
+
+        # Futures finish in the reverse of submission order
+        gates = {key: threading.Event() for key in range(4)}
+        def fun(key):
+            return self.executor.submit(lambda: gates[key].wait(5) and key)
+
+        order = []
+        completed = util_cli.iter_completed(range(4), fun)
+        gates[3].set()
+        for key, future in completed:
+            order.append(key)
+            self.assertEqual(future.result(), key)
+            if key > 0:
+                gates[key - 1].set()
+        self.assertEqual(order, [3, 2, 1, 0])
+
+    def test_args(self):
+
+        def fun(key, add, mul=1):
+            return self.executor.submit(lambda: (key + add) * mul)
+
+        res = dict((key, future.result()) for key, future in
+                   util_cli.iter_completed(range(5), fun, args=[1], kwargs={'mul': 2}))
+        self.assertEqual(res, {0: 2, 1: 4, 2: 6, 3: 8, 4: 10})
+
+    def test_errors(self):
+
+        # Errors stay in their futures and don't stop the other keys
+        def work(key):
+            if key % 2:
+                raise ValueError(key)
+            return key
+        def fun(key):
+            return self.executor.submit(work, key)
+
+        results = {}
+        errors = {}
+        for key, future in util_cli.iter_completed(range(6), fun):
+            try:
+                results[key] = future.result()
+            except ValueError as err:
+                errors[key] = err
+        self.assertEqual(sorted(results), [0, 2, 4])
+        self.assertEqual(sorted(errors), [1, 3, 5])
+
+    def test_window(self):
+
+        lock = threading.Lock()
+        state = {'running': 0, 'max': 0, 'started': 0}
+        def work():
+            with lock:
+                state['running'] += 1
+                state['max'] = max(state['max'], state['running'])
+            threading.Event().wait(0.01)
+            with lock:
+                state['running'] -= 1
+        def fun(key):
+            state['started'] += 1
+            return self.executor.submit(work)
+
+        # Keys are consumed lazily, window at a time
+        completed = util_cli.iter_completed(range(20), fun, window=3)
+        next(completed)
+        self.assertLessEqual(state['started'], 4)
+        cnt = 1 + len(list(completed))
+        self.assertEqual(cnt, 20)
+        self.assertLessEqual(state['max'], 3)
+
+    def test_empty(self):
+
+        self.assertEqual(list(util_cli.iter_completed([], None)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,130 @@
 # Fall 2015
 # From https://github.com/asayler/TorUniversity/blob/master/list.py
 
+import csv
+import json
+import importlib
+
 import click
 
-def echo_table(values, headings=None, line_limit=None, sort_by=None):
+ROW_FORMATS = ['jsonl', 'csv', 'tsv']
+
+class LazyGroup(click.Group):
+    """ Group whose subcommands are imported from 'module:attr' specs on first use
+
+    lazy_commands maps command names to (spec, short help) so that listing
+    commands in '--help' does not import them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """ Constructor"""
+
+        self._lazy_commands = kwargs.pop('lazy_commands', {})
+        super().__init__(*args, **kwargs)
+
+    def list_commands(self, ctx):
+        return sorted(set(self.commands) | set(self._lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self._lazy_commands:
+            spec, short_help = self._lazy_commands[cmd_name]
+            mod_name, attr = spec.split(':')
+            cmd = getattr(importlib.import_module(mod_name), attr)
+            self.add_command(cmd, name=cmd_name)
+        return self.commands.get(cmd_name)
+
+    def format_commands(self, ctx, formatter):
+
+        rows = []
+        for cmd_name in self.list_commands(ctx):
+            if cmd_name in self.commands:
+                rows.append((cmd_name, self.commands[cmd_name].short_help or ''))
+            else:
+                rows.append((cmd_name, self._lazy_commands[cmd_name][1]))
+        if rows:
+            with formatter.section('Commands'):
+                formatter.write_dl(rows)
+
+class RowWriter(object):
+    """ Stream rows to stdout one at a time as JSON lines, CSV or TSV
+
+    Nothing is buffered beyond the stream itself, so memory stays flat
+    regardless of how many rows are written.
+    """
+
+    def __init__(self, fmt, headings, file=None):
+        """ Constructor"""
+
+        # Check Args
+        if fmt not in ROW_FORMATS:
+            raise TypeError("fmt must be one of {}".format(ROW_FORMATS))
+
+        # Set vars
+        self._fmt = fmt
+        self._headings = list(headings)
+        self._file = file if file is not None else click.get_text_stream('stdout')
+
+        # Write Headings
+        if fmt == 'jsonl':
+            self._csv = None
+        else:
+            delim = '\t' if fmt == 'tsv' else ','
+            self._csv = csv.writer(self._file, delimiter=delim, lineterminator='\n')
+            self._csv.writerow(self._headings)
+
+    def write(self, row):
+
+        if self._csv is None:
+            self._file.write(json.dumps(dict(zip(self._headings, row))) + '\n')
+        else:
+            self._csv.writerow(row)
+
+    def flush(self):
+        self._file.flush()
+
+_TABLE_BLOCK = 1000 #lines per write
+
+def fit_widths(lengths, line_limit):
+    """ Shrink column widths to fit line_limit (each column adds 3 for ' | ')
+
+    Closed form of repeatedly taking 1 from the first widest column until
+    the table fits or no column is wider than 4.
+    """
+
+    # Count Needed Cuts
+    need = sum(lengths) + (len(lengths) * 3) - line_limit
+    if need <= 0 or not lengths:
+        return list(lengths)
+    floor_cuts = sum([max(0, l - 4) for l in lengths])
+    cuts = min(need, max(1, floor_cuts))
+
+    # Find lowest level reachable with cuts, widest columns first
+    ordered = sorted(lengths, reverse=True)
+    level = ordered[0]
+    excess = 0
+    for i in range(len(ordered)):
+        nxt = ordered[i+1] if i+1 < len(ordered) else min(0, ordered[-1])
+        step = (i + 1) * (level - nxt)
+        if excess + step > cuts:
+            level -= (cuts - excess) // (i + 1)
+            excess += (i + 1) * ((cuts - excess) // (i + 1))
+            break
+        excess += step
+        level = nxt
+
+    # Level columns, then spend leftover cuts in column order
+    widths = [min(l, level) for l in lengths]
+    left = cuts - excess
+    for c in range(len(widths)):
+        if not left:
+            break
+        if lengths[c] >= level:
+            widths[c] -= 1
+            left -= 1
+
+    return widths
+
+def echo_table(values, headings=None, line_limit=None, sort_by=None, err=False, pager=False):
 
     # Process Args
     if line_limit is None:
@@ -12,6 +133,7 @@ def echo_table(values, headings=None, line_limit=None, sort_by=None):
 
     # Preprocess
     values = [[str(c) for c in r] for r in values]
+    headings = list(headings) if headings else headings
 
     # Sort
     if sort_by:
@@ -28,8 +150,7 @@ def echo_table(values, headings=None, line_limit=None, sort_by=None):
             raise TypeError("sort_by must be string or int")
 
         # Sort by idx
-        orig_values = values
-        values = sorted(orig_values, key=lambda val: val[idx])
+        values.sort(key=lambda val: val[idx])
 
     # Calculate lengths
     if headings:
@@ -38,48 +159,40 @@ def echo_table(values, headings=None, line_limit=None, sort_by=None):
         len_tab = values
     lengths = []
     for row in len_tab:
-        for c in range(len(row)):
-            if len(lengths) > c:
-                if len(row[c]) > lengths[c]:
-                    lengths[c] = len(row[c])
-            else:
-                lengths.append(len(row[c]))
+        if len(row) > len(lengths):
+            lengths += [0] * (len(row) - len(lengths))
+        for c, cell in enumerate(row):
+            if len(cell) > lengths[c]:
+                lengths[c] = len(cell)
 
     # Set Max Lengths
     if line_limit:
-        # Calculate Max Lengths
-        while sum(lengths) + (len(lengths) * 3) > line_limit:
-            lengths[lengths.index(max(lengths))] -= 1
-            if max(lengths) <= 4:
-                break
-        # Truncate Headings
-        if headings:
-            for c in range(len(headings)):
-                if len(headings[c]) > lengths[c]:
-                    headings[c] = headings[c][:(lengths[c]-3)] + "..."
-        # Truncate Values
-        for row in values:
-            for c in range(len(row)):
-                if len(row[c]) > lengths[c]:
-                    row[c] = row[c][:(lengths[c]-3)] + "..."
-
-    # Print Headings
+        lengths = fit_widths(lengths, line_limit)
+
+    def _fit(row):
+        row = row + [""] * (len(lengths) - len(row))
+        return [cell if len(cell) <= lengths[c] else cell[:(lengths[c]-3)] + "..."
+                for c, cell in enumerate(row)]
+
+    # Build Lines
+    lines = []
     if headings:
-        for c in range(len(lengths)):
-            if c < len(headings):
-                click.echo("{val:^{width}s} | ".format(val=headings[c], width=lengths[c]), nl=False)
-            else:
-                click.echo("{val:^{width}s} | ".format(val="", width=lengths[c]), nl=False)
-        click.echo("")
-        for c in range(len(lengths)):
-            click.echo("{val:{fill}^{width}s} | ".format(val='-', fill='-', width=lengths[c]), nl=False)
-        click.echo("")
-
-    # Print Table
-    for row in values:
-        for c in range(len(lengths)):
-            if c < len(row):
-                click.echo("{val:<{width}s} | ".format(val=row[c], width=lengths[c]), nl=False)
-            else:
-                click.echo("{val:<{width}s} | ".format(val="", width=lengths[c]), nl=False)
-        click.echo("")
+        fmt_head = "".join(["{{:^{}s}} | ".format(w) for w in lengths])
+        fmt_rule = "".join(["{{:-^{}s}} | ".format(w) for w in lengths])
+        lines.append(fmt_head.format(*_fit(headings)))
+        lines.append(fmt_rule.format(*(['-'] * len(lengths))))
+    fmt_row = "".join(["{{:<{}s}} | ".format(w) for w in lengths])
+
+    # Page Whole Table
+    if pager:
+        lines += [fmt_row.format(*_fit(row)) for row in values]
+        click.echo_via_pager("\n".join(lines) + "\n")
+        return
+
+    # Write in Blocks
+    for start in range(0, len(values), _TABLE_BLOCK):
+        lines += [fmt_row.format(*_fit(row)) for row in values[start:start+_TABLE_BLOCK]]
+        click.echo("\n".join(lines), err=err)
+        lines = []
+    if lines:
+        click.echo("\n".join(lines), err=err)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+# COG CLI
+# util_click Tests
+
+import random
+import unittest
+
+import click
+import click.testing
+
+import util_click
+
+
+def loop_widths(lengths, line_limit):
+    """ The iterative width loop fit_widths replaced """
+
+    lengths = list(lengths)
+    while sum(lengths) + (len(lengths) * 3) > line_limit:
+        lengths[lengths.index(max(lengths))] -= 1
+        if max(lengths) <= 4:
+            break
+    return lengths
+
+
+class FitWidthsTestCase(unittest.TestCase):
+
+    def test_fits(self):
+
+        self.assertEqual(util_click.fit_widths([5, 10], 80), [5, 10])
+        self.assertEqual(util_click.fit_widths([5, 10], 21), [5, 10])
+        self.assertEqual(util_click.fit_widths([], 10), [])
+
+    def test_examples(self):
+
+        # Cut widest first, the first column on ties
+        self.assertEqual(util_click.fit_widths([15, 9], 20), [7, 7])
+        self.assertEqual(util_click.fit_widths([15, 9], 21), [7, 8])
+        self.assertEqual(util_click.fit_widths([20, 3, 20], 31), [9, 3, 10])
+
+        # Never below 4 once some column had to shrink there
+        self.assertEqual(util_click.fit_widths([10, 10], 5), [4, 4])
+        self.assertEqual(util_click.fit_widths([3, 2], 5), [2, 2])
+
+    def test_against_loop(self):
+
+        rand = random.Random(0)
+        for i in range(20000):
+            cols = rand.randint(1, 10)
+            lengths = [rand.choice([rand.randint(0, 6), rand.randint(0, 60)]) for c in range(cols)]
+            limit = rand.randint(0, 200)
+            with self.subTest(lengths=lengths, line_limit=limit):
+                self.assertEqual(util_click.fit_widths(lengths, limit),
+                                 loop_widths(lengths, limit))
+
+
+class EchoTableTestCase(unittest.TestCase):
+
+    def echo(self, *args, **kwargs):
+
+        @click.command()
+        def cmd():
+            util_click.echo_table(*args, **kwargs)
+        result = click.testing.CliRunner().invoke(cmd)
+        self.assertIsNone(result.exception)
+        return result.output
+
+    def test_narrow(self):
+
+        headings = ["Name", "Status"]
+        values = [["alpha-long-name", "completed"], ["b", "ok"]]
+        output = self.echo(values, headings=headings, line_limit=20)
+        self.assertEqual(output.splitlines(), [" Name   | Status  | ",
+                                               "------- | ------- | ",
+                                               "alph... | comp... | ",
+                                               "b       | ok      | "])
+        self.assertEqual(headings, ["Name", "Status"])
+
+    def test_no_limit(self):
+
+        # Ragged rows are padded, sorted by heading name
+        output = self.echo([["b", 2], ["a", 10, "x"]], headings=["K", "V"],
+                           line_limit=0, sort_by="K")
+        self.assertEqual(output.splitlines(), ["K | V  |   | ",
+                                               "- | -- | - | ",
+                                               "a | 10 | x | ",
+                                               "b | 2  |   | "])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+# COG CLI
+# Download Content Store
+
+import os
+import os.path
+import errno
+
+import util_manifest
+
+STORE_NAME = '.cog-store'
+MODES = ['hardlink', 'reflink']
+
+_FICLONE = 0x40049409 #linux/fs.h
+
+def reflink(src, dst):
+    """ Clone src to dst sharing its data blocks (Linux FICLONE: Btrfs, XFS) """
+
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this platform")
+
+    with open(src, 'rb') as src_fd, open(dst, 'wb') as dst_fd:
+        fcntl.ioctl(dst_fd.fileno(), _FICLONE, src_fd.fileno())
+
+class ContentStore(object):
+    """ Content-addressed store of downloaded files kept under STORE_NAME in
+    the destination directory. The first file with a given sha256 is
+    stored, and later files with the same digest are replaced by a
+    hardlink or reflink to the stored copy.
+    """
+
+    def __init__(self, root, mode='hardlink'):
+        """ Constructor"""
+
+        # Check Args
+        if mode not in MODES:
+            raise TypeError("mode must be one of {}".format(MODES))
+
+        # Set vars
+        self._path = os.path.join(root, STORE_NAME)
+        self._mode = mode
+
+        # Setup Stats
+        self.files = 0
+        self.linked = 0
+        self.bytes_total = 0
+        self.bytes_saved = 0
+        self.error = None
+
+        # Entries whose digest was checked this run
+        self._verified = set()
+
+    def _entry_path(self, digest):
+        return os.path.join(self._path, digest[:2], digest)
+
+    def _link(self, src, dst):
+
+        # Link next to dst, then rename over it
+        tmp_path = "{}.{:d}.tmp".format(dst, os.getpid())
+        try:
+            if self._mode == 'reflink':
+                reflink(src, tmp_path)
+            else:
+                os.link(src, tmp_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        os.replace(tmp_path, dst)
+
+    def _is_stored(self, entry, digest, size):
+
+        # Entries are hardlinks of earlier downloads, so an edit to one of
+        # those edits the entry too: check its digest before linking to it
+        if digest in self._verified:
+            return True
+        try:
+            if os.path.getsize(entry) != size or util_manifest.file_hash(entry) != digest:
+                return False
+        except FileNotFoundError:
+            return False
+        self._verified.add(digest)
+        return True
+
+    def add(self, path, digest):
+        """ Store path under digest, or replace it with a link to the stored
+        copy. Returns the bytes saved. """
+
+        size = os.path.getsize(path)
+        self.files += 1
+        self.bytes_total += size
+
+        # New Content (or an entry edited in place): store path
+        entry = self._entry_path(digest)
+        if not self._is_stored(entry, digest, size):
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            try:
+                self._link(path, entry)
+            except OSError as err:
+                self.error = err
+            else:
+                self._verified.add(digest)
+            return 0
+
+        # Duplicate Content: link to stored copy
+        try:
+            self._link(entry, path)
+        except OSError as err:
+            # Out of hardlinks on this inode: start a new one from path
+            if err.errno == errno.EMLINK:
+                self._link(path, entry)
+            else:
+                self.error = err
+            return 0
+        self.linked += 1
+        self.bytes_saved += size
+        return size
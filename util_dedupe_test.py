@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+# COG CLI
+# util_dedupe Tests
+
+import os
+import os.path
+import tempfile
+import unittest
+
+import util_dedupe
+import util_manifest
+
+
+class ContentStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self.tmp_dir.name
+
+    def tearDown(self):
+
+        self.tmp_dir.cleanup()
+
+    def write(self, name, data):
+
+        path = os.path.join(self.root, name)
+        with open(path, 'wb') as fd:
+            fd.write(data)
+        return path, util_manifest.file_hash(path)
+
+    def test_link(self):
+
+        store = util_dedupe.ContentStore(self.root)
+        path_a, digest = self.write('a', b'same')
+        path_b, digest = self.write('b', b'same')
+        path_c, digest_c = self.write('c', b'other')
+
+        self.assertEqual(store.add(path_a, digest), 0)
+        self.assertEqual(store.add(path_b, digest), 4)
+        self.assertEqual(store.add(path_c, digest_c), 0)
+        self.assertTrue(os.path.samefile(path_a, path_b))
+        self.assertFalse(os.path.samefile(path_a, path_c))
+        self.assertEqual((store.files, store.linked), (3, 1))
+        self.assertEqual((store.bytes_total, store.bytes_saved), (13, 4))
+        self.assertIsNone(store.error)
+
+    def test_edited_entry(self):
+
+        path_a, digest = self.write('a', b'same')
+        util_dedupe.ContentStore(self.root).add(path_a, digest)
+
+        # Edit the stored copy in place through its hardlink, keeping the size
+        with open(path_a, 'r+b') as fd:
+            fd.write(b'SAME')
+
+        # A later run must not link new downloads to the edited bytes
+        store = util_dedupe.ContentStore(self.root)
+        path_b, digest_b = self.write('b', b'same')
+        self.assertEqual(digest_b, digest)
+        self.assertEqual(store.add(path_b, digest), 0)
+        with open(path_b, 'rb') as fd:
+            self.assertEqual(fd.read(), b'same')
+
+        # path_b is now the stored copy
+        path_c, digest = self.write('c', b'same')
+        self.assertEqual(store.add(path_c, digest), 4)
+        self.assertTrue(os.path.samefile(path_b, path_c))
+
+    def test_mode(self):
+
+        with self.assertRaises(TypeError):
+            util_dedupe.ContentStore(self.root, mode='copy')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# COG CLI
+# Download Sync Manifest
+
+import os
+import os.path
+import uuid
+import time
+import sqlite3
+import hashlib
+
+MANIFEST_NAME = '.cog-manifest.sqlite'
+
+_HASH_BLOCK = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    sub_uid TEXT PRIMARY KEY,
+    asn_uid TEXT,
+    usr_uid TEXT,
+    path TEXT,
+    synced_time REAL
+);
+CREATE TABLE IF NOT EXISTS files (
+    fle_uid TEXT PRIMARY KEY,
+    sub_uid TEXT,
+    size INTEGER,
+    sha256 TEXT,
+    path TEXT
+);
+CREATE INDEX IF NOT EXISTS files_by_sub ON files (sub_uid);
+"""
+
+def file_hash(path):
+    """ Return the sha256 hex digest of the file at path """
+
+    sha = hashlib.sha256()
+    with open(path, 'rb') as fd:
+        for block in iter(lambda: fd.read(_HASH_BLOCK), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+class SyncManifest(object):
+
+    def __init__(self, path):
+        """ Constructor"""
+
+        self._path = path
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        self._db.close()
+
+    def synced_submissions(self):
+
+        cur = self._db.execute("SELECT sub_uid FROM submissions")
+        return set(uuid.UUID(row[0]) for row in cur)
+
+    def synced_info(self):
+        """ Return {sub_uid: (asn_uid, usr_uid, path)} for synced submissions,
+        with path relative to the destination directory """
+
+        cur = self._db.execute("SELECT sub_uid, asn_uid, usr_uid, path FROM submissions")
+        return dict((uuid.UUID(suid), (uuid.UUID(auid), uuid.UUID(usid), path))
+                    for suid, auid, usid, path in cur)
+
+    def synced_files(self):
+        """ Return {sub_uid: set(fle_uid)} of the files recorded per submission """
+
+        files = {}
+        cur = self._db.execute("SELECT sub_uid, fle_uid FROM files")
+        for suid, fuid in cur:
+            files.setdefault(uuid.UUID(suid), set()).add(uuid.UUID(fuid))
+        return files
+
+    def add_file(self, fle_uid, sub_uid, path, size=None, sha256=None):
+
+        if size is None:
+            size = os.path.getsize(path)
+        if sha256 is None:
+            sha256 = file_hash(path)
+        self._db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                         (str(fle_uid), str(sub_uid), size, sha256, path))
+
+    def mark_synced(self, sub_uid, asn_uid, usr_uid, path):
+
+        self._db.execute("INSERT OR REPLACE INTO submissions VALUES (?, ?, ?, ?, ?)",
+                         (str(sub_uid), str(asn_uid), str(usr_uid), path, time.time()))
+
+    def commit(self):
+        self._db.commit()
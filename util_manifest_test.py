@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+# COG CLI
+# util_manifest Tests
+
+import os
+import uuid
+import tempfile
+import unittest
+
+import util_manifest
+
+
+class SyncManifestTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, util_manifest.MANIFEST_NAME)
+
+    def tearDown(self):
+
+        self.tmp_dir.cleanup()
+
+    def test_synced(self):
+
+        suid, auid, usid, fuid = [uuid.uuid4() for i in range(4)]
+        fle_path = os.path.join(self.tmp_dir.name, 'a.txt')
+        with open(fle_path, 'w') as fd:
+            fd.write('a')
+
+        with util_manifest.SyncManifest(self.path) as manifest:
+            manifest.add_file(fuid, suid, fle_path)
+            manifest.mark_synced(suid, auid, usid, 'sub_a')
+            manifest.commit()
+
+        # Reopen
+        with util_manifest.SyncManifest(self.path) as manifest:
+            self.assertEqual(manifest.synced_submissions(), {suid})
+            self.assertEqual(manifest.synced_info(), {suid: (auid, usid, 'sub_a')})
+            self.assertEqual(manifest.synced_files(), {suid: {fuid}})
+
+    def test_uncommitted(self):
+
+        with util_manifest.SyncManifest(self.path) as manifest:
+            manifest.mark_synced(uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), 'sub_a')
+        with util_manifest.SyncManifest(self.path) as manifest:
+            self.assertEqual(manifest.synced_info(), {})
+            self.assertEqual(manifest.synced_files(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()